@@ -0,0 +1,395 @@
+"""
+Συμπαγείς κόμβοι AST με __slots__, ακέραιο kind και θέση (line/col) στην πηγή.
+
+Ο parser φτιάχνει από προεπιλογή το "κλασικό" AST από tuples (('add', op, L, R), ...).
+Με parse(source, nodes=True) φτιάχνει αντί γι' αυτό κόμβους από τις κλάσεις εδώ:
+  - ένα αντικείμενο με __slots__ ανά κόμβο (χωρίς __dict__, χωρίς string tag ανά κόμβο),
+  - ο τελεστής είναι μέρος του kind (ADD/SUB/MUL/DIV/LT/...), άρα ένα slot λιγότερο,
+  - ('assign_stmt', ('assign', x, e)) γίνεται ένας κόμβος AssignStmt,
+  - τα literals true/false είναι δύο κοινά singletons, τα ονόματα γίνονται sys.intern,
+  - τα φύλλα μένουν int (NUM) και str (NAME)· τη θέση τους τη δίνει ο γονέας τους.
+
+Συμβατότητα (για σταδιακή μετάβαση των consumers):
+  - kind(x) / tag(x) / position(x) δουλεύουν και στις δύο μορφές (και στα φύλλα),
+  - κάθε κόμβος δέχεται node[i], len(node) και unpacking με την ίδια διάταξη με το tuple
+    (node[0] == 'add', node[1] == '+', ...), οπότε κώδικας του τύπου `_, op, L, R = e` δουλεύει,
+  - to_tuple(ast) μετατρέπει ολόκληρο το δέντρο στην κλασική μορφή.
+"""
+import sys
+from typing import Optional, Tuple
+
+# ---------------- kinds ----------------
+(PROGRAM, METHOD, PARAM, BODY, DECL, VAR,
+ ASSIGN, RETURN, IF, WHILE, BREAK, EMPTY, BLOCK,
+ ADD, SUB, MUL, DIV, EQ, NE, LT, LE, GT, GE,
+ CALL, BOOL, NUM, NAME) = range(27)
+
+KIND_NAMES = ("PROGRAM", "METHOD", "PARAM", "BODY", "DECL", "VAR",
+              "ASSIGN", "RETURN", "IF", "WHILE", "BREAK", "EMPTY", "BLOCK",
+              "ADD", "SUB", "MUL", "DIV", "EQ", "NE", "LT", "LE", "GT", "GE",
+              "CALL", "BOOL", "NUM", "NAME")
+
+BINARY = {ADD: ('add', '+'), SUB: ('add', '-'), MUL: ('mulop', '*'), DIV: ('mulop', '/'),
+          EQ: ('relop', '=='), NE: ('relop', '!='), LT: ('relop', '<'), LE: ('relop', '<='),
+          GT: ('relop', '>'), GE: ('relop', '>=')}
+_BINARY_KIND = {v: k for k, v in BINARY.items()}
+
+_TAG_KIND = {'program': PROGRAM, 'method': METHOD, 'body': BODY, 'decl': DECL,
+             'assign_stmt': ASSIGN, 'return_stmt': RETURN, 'if_stmt': IF, 'while_stmt': WHILE,
+             'break_stmt': BREAK, 'empty_stmt': EMPTY, 'block': BLOCK, 'call': CALL, 'bool': BOOL}
+
+
+class Node:
+    __slots__ = ("line", "col")
+    kind = -1
+    tag: Optional[str] = None     # tag της κλασικής μορφής (None για Param/Var που είναι σκέτα tuples)
+    fields: Tuple[str, ...] = ()  # slots με τη σειρά του tuple μετά το tag
+
+    def _row(self) -> tuple:
+        row = tuple(getattr(self, f) for f in self.fields)
+        return row if self.tag is None else (self.tag,) + row
+
+    def __getitem__(self, i):
+        if i == 0 and self.tag is not None:
+            return self.tag
+        return self._row()[i]
+
+    def __len__(self):
+        return len(self.fields) + (self.tag is not None)
+
+    def __iter__(self):
+        return iter(self._row())
+
+    def __repr__(self):
+        return f"{type(self).__name__}{self._row()!r}"
+
+
+class Program(Node):
+    __slots__ = fields = ("methods",)
+    kind, tag = PROGRAM, 'program'
+
+    def __init__(self, methods, line=None, col=None):
+        self.methods, self.line, self.col = methods, line, col
+
+
+class Method(Node):
+    __slots__ = fields = ("type", "name", "params", "body")
+    kind, tag = METHOD, 'method'
+
+    def __init__(self, type, name, params, body, line=None, col=None):
+        self.type, self.name, self.params, self.body = type, name, params, body
+        self.line, self.col = line, col
+
+
+class Param(Node):
+    __slots__ = fields = ("type", "name")
+    kind = PARAM
+
+    def __init__(self, type, name, line=None, col=None):
+        self.type, self.name, self.line, self.col = type, name, line, col
+
+
+class Body(Node):
+    __slots__ = fields = ("decls", "stmts")
+    kind, tag = BODY, 'body'
+
+    def __init__(self, decls, stmts, line=None, col=None):
+        self.decls, self.stmts, self.line, self.col = decls, stmts, line, col
+
+
+class Decl(Node):
+    __slots__ = fields = ("type", "vars")
+    kind, tag = DECL, 'decl'
+
+    def __init__(self, type, vars, line=None, col=None):
+        self.type, self.vars, self.line, self.col = type, vars, line, col
+
+
+class Var(Node):
+    __slots__ = fields = ("name", "init")
+    kind = VAR
+
+    def __init__(self, name, init, line=None, col=None):
+        self.name, self.init, self.line, self.col = name, init, line, col
+
+
+class AssignStmt(Node):
+    __slots__ = ("name", "expr")
+    fields = ("name", "expr")
+    kind, tag = ASSIGN, 'assign_stmt'
+
+    def __init__(self, name, expr, line=None, col=None):
+        self.name, self.expr, self.line, self.col = name, expr, line, col
+
+    def _row(self):
+        return ('assign_stmt', ('assign', self.name, self.expr))
+
+    def __len__(self):
+        return 2
+
+
+class Return(Node):
+    __slots__ = fields = ("expr",)
+    kind, tag = RETURN, 'return_stmt'
+
+    def __init__(self, expr, line=None, col=None):
+        self.expr, self.line, self.col = expr, line, col
+
+
+class If(Node):
+    __slots__ = fields = ("cond", "then", "orelse")
+    kind, tag = IF, 'if_stmt'
+
+    def __init__(self, cond, then, orelse, line=None, col=None):
+        self.cond, self.then, self.orelse, self.line, self.col = cond, then, orelse, line, col
+
+
+class While(Node):
+    __slots__ = fields = ("cond", "body")
+    kind, tag = WHILE, 'while_stmt'
+
+    def __init__(self, cond, body, line=None, col=None):
+        self.cond, self.body, self.line, self.col = cond, body, line, col
+
+
+class Break(Node):
+    __slots__ = ()
+    kind, tag = BREAK, 'break_stmt'
+
+    def __init__(self, line=None, col=None):
+        self.line, self.col = line, col
+
+
+class Empty(Node):
+    __slots__ = ()
+    kind, tag = EMPTY, 'empty_stmt'
+
+    def __init__(self, line=None, col=None):
+        self.line, self.col = line, col
+
+
+class Block(Node):
+    __slots__ = fields = ("stmts",)
+    kind, tag = BLOCK, 'block'
+
+    def __init__(self, stmts, line=None, col=None):
+        self.stmts, self.line, self.col = stmts, line, col
+
+
+class BinOp(Node):
+    """Δυαδικός τελεστής· ο τελεστής είναι το kind της υποκλάσης (Add, Sub, ..., Ge), όχι slot."""
+    __slots__ = ("left", "right")
+
+    def __init__(self, left, right, line=None, col=None):
+        self.left, self.right, self.line, self.col = left, right, line, col
+
+    @property
+    def tag(self):
+        return BINARY[self.kind][0]
+
+    @property
+    def op(self):
+        return BINARY[self.kind][1]
+
+    def _row(self):
+        tag, op = BINARY[self.kind]
+        return (tag, op, self.left, self.right)
+
+    def __getitem__(self, i):
+        return self._row()[i]
+
+    def __len__(self):
+        return 4
+
+
+# Μία υποκλάση ανά τελεστή: Add, Sub, Mul, Div, Eq, Ne, Lt, Le, Gt, Ge
+BINOP_CLASS = {k: type(KIND_NAMES[k].title(), (BinOp,), {"__slots__": (), "kind": k}) for k in BINARY}
+
+
+class Call(Node):
+    __slots__ = fields = ("name", "args")
+    kind, tag = CALL, 'call'
+
+    def __init__(self, name, args, line=None, col=None):
+        self.name, self.args, self.line, self.col = name, args, line, col
+
+
+class Bool(Node):
+    __slots__ = fields = ("value",)
+    kind, tag = BOOL, 'bool'
+
+    def __init__(self, value):
+        self.value, self.line, self.col = value, None, None
+
+
+TRUE, FALSE = Bool(1), Bool(0)     # ο lexer δίνει 1 / 0 για true / false
+NO_ELSE = Empty()      # το else ενός if χωρίς else (κοινό, χωρίς θέση)
+
+
+# ---------------- accessors (και για τις δύο μορφές) ----------------
+
+def kind(x) -> Optional[int]:
+    """Ακέραιο kind για κόμβο, tuple της κλασικής μορφής ή φύλλο (int -> NUM, str -> NAME)."""
+    if isinstance(x, Node):
+        return x.kind
+    if isinstance(x, str):
+        return NAME
+    if isinstance(x, int):
+        return NUM
+    if isinstance(x, tuple) and x:
+        k = _TAG_KIND.get(x[0])
+        if k is not None:
+            return k
+        if len(x) == 4:
+            return _BINARY_KIND.get((x[0], x[1]))
+    return None
+
+
+def tag(x) -> Optional[str]:
+    # tag της κλασικής μορφής ('add', 'while_stmt', ...) ή None για φύλλα / Param / Var
+    if isinstance(x, Node):
+        return x.tag
+    if isinstance(x, tuple) and kind(x) is not None:
+        return x[0]
+    return None
+
+
+def position(x) -> Optional[Tuple[int, int]]:
+    # (line, col) του κόμβου, αν είναι γνωστή
+    if isinstance(x, Node) and x.line is not None:
+        return (x.line, x.col)
+    return None
+
+
+def to_tuple(x):
+    """Μετατρέπει δέντρο από κόμβους (ή μικτό) στην κλασική μορφή με tuples."""
+    if isinstance(x, Node):
+        return tuple(to_tuple(c) for c in x._row())
+    if isinstance(x, list):
+        return [to_tuple(c) for c in x]
+    if isinstance(x, tuple):
+        return tuple(to_tuple(c) for c in x)
+    return x
+
+
+# ---------------- builders (καλούνται από τις ενέργειες του parser) ----------------
+
+class TupleBuilder:
+    """Η κλασική μορφή: tuples. Οι θέσεις (p, i) αγνοούνται."""
+
+    def program(self, methods):
+        return ('program', methods)
+
+    def method(self, p, i, type, name, params, body):
+        return ('method', type, name, params, body)
+
+    def param(self, p, i, type, name):
+        return (type, name)
+
+    def body(self, decls, stmts):
+        return ('body', decls, stmts)
+
+    def decl(self, p, i, type, vars):
+        return ('decl', type, vars)
+
+    def var(self, p, i, name, init):
+        return (name, init)
+
+    def assign(self, p, i, name, expr):
+        return ('assign', name, expr)
+
+    def assign_stmt(self, assign):
+        return ('assign_stmt', assign)
+
+    def ret(self, p, i, expr):
+        return ('return_stmt', expr)
+
+    def if_(self, p, i, cond, then, orelse=None):
+        return ('if_stmt', cond, then, ('empty_stmt',) if orelse is None else orelse)
+
+    def while_(self, p, i, cond, body):
+        return ('while_stmt', cond, body)
+
+    def break_(self, p, i):
+        return ('break_stmt',)
+
+    def empty(self, p, i):
+        return ('empty_stmt',)
+
+    def block(self, p, i, stmts):
+        return ('block', stmts)
+
+    def binop(self, p, i, tag, op, left, right):
+        return (tag, op, left, right)
+
+    def call(self, p, i, name, args):
+        return ('call', name, args)
+
+    def boolean(self, value):
+        return ('bool', value)
+
+    def name(self, p, i, name):
+        return name
+
+
+class NodeBuilder(TupleBuilder):
+    """Κόμβοι με __slots__ και θέση (line, col) από το token p[i]."""
+
+    def _pos(self, p, i):
+        pos = p.lexpos(i)
+        data = p.lexer.lexdata
+        return p.lineno(i), pos - data.rfind("\n", 0, pos)
+
+    def program(self, methods):
+        return Program(methods)
+
+    def method(self, p, i, type, name, params, body):
+        return Method(type, sys.intern(name), params, body, *self._pos(p, i))
+
+    def param(self, p, i, type, name):
+        return Param(type, sys.intern(name), *self._pos(p, i))
+
+    def body(self, decls, stmts):
+        return Body(decls, stmts)
+
+    def decl(self, p, i, type, vars):
+        return Decl(type, vars, *self._pos(p, i))
+
+    def var(self, p, i, name, init):
+        return Var(sys.intern(name), init, *self._pos(p, i))
+
+    def assign(self, p, i, name, expr):
+        return AssignStmt(sys.intern(name), expr, *self._pos(p, i))
+
+    def assign_stmt(self, assign):
+        return assign
+
+    def ret(self, p, i, expr):
+        return Return(expr, *self._pos(p, i))
+
+    def if_(self, p, i, cond, then, orelse=None):
+        return If(cond, then, NO_ELSE if orelse is None else orelse, *self._pos(p, i))
+
+    def while_(self, p, i, cond, body):
+        return While(cond, body, *self._pos(p, i))
+
+    def break_(self, p, i):
+        return Break(*self._pos(p, i))
+
+    def empty(self, p, i):
+        return Empty(*self._pos(p, i))
+
+    def block(self, p, i, stmts):
+        return Block(stmts, *self._pos(p, i))
+
+    def binop(self, p, i, tag, op, left, right):
+        return BINOP_CLASS[_BINARY_KIND[(tag, op)]](left, right, *self._pos(p, i))
+
+    def call(self, p, i, name, args):
+        return Call(sys.intern(name), args, *self._pos(p, i))
+
+    def boolean(self, value):
+        return TRUE if value else FALSE
+
+    def name(self, p, i, name):
+        return sys.intern(name)
@@ -0,0 +1,188 @@
+"""
+Κοινές βοηθητικές συναρτήσεις πάνω στο AST από tuples, για τα περάσματα βελτιστοποίησης
+(const_fold, dead_code, inline, licm, cse, ordering, regalloc, ir) και τον generator.
+
+  - const_value: τιμή σταθεράς (int / bool) ή None,
+  - calls_in / call_reach: κλήσεις μέσα σε έναν κόμβο / μεταβατικό κλείσιμο του γράφου κλήσεων,
+  - names_read / names_written: ονόματα που διαβάζει μια έκφραση / γράφει ένα statement,
+  - count_ops: πράξεις MIX μιας έκφρασης ανά είδος (OPS),
+  - has_break / always_exits: ροή ελέγχου ενός statement,
+  - definitely_assigned: μεταβλητές που γράφονται πριν διαβαστούν σε κάθε μονοπάτι,
+  - guards_loop: το σχήμα { x = ...; while (cond) ... } που αφήνει το licm.
+"""
+from typing import Dict, Optional, Set
+
+OPS = ("ADD", "MUL", "DIV", "CMP", "CALL")
+
+
+def const_value(e) -> Optional[int]:
+    # Τιμή σταθεράς (int ή ('bool', v)), αλλιώς None
+    if isinstance(e, bool):
+        return int(e)
+    if isinstance(e, int):
+        return e
+    if isinstance(e, tuple) and e and e[0] == 'bool':
+        return int(e[1])
+    return None
+
+
+def calls_in(node, out: Set[str]) -> Set[str]:
+    # Ονόματα των μεθόδων που καλούνται μέσα στον κόμβο (αναδρομικά)
+    if isinstance(node, tuple) and node:
+        if node[0] == 'call':
+            out.add(node[1])
+        for c in node[1:]:
+            calls_in(c, out)
+    elif isinstance(node, list):
+        for c in node:
+            calls_in(c, out)
+    return out
+
+
+def call_reach(methods) -> Dict[str, Set[str]]:
+    # μέθοδος -> όσες μπορεί να καλέσει, άμεσα ή μέσω άλλων (μεταβατικό κλείσιμο του γράφου κλήσεων)
+    direct = {m[2]: calls_in(m[4], set()) for m in methods if m and m[0] == 'method'}
+    reach: Dict[str, Set[str]] = {}
+    for name in direct:
+        seen, todo = set(), list(direct[name])
+        while todo:
+            f = todo.pop()
+            if f not in seen:
+                seen.add(f)
+                todo.extend(direct.get(f, ()))
+        reach[name] = seen
+    return reach
+
+
+def names_read(e, out: Set[str]) -> Set[str]:
+    # Ονόματα μεταβλητών που διαβάζει μια έκφραση (όχι τα ονόματα των μεθόδων στις κλήσεις)
+    if isinstance(e, str):
+        out.add(e)
+    elif isinstance(e, tuple) and e:
+        if e[0] == 'call':
+            for a in e[2]:
+                names_read(a, out)
+        elif e[0] == 'inline':                 # ('inline', f, [(fresh, arg), ...], body)
+            for _, a in e[2]:
+                names_read(a, out)
+            names_read(e[3], out)
+        elif e[0] != 'bool':
+            for c in e[2:]:
+                names_read(c, out)
+    return out
+
+
+def names_written(node, out: Set[str]) -> Set[str]:
+    # Ονόματα που γράφονται μέσα σε ένα statement: αναθέσεις και fresh λέξεις των inline
+    if isinstance(node, tuple) and node:
+        if node[0] == 'assign':
+            out.add(node[1])
+        elif node[0] == 'inline':
+            out.update(fresh for fresh, _ in node[2])
+        for c in node[1:]:
+            names_written(c, out)
+    elif isinstance(node, list):
+        for c in node:
+            names_written(c, out)
+    return out
+
+
+def count_ops(e, counts: Dict[str, int]):
+    # Προσθέτει στο counts (κλειδιά από το OPS) τις πράξεις που εκτελεί η έκφραση
+    if isinstance(e, tuple) and e and e[0] != 'bool':
+        tag = e[0]
+        if tag == 'call':
+            counts["CALL"] += 1
+            for a in e[2]:
+                count_ops(a, counts)
+            return
+        if tag == 'inline':
+            for _, a in e[2]:
+                count_ops(a, counts)
+            count_ops(e[3], counts)
+            return
+        counts[{'add': "ADD", 'relop': "CMP"}.get(tag) or ("MUL" if e[1] == '*' else "DIV")] += 1
+        for c in e[2:]:
+            count_ops(c, counts)
+
+
+def has_break(s) -> bool:
+    # Υπάρχει break που βγάζει από τον ΤΡΕΧΟΝΤΑ βρόχο; (δεν κατεβαίνουμε σε εμφωλευμένο while)
+    if not s:
+        return False
+    tag = s[0]
+    if tag == 'break_stmt':
+        return True
+    if tag == 'if_stmt':
+        return has_break(s[2]) or has_break(s[3])
+    if tag == 'block':
+        return any(has_break(x) for x in s[1])
+    return False
+
+
+def always_exits(s) -> bool:
+    # True αν η εκτέλεση δεν συνεχίζει ποτέ στο επόμενο statement της ίδιας λίστας
+    if not s:
+        return False
+    tag = s[0]
+    if tag in ('return_stmt', 'break_stmt'):
+        return True
+    if tag == 'if_stmt':
+        return always_exits(s[2]) and always_exits(s[3])
+    if tag == 'block':
+        return bool(s[1]) and always_exits(s[1][-1])
+    if tag == 'while_stmt':
+        v = const_value(s[1])
+        return v is not None and v != 0 and not has_break(s[2])
+    return False
+
+
+def definitely_assigned(stmts, assigned: Set[str], cands: Set[str], bad: Set[str]) -> Set[str]:
+    # Σημειώνει ως bad όποια υποψήφια διαβάζεται πριν γραφτεί σε κάποιο μονοπάτι
+    def check(e, da):
+        for v in names_read(e, set()):
+            if v in cands and v not in da:
+                bad.add(v)
+
+    def walk(s, da):
+        if not s:
+            return da
+        tag = s[0]
+        if tag == 'assign_stmt':
+            _, (_, v, expr) = s
+            check(expr, da)
+            return da | {v}
+        if tag == 'return_stmt':
+            if s[1] is not None:
+                check(s[1], da)
+            return da
+        if tag == 'if_stmt':
+            check(s[1], da)
+            return walk(s[2], set(da)) & walk(s[3], set(da))
+        if tag == 'while_stmt':
+            check(s[1], da)
+            walk(s[2], set(da))
+            return da
+        if tag == 'block':
+            for x in s[1]:
+                da = walk(x, da)
+            return da
+        return da
+
+    for s in stmts:
+        assigned = walk(s, assigned)
+    return assigned
+
+
+def guards_loop(cond, s, recursive: Set[str]) -> bool:
+    # s = { x = ...; ...; while (cond) ... } με αναθέσεις που δεν αγγίζουν ό,τι διαβάζει η cond
+    # (ούτε μέσω κλήσης που ξαναφτάνει στη μέθοδο, recursive): η cond ισχύει ακόμη στην είσοδο
+    # του while (το σχήμα που αφήνει το licm)
+    if not (s and s[0] == 'block' and s[1]) or calls_in(cond, set()):
+        return False
+    *pre, loop = s[1]
+    if not (loop and loop[0] == 'while_stmt' and loop[1] == cond) or const_value(cond) is not None:
+        return False
+    reads = names_read(cond, set())
+    return all(x and x[0] == 'assign_stmt' and x[1][1] not in reads and not (calls_in(x, set()) & recursive)
+               for x in pre)
@@ -0,0 +1,172 @@
+"""
+Benchmark μνήμης / dispatch: AST από tuples (κλασική μορφή) vs κόμβοι ast_nodes (__slots__).
+
+Για κάθε μέγεθος (πλήθος statements) τυπώνει για τις δύο μορφές: μνήμη του δέντρου
+(tracemalloc: ό,τι μένει allocated μετά το parse) και bytes ανά κόμβο, και τον χρόνο μιας
+πλήρους διάσχισης με dispatch (string tag + isinstance για τα tuples, ακέραιο kind + attributes
+για τους κόμβους). Ελέγχει επίσης ότι to_tuple(κόμβοι) == tuples.
+
+    python benchmarks/bench_ast.py [--stmts 10000 50000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+import ast_nodes as A                  # noqa: E402
+from lexer import lexer                # noqa: E402
+from parser import parse               # noqa: E402
+
+STMTS_PER_METHOD = 500
+
+
+def program(n_stmts):
+    # Μέθοδοι με 500 statements η καθεμία: αναθέσεις, if/else, while, κλήσεις
+    lines = []
+    n_methods = max(1, n_stmts // STMTS_PER_METHOD)
+    for k in range(n_methods):
+        lines.append(f"int f{k}(int a, int b)\n{{\n int i, s, t = 3;")
+        for j in range(STMTS_PER_METHOD // 5):
+            lines.append(f" s = s + (a * {j}) / 3 - b;")
+            lines.append(f" if (s > {j}) {{ t = t + 1; }} else t = s - i;")
+            lines.append(f" while (i < {j % 7}) i = i + 1;")
+        lines.append(f" return s + f{k - 1}(t, 1);" if k else " return s;")
+        lines.append("}")
+    lines.append(f"int main()\n{{\n return f{n_methods - 1}(3, 4);\n}}")
+    return "\n".join(lines) + "\n"
+
+
+def build(source, nodes):
+    lexer.lineno = 1
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    ast = parse(source, lexer=lexer, nodes=nodes)
+    parse_s = time.perf_counter() - t0
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return ast, size, parse_s
+
+
+# ---------------- διασχίσεις (μετρούν κόμβους) ----------------
+
+def walk_tuples(node):
+    n = 0
+    stack = [node]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, list):
+            stack.extend(x)
+            continue
+        n += 1
+        if isinstance(x, (int, str)) or x is None:
+            continue
+        tag = x[0]
+        if tag == 'program':
+            stack.extend(x[1])
+        elif tag == 'method':
+            stack.append(x[4])
+        elif tag == 'body':
+            stack.extend(v[1] for d in x[1] for v in d[2])
+            stack.extend(x[2])
+        elif tag == 'assign_stmt':
+            stack.append(x[1][2])
+        elif tag == 'return_stmt':
+            stack.append(x[1])
+        elif tag == 'if_stmt':
+            stack.extend(x[1:])
+        elif tag == 'while_stmt':
+            stack.extend(x[1:])
+        elif tag == 'block':
+            stack.extend(x[1])
+        elif tag == 'call':
+            stack.extend(x[2])
+        elif tag in ('add', 'mulop', 'relop'):
+            stack.append(x[2])
+            stack.append(x[3])
+    return n
+
+
+def walk_nodes(node):
+    n = 0
+    stack = [node]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, list):
+            stack.extend(x)
+            continue
+        n += 1
+        if x is None or x.__class__ is int or x.__class__ is str:
+            continue
+        k = x.kind
+        if k >= A.ADD and k <= A.GE:
+            stack.append(x.left)
+            stack.append(x.right)
+        elif k == A.ASSIGN:
+            stack.append(x.expr)
+        elif k == A.IF:
+            stack.append(x.cond)
+            stack.append(x.then)
+            stack.append(x.orelse)
+        elif k == A.WHILE:
+            stack.append(x.cond)
+            stack.append(x.body)
+        elif k == A.CALL:
+            stack.extend(x.args)
+        elif k == A.RETURN:
+            stack.append(x.expr)
+        elif k == A.BLOCK:
+            stack.extend(x.stmts)
+        elif k == A.BODY:
+            stack.extend(v.init for d in x.decls for v in d.vars)
+            stack.extend(x.stmts)
+        elif k == A.METHOD:
+            stack.append(x.body)
+        elif k == A.PROGRAM:
+            stack.extend(x.methods)
+    return n
+
+
+def timed(fn, arg, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = fn(arg)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return n, best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--stmts", type=int, nargs="*", default=[10000, 50000])
+    args = ap.parse_args(argv)
+
+    ok = True
+    print(f"{'stmts':>7} {'form':<7} {'nodes':>8} {'MB':>7} {'B/node':>7} {'parse s':>8} {'walk ms':>8}")
+    for n in args.stmts:
+        source = program(n)
+        tuples, t_size, t_parse = build(source, nodes=False)
+        nodes, n_size, n_parse = build(source, nodes=True)
+        count, t_walk = timed(walk_tuples, tuples)
+        count_n, n_walk = timed(walk_nodes, nodes)
+        for form, size, parse_s, walk_s, cnt in (("tuples", t_size, t_parse, t_walk, count),
+                                                 ("nodes", n_size, n_parse, n_walk, count_n)):
+            print(f"{n:7d} {form:<7} {cnt:8d} {size / 2**20:7.2f} {size / cnt:7.1f} {parse_s:8.2f} {1000 * walk_s:8.1f}")
+        print(f"{'':7} memory {100.0 * (t_size - n_size) / t_size:.1f}% less, walk {t_walk / n_walk:.2f}x faster")
+        same = A.to_tuple(nodes) == tuples
+        ok = ok and same and count == count_n
+        if not same:
+            print("MISMATCH: to_tuple(nodes) != tuples")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
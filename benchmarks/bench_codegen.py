@@ -0,0 +1,243 @@
+"""
+Benchmark του παραγόμενου κώδικα με τον MIX simulator, για διάφορους συνδυασμούς βελτιστοποιήσεων.
+
+Για κάθε πρόγραμμα και κάθε ρύθμιση τυπώνει: εντολές (στατικά), λέξεις data, κύκλους (u),
+εκτελεσμένες εντολές και εκτελεσμένες αναφορές στη μνήμη δεδομένων (LD/ST/ADD/SUB/MUL/DIV/CMP).
+Το αποτέλεσμα (rA) πρέπει να είναι ίδιο σε όλες τις ρυθμίσεις που τερματίζουν (χωρίς tail calls
+η αναδρομή δεν επιστρέφει ποτέ: η γραμμή δείχνει "no result" στο όριο βημάτων).
+
+    python benchmarks/bench_codegen.py [files...]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+from lexer import lexer                      # noqa: E402
+from parser import parser                    # noqa: E402
+from symbol_table import build_symbol_table  # noqa: E402
+from mixal_generator import MixalGenerator   # noqa: E402
+from mix_simulator import OPCODES, MixError, run_mixal  # noqa: E402
+from const_fold import fold_constants        # noqa: E402
+
+ALL_OFF = {"fold": False, "inline": False, "dce": False, "licm": False, "cse": False, "order": False, "tco": False,
+           "layout": False, "regalloc": False, "peephole": False, "immediate": False, "regmoves": False, "ir": False}
+MAX_STEPS = 1_000_000
+
+# Κάθε ρύθμιση ενεργοποιεί μία ακόμη βελτιστοποίηση πάνω στην προηγούμενη
+CONFIGS = [
+    ("none", {}),
+    ("+fold", {"fold": True}),
+    ("+inline", {"fold": True, "inline": True}),
+    ("+dce", {"fold": True, "inline": True, "dce": True}),
+    ("+licm", {"fold": True, "inline": True, "dce": True, "licm": True}),
+    ("+cse", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True}),
+    ("+order", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True}),
+    ("+tco", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True, "tco": True}),
+    ("+layout", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True,
+                 "tco": True, "layout": True}),
+    ("+regalloc", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True,
+                   "tco": True, "layout": True, "regalloc": True}),
+    ("+immediate", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True,
+                    "tco": True, "layout": True, "regalloc": True, "immediate": True}),
+    ("+regmoves", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True,
+                   "tco": True, "layout": True, "regalloc": True, "immediate": True, "regmoves": True}),
+    ("+peephole", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True,
+                   "tco": True, "layout": True, "regalloc": True, "immediate": True, "regmoves": True, "peephole": True}),
+    # Επιλογή εντολών από το IR (ir.py): όλα εκτός από το regalloc, που δουλεύει μόνο στο AST
+    ("ir", {"fold": True, "inline": True, "dce": True, "licm": True, "cse": True, "order": True,
+            "tco": True, "layout": True, "immediate": True, "regmoves": True, "peephole": True, "ir": True}),
+]
+
+WORKLOADS = {
+    "loops": '''
+int poly(int x)
+{
+ return x*x*3 + x*2 + 1;
+}
+int main()
+{
+ int i, s, j;
+ s = 0; i = 0;
+ while (i < 40) {
+  j = 0;
+  while (j < 5) { s = s + poly(j) / 7; j = j + 1; }
+  if (s > 1000) { s = s - 1000; } else ;
+  i = i + 1;
+ }
+ return s;
+}
+''',
+    "dead": '''
+int unused(int a, int b)
+{
+ int t;
+ t = a * b + 7;
+ return t / 3;
+}
+int step(int x)
+{
+ if (x > 100) { return x - 100; } else { return x + 3; }
+ x = unused(x, 2);
+ return x;
+}
+int main()
+{
+ int i, s;
+ s = 0; i = 0;
+ while (i < 200) { s = step(s); i = i + 1; }
+ return s;
+ s = unused(s, i);
+}
+''',
+    "tailrec": '''
+int gcd(int a, int b)
+{
+ if (b == 0) { return a; }
+ return gcd(b, a - a / b * b);
+}
+int sum(int n, int acc)
+{
+ if (n == 0) { return acc; }
+ return sum(n - 1, acc + n);
+}
+int even(int n)
+{
+ if (n == 0) { return 1; }
+ return odd(n - 1);
+}
+int odd(int n)
+{
+ if (n == 0) { return 0; }
+ return even(n - 1);
+}
+int main()
+{
+ int i, s;
+ s = 0; i = 0;
+ while (i < 20) { s = s + gcd(1071 + i, 462) + sum(i * 10, 0) + even(i + 30); i = i + 1; }
+ return s;
+}
+''',
+    "invariant": '''
+int scale(int a, int b)
+{
+ int t;
+ t = a * b;
+ return t / 5 + a;
+}
+int main()
+{
+ int i, j, s, w, h;
+ s = 0; i = 0; w = 37; h = 11;
+ while (i < 30) {
+  j = 0;
+  while (j < w * h / 40) { s = s + j * 3 + i * w / h + scale(w, h); j = j + 1; }
+  if (s > 5000) { s = s - 5000; }
+  i = i + 1;
+ }
+ return s;
+}
+''',
+    "common": '''
+int dist(int x, int y)
+{
+ return x * x + y * y;
+}
+int main()
+{
+ int i, s, d;
+ s = 0; i = 0;
+ while (i < 200) {
+  if ((i + 3) * (i + 3) > 900) { s = s + (i + 3) * (i + 3) - 900; }
+  d = dist(i, 7) / 10;
+  s = s + d + dist(i, 7) / 10;
+  i = i + 1;
+ }
+ return s;
+}
+''',
+    "sum": '''
+int main()
+{
+ int i, s;
+ s = 0; i = 0;
+ while (i < 1000) { s = s + i; i = i + 1; }
+ return s;
+}
+''',
+}
+
+# Εντολές που διαβάζουν/γράφουν μνήμη δεδομένων
+_MEMORY_OPS = {op for op, (c, _) in OPCODES.items() if 1 <= c <= 4 or 8 <= c <= 31 or 56 <= c <= 63}
+
+
+def compile_text(source, options):
+    opts = dict(ALL_OFF)
+    opts.update(options)
+    lexer.lineno = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    symbol_table = build_symbol_table(ast)
+    if opts.pop("fold"):
+        ast, _ = fold_constants(ast)
+    gen = MixalGenerator(symbol_table=symbol_table, **opts)
+    return gen.gen_program(ast)
+
+
+def measure(text):
+    try:
+        m = run_mixal(text, max_steps=MAX_STEPS)
+    except MixError:
+        return None
+    lines = text.split("\n")
+    by_line = m.profile_by_line()
+    mem_refs = 0
+    code = data = 0
+    for k, line in enumerate(lines):
+        fields = line[11:].split()
+        op = fields[0] if fields else ""
+        if op == "CON":
+            data += 1
+        elif op in OPCODES:
+            code += 1
+            if op in _MEMORY_OPS:
+                mem_refs += by_line.get(k + 1, 0)
+    return {"rA": m.rA, "code": code, "data": data, "cycles": m.cycles, "steps": m.steps, "mem": mem_refs}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("files", nargs="*", help="source files (default: exaples/ok_*.txt + built-in workloads)")
+    args = ap.parse_args(argv)
+
+    sources = {}
+    for path in args.files or sorted(glob.glob(os.path.join(PKG, "exaples", "ok_*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            sources[os.path.basename(path)] = f.read()
+    if not args.files:
+        sources.update(WORKLOADS)
+
+    ok = True
+    print(f"{'program':<14} {'config':<11} {'code':>5} {'data':>5} {'cycles':>9} {'steps':>8} {'mem refs':>9}")
+    for name, src in sources.items():
+        results = [(cfg, measure(compile_text(src, opts))) for cfg, opts in CONFIGS]
+        for cfg, r in results:
+            if r is None:
+                print(f"{name:<14} {cfg:<11} no result within {MAX_STEPS} steps")
+                continue
+            print(f"{name:<14} {cfg:<11} {r['code']:5d} {r['data']:5d} {r['cycles']:9d} {r['steps']:8d} {r['mem']:9d}")
+        results = [(cfg, r) for cfg, r in results if r is not None]
+        if len({r["rA"] for _, r in results}) != 1:
+            ok = False
+            print(f"{name:<14} MISMATCH: " + ", ".join(f"{cfg}={r['rA']}" for cfg, r in results))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
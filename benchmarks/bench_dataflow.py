@@ -0,0 +1,90 @@
+"""
+Benchmark των αναλύσεων ροής δεδομένων (dataflow.py) σε μεγάλες, τεχνητές μεθόδους.
+
+Για κάθε μέγεθος (statements, τοπικές μεταβλητές) χτίζει μία μέθοδο με αναθέσεις, if/else και
+φωλιασμένους while, τη χαμηλώνει στο IR και τρέχει liveness, reaching definitions και available
+expressions. Τυπώνει blocks, εντολές IR, ορισμούς, εκφράσεις, επισκέψεις blocks ανά ανάλυση
+(ως πολλαπλάσιο του πλήθους των blocks) και χρόνο· το µs/instr πρέπει να μένει περίπου σταθερό.
+
+    python benchmarks/bench_dataflow.py [--sizes 1000:100 4000:200 16000:400]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+from lexer import lexer                          # noqa: E402
+from parser import parser                        # noqa: E402
+from symbol_table import build_symbol_table     # noqa: E402
+from ir import lower_program                     # noqa: E402
+from dataflow import (Facts, available_expressions, liveness,  # noqa: E402
+                      reaching_definitions)
+
+
+def program(statements: int, nvars: int, seed: int = 0) -> str:
+    r = random.Random(seed)
+    names = [f"v{k}" for k in range(nvars)]
+    counters = []
+    left = [statements]
+
+    def expr():
+        a, b = r.choice(names), r.choice(names)
+        return f"{a} {r.choice('+-*')} {b if r.random() < 0.7 else r.randint(1, 9)}"
+
+    def block(depth):
+        out = []
+        while left[0] > 0 and (depth == 0 or len(out) < r.randint(2, 6)):
+            left[0] -= 1
+            k = r.random()
+            if k < 0.7 or depth > 3:
+                out.append(f"{r.choice(names)} = {expr()};")
+            elif k < 0.85:
+                out.append(f"if ({r.choice(names)} < {r.choice(names)}) {{ {' '.join(block(depth + 1))} }}"
+                           f" else {{ {' '.join(block(depth + 1))} }}")
+            else:
+                c = f"c{len(counters)}"
+                counters.append(c)
+                out.append(f"{c} = 0; while ({c} < 3) {{ {' '.join(block(depth + 1))} {c} = {c} + 1; }}")
+        return out
+
+    body = block(0)
+    decl = ", ".join(names + counters)
+    return "int main()\n{\n int " + decl + ";\n " + "\n ".join(body) + "\n return v0;\n}\n"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", nargs="*", default=["1000:100", "4000:200", "16000:400"],
+                    help="statements:locals")
+    args = ap.parse_args(argv)
+
+    print(f"{'stmts':>7} {'vars':>6} {'blocks':>7} {'instrs':>7} {'defs':>7} {'exprs':>7}"
+          f" {'live':>6} {'reach':>6} {'avail':>6} {'ms':>8} {'us/instr':>9}")
+    for size in args.sizes:
+        statements, nvars = (int(x) for x in size.split(":"))
+        lexer.lineno = 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            ast = parser.parse(program(statements, nvars), lexer=lexer)
+        ir = lower_program(ast, build_symbol_table(ast))["main"]
+        blocks = len(ir.blocks)
+        t0 = time.perf_counter()
+        facts = Facts(ir)
+        live = liveness(facts)
+        reach, defs = reaching_definitions(facts)
+        avail, exprs = available_expressions(facts)
+        ms = 1000 * (time.perf_counter() - t0)
+        n = ir.instr_count()
+        print(f"{statements:7d} {len(facts.names):6d} {blocks:7d} {n:7d} {len(defs.sites):7d} {len(exprs.keys):7d}"
+              f" {live.visits / blocks:6.2f} {reach.visits / blocks:6.2f} {avail.visits / blocks:6.2f}"
+              f" {ms:8.1f} {1000 * ms / n:9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
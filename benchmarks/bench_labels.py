@@ -0,0 +1,95 @@
+"""
+Benchmark του LabelAllocator (mixal_generator.py) με πολλά labels που μοιράζονται μακρύ πρόθεμα.
+
+Ονόματα όπως τα φτιάχνει ο generator για μεταβλητές/συναρτήσεις (main_counter1, main_counter2, ...):
+μετά το κόψιμο στους 10 χαρακτήρες όλα συγκρούονται στο MAINCOUNTE. Για κάθε πλήθος τυπώνει
+χρόνο, μ.ο. δοκιμών ανά label και μέγιστο μήκος, για:
+  legacy    -> το παλιό _uniquify (γραμμικό probing με hex suffix 1-2 χαρακτήρων· μετά από ~256
+               συγκρούσεις του ίδιου προθέματος δεν βρίσκει ελεύθερο όνομα: "stuck")
+  allocator -> LabelAllocator.claim (μετρητής ανά πρόθεμα, base-36)
+Ελέγχει ότι όλα τα labels είναι μοναδικά, <= 10 χαρακτήρες, και ίδια σε δύο εκτελέσεις.
+
+    python benchmarks/bench_labels.py [--labels 1000 10000 50000]
+"""
+import argparse
+import os
+import sys
+import time
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+from mixal_generator import LABEL_LIMIT, RESERVED_LABELS, LabelAllocator, sanitize_label  # noqa: E402
+
+STUCK = 4096   # δοκιμές για ένα label μετά τις οποίες το legacy θεωρείται κολλημένο
+
+
+def names(n):
+    # μισά "μεταβλητές" με κοινό πρόθεμα, μισά labels ελέγχου ροής όπως τα ζητάει ο generator
+    out = []
+    for k in range(n // 2):
+        out.append(f"main_counter{k}")
+        out.append(f"WEND{k}")
+    return out
+
+
+class Legacy:
+    def __init__(self):
+        self.used = set()
+        self.probes = 0
+
+    def claim(self, base):
+        base = sanitize_label(base)[:LABEL_LIMIT]
+        cand = base
+        i = 1
+        while cand in self.used or cand in RESERVED_LABELS or not cand:
+            suf = f"{i:X}"[-2:]
+            cand = (base[:max(1, LABEL_LIMIT - len(suf))] + suf)[:LABEL_LIMIT]
+            i += 1
+            self.probes += 1
+            if i > STUCK:
+                return None
+        self.used.add(cand)
+        return cand
+
+
+def run(make, labels):
+    alloc = make()
+    t0 = time.perf_counter()
+    out = []
+    for name in labels:
+        lab = alloc.claim(name)
+        if lab is None:
+            return None, time.perf_counter() - t0, alloc.probes, len(out)
+        out.append(lab)
+    return out, time.perf_counter() - t0, alloc.probes, len(out)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--labels", type=int, nargs="*", default=[1000, 10000, 50000])
+    args = ap.parse_args(argv)
+
+    ok = True
+    print(f"{'labels':>7} {'allocator':<10} {'ms':>9} {'probes/label':>13} {'max len':>8} {'status':<10}")
+    for n in args.labels:
+        labels = names(n)
+        for title, make in (("legacy", Legacy), ("allocator", LabelAllocator)):
+            out, secs, probes, done = run(make, labels)
+            if out is None:
+                print(f"{n:7d} {title:<10} {1000 * secs:9.1f} {probes / max(1, done):13.1f} {'-':>8} "
+                      f"stuck after {done}")
+                continue
+            again, _, _, _ = run(make, labels)
+            unique = len(set(out)) == len(out)
+            longest = max(map(len, out))
+            good = unique and longest <= LABEL_LIMIT and again == out
+            print(f"{n:7d} {title:<10} {1000 * secs:9.1f} {probes / len(out):13.3f} {longest:8d} "
+                  f"{'ok' if good else 'BAD':<10}")
+            if title == "allocator":
+                ok = ok and good
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
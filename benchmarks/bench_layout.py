@@ -0,0 +1,124 @@
+"""
+Benchmark της διάταξης ροής (layout) του MixalGenerator: κύκλοι ανά επανάληψη βρόχου.
+
+Κάθε workload είναι ένας βρόχος με N επαναλήψεις (το "{n}" στον κώδικα). Μεταγλωττίζεται με N και 2N
+και οι κύκλοι ανά επανάληψη είναι (cycles(2N) - cycles(N)) / N, ώστε να μη μετράει ο κώδικας έξω από
+τον βρόχο. Για κάθε συνδυασμό peephole / regalloc τυπώνει χωρίς και με layout (rotated βρόχοι με
+έλεγχο στο τέλος, χωρίς JMP πριν από κενό else, labels πάνω σε εντολές) και ελέγχει ότι το rA
+είναι ίδιο.
+
+    python benchmarks/bench_layout.py [--n 1000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+from lexer import lexer                      # noqa: E402
+from parser import parser                    # noqa: E402
+from symbol_table import build_symbol_table  # noqa: E402
+from mixal_generator import MixalGenerator   # noqa: E402
+from mix_simulator import run_mixal          # noqa: E402
+
+WORKLOADS = {
+    "count": '''
+int main()
+{
+ int i, s;
+ s = 0; i = 0;
+ while (i < {n}) { s = s + i; i = i + 1; }
+ return s;
+}
+''',
+    "if-no-else": '''
+int main()
+{
+ int i, s;
+ s = 0; i = 0;
+ while (i < {n}) {
+  if (s > 500) { s = s - 500; }
+  s = s + 7;
+  i = i + 1;
+ }
+ return s;
+}
+''',
+    "nested": '''
+int main()
+{
+ int i, j, s;
+ s = 0; i = 0;
+ while (i < {n}) {
+  j = 0;
+  while (j < 3) { s = s + j; j = j + 1; }
+  i = i + 1;
+ }
+ return s;
+}
+''',
+    "break": '''
+int main()
+{
+ int i, s;
+ s = 0; i = 0;
+ while (1) {
+  if (i >= {n}) { break; }
+  s = s + 2;
+  i = i + 1;
+ }
+ return s;
+}
+''',
+}
+
+CONFIGS = [
+    ("plain", {"peephole": False, "regalloc": False}),
+    ("+regalloc", {"peephole": False, "regalloc": True}),
+    ("+peephole", {"peephole": True, "regalloc": True}),
+]
+
+
+def compile_text(source, options):
+    lexer.lineno = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    gen = MixalGenerator(symbol_table=build_symbol_table(ast), **options)
+    return gen.gen_program(ast)
+
+
+def run(src, n, options):
+    m = run_mixal(compile_text(src.replace("{n}", str(n)), options))
+    return m.rA, m.cycles
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=1000, help="iterations of the measured loop (and 2n)")
+    args = ap.parse_args(argv)
+
+    ok = True
+    print(f"{'loop':<11} {'config':<10} {'u/iter before':>14} {'u/iter after':>13} {'saved':>7}")
+    for name, src in WORKLOADS.items():
+        for cfg, opts in CONFIGS:
+            per_iter = []
+            results = set()
+            for layout in (False, True):
+                o = dict(opts, layout=layout)
+                ra1, c1 = run(src, args.n, o)
+                ra2, c2 = run(src, 2 * args.n, o)
+                results.add((ra1, ra2))
+                per_iter.append((c2 - c1) / args.n)
+            before, after = per_iter
+            print(f"{name:<11} {cfg:<10} {before:14.2f} {after:13.2f} {100 * (before - after) / before:6.1f}%")
+            if len(results) != 1:
+                ok = False
+                print(f"{name:<11} MISMATCH: {sorted(results)}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Benchmark λεξικής ανάλυσης σε πολύ μεγάλα προγράμματα: διπλό lexing vs TokenBuffer.
+
+Τρεις τρόποι για το "lex + dump + parse" του compile_source:
+  twice   -> όπως παλιά: ένα πέρασμα του lexer για το lexical_analysis.txt και δεύτερο μέσα στον parser
+  buffer  -> μία λεξική ανάλυση σε TokenBuffer, dump από το buffer, parse μέσω του token() shim
+  nodump  -> TokenBuffer χωρίς dump (--no-lex-dump)
+Τυπώνει χρόνο lexing (σύνολο περασμάτων του lexer), dump, parse και μνήμη του buffer
+(tracemalloc) σε σχέση με μία λίστα από LexToken. Ελέγχει ότι dump και AST είναι ίδια.
+
+    python benchmarks/bench_lex.py [--stmts 10000 100000 300000]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+from lexer import lexer, TokenBuffer    # noqa: E402
+from parser import parser               # noqa: E402
+
+
+def program(n):
+    lines = ["int main()\n{\n int i, s, t = 3;"]
+    for k in range(n // 3):
+        lines.append(f" s = s + (t * {k}) / 3 - i;")
+        lines.append(f" if (s > {k}) t = t + 1; else t = s - i;")
+        lines.append(f" while (i < {k % 7}) i = i + 1;")
+    lines.append(" return s;\n}")
+    return "\n".join(lines) + "\n"
+
+
+def lex_list(source):
+    lexer.lineno = 1
+    lexer.input(source)
+    out = []
+    while True:
+        tok = lexer.token()
+        if not tok:
+            return out
+        out.append(tok)
+
+
+def run_twice(source):
+    f = io.StringIO()
+    t0 = time.perf_counter()
+    for tok in lex_list(source):
+        f.write(f"{tok}\n")
+    t1 = time.perf_counter()
+    lexer.lineno = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    t2 = time.perf_counter()
+    return {"lex+dump": t1 - t0, "parse": t2 - t1}, f.getvalue(), ast
+
+
+def run_buffer(source, dump=True):
+    f = io.StringIO()
+    t0 = time.perf_counter()
+    tokens = TokenBuffer(source)
+    t1 = time.perf_counter()
+    if dump:
+        tokens.dump(f)
+    t2 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=tokens)
+    t3 = time.perf_counter()
+    return {"lex": t1 - t0, "dump": t2 - t1, "parse": t3 - t2}, f.getvalue(), ast
+
+
+def memory(build, source):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    kept = build(source)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return size, len(kept)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--stmts", type=int, nargs="*", default=[10000, 100000, 300000])
+    args = ap.parse_args(argv)
+
+    ok = True
+    print(f"{'stmts':>7} {'tokens':>8} {'mode':<7} {'total s':>8} {'parse s':>8} {'B/token':>8}")
+    for n in args.stmts:
+        source = program(n)
+        list_size, count = memory(lex_list, source)
+        buf_size, _ = memory(TokenBuffer, source)
+        old, old_dump, old_ast = run_twice(source)
+        new, new_dump, new_ast = run_buffer(source)
+        skip, _, skip_ast = run_buffer(source, dump=False)
+        for mode, t, size in (("twice", old, list_size), ("buffer", new, buf_size), ("nodump", skip, buf_size)):
+            print(f"{n:7d} {count:8d} {mode:<7} {sum(t.values()):8.2f} {t['parse']:8.2f} {size / count:8.1f}")
+        print(f"{'':7} buffer {sum(old.values()) / sum(new.values()):.2f}x, "
+              f"nodump {sum(old.values()) / sum(skip.values()):.2f}x faster; "
+              f"token memory {100.0 * (list_size - buf_size) / list_size:.1f}% less")
+        same = old_dump == new_dump and old_ast == new_ast == skip_ast
+        ok = ok and same
+        if not same:
+            print("MISMATCH: dump/AST differ between twice and buffer")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
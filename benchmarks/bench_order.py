@@ -0,0 +1,101 @@
+"""
+Benchmark της σειράς υπολογισμού τελεστέων (ordering.py, Sethi–Ullman).
+
+Μεταγλωττίζει κάθε πρόγραμμα με όλες τις βελτιστοποιήσεις, χωρίς και με την αναδιάταξη, και τυπώνει
+ανά μέθοδο τα spills (STA σε TMPn) και τις προσωρινές λέξεις μετά το pooling, και ανά πρόγραμμα
+τους κύκλους του MIX simulator. Το rA πρέπει να είναι ίδιο. Προεπιλογή: exaples/ok_*.txt, τα
+workloads του bench_codegen και ένα πρόγραμμα με βαθιά φωλιασμένες εκφράσεις.
+
+    python benchmarks/bench_order.py [files...]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lexer import lexer                      # noqa: E402
+from parser import parser                    # noqa: E402
+from symbol_table import build_symbol_table  # noqa: E402
+from const_fold import fold_constants        # noqa: E402
+from mixal_generator import MixalGenerator   # noqa: E402
+from mix_simulator import MixError, run_mixal  # noqa: E402
+from bench_codegen import WORKLOADS as CODEGEN_WORKLOADS  # noqa: E402
+
+NESTED = '''
+int main()
+{
+ int a, b, c, d, s, i;
+ a = 3; b = 5; c = 7; d = 2; s = 0; i = 0;
+ while (i < 50) {
+   s = s + a * (b + c * (d + i));
+   s = (a + b) * (c * d + a * (b - c)) - s;
+   if (1 + i == d * (a + c)) s = s - 1;
+   if (s < b * (c + d)) s = s + c;
+   i = i + 1;
+ }
+ return s;
+}
+'''
+
+
+def compile_gen(source, order):
+    lexer.lineno = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    symbol_table = build_symbol_table(ast)
+    ast, _ = fold_constants(ast)
+    gen = MixalGenerator(symbol_table=symbol_table, order=order)
+    return gen, gen.gen_program(ast)
+
+
+def run(text):
+    try:
+        vm = run_mixal(text, max_steps=1_000_000)
+    except MixError:
+        return None, None
+    return vm.rA, vm.cycles
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("files", nargs="*", help="source files (default: exaples/ok_*.txt + built-in workloads)")
+    args = ap.parse_args(argv)
+
+    sources = {}
+    for path in args.files or sorted(glob.glob(os.path.join(PKG, "exaples", "ok_*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            sources[os.path.basename(path)] = f.read()
+    if not args.files:
+        sources.update(CODEGEN_WORKLOADS)
+        sources["nested"] = NESTED
+
+    ok = True
+    total = [0, 0, 0, 0]
+    print(f"{'program':<14} {'method':<12} {'spills':>13} {'temp words':>11} {'cycles':>15}")
+    for name, src in sources.items():
+        (g0, t0), (g1, t1) = compile_gen(src, False), compile_gen(src, True)
+        (rA0, c0), (rA1, c1) = run(t0), run(t1)
+        cycles = f"{c0} -> {c1}" if c0 is not None and c1 is not None else "no result"
+        for k, method in enumerate(g1.temp_stats):
+            s0, s1 = g0.temp_stats.get(method, {}), g1.temp_stats[method]
+            total[0] += s0.get("spills", 0)
+            total[1] += s1["spills"]
+            total[2] += s0.get("pooled", 0)
+            total[3] += s1["pooled"]
+            print(f"{name if k == 0 else '':<14} {method:<12} {s0.get('spills', 0):>5} -> {s1['spills']:<4}"
+                  f" {s0.get('pooled', 0):>3} -> {s1['pooled']:<3} {cycles if k == 0 else '':>15}")
+        if rA0 != rA1:
+            ok = False
+            print(f"{name:<14} MISMATCH: rA {rA0} without, {rA1} with operand ordering")
+    print(f"{'total':<14} {'':<12} {total[0]:>5} -> {total[1]:<4} {total[2]:>3} -> {total[3]:<3}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
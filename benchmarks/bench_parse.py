@@ -0,0 +1,72 @@
+"""
+Benchmark κλιμάκωσης του parser: χρόνος parse για συνθετικά προγράμματα 1k / 10k / 100k statements.
+
+Δύο μορφές προγράμματος:
+  long  -> μία μέθοδος με όλα τα statements (λίστες STMTS / DECLS / VARS μεγάλες)
+  wide  -> μέθοδοι των 10 statements με 8 παραμέτρους/ορίσματα (μεγάλη METH_LIST)
+Για γραμμικό parse ο χρόνος ανά statement (us/stmt) μένει περίπου σταθερός· η στήλη "x" είναι
+ο λόγος του us/stmt ως προς το μικρότερο μέγεθος.
+
+    python benchmarks/bench_parse.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+from lexer import lexer      # noqa: E402
+from parser import parser    # noqa: E402
+
+PARAMS = 8
+
+
+def long_program(n):
+    decls = ", ".join(f"v{k}" for k in range(max(1, n // 10)))
+    body = [f" v{k % max(1, n // 10)} = v{(k + 1) % max(1, n // 10)} + {k};" for k in range(n - 1)]
+    return f"int main()\n{{\n int {decls};\n" + "\n".join(body) + "\n return 0;\n}\n"
+
+
+def wide_program(n):
+    params = ", ".join(f"int p{k}" for k in range(PARAMS))
+    args = ", ".join(str(k) for k in range(PARAMS))
+    out = []
+    n_methods = max(1, n // 10)
+    for m in range(n_methods):
+        stmts = [f" s = s + p{k % PARAMS};" for k in range(8)]
+        call = f" s = f{m - 1}({args});" if m else " s = 1;"
+        out.append(f"int f{m}({params})\n{{\n int s;\n" + "\n".join(stmts) + f"\n{call}\n return s;\n}}\n")
+    out.append(f"int main()\n{{\n return f{n_methods - 1}({args});\n}}\n")
+    return "".join(out)
+
+
+def parse_time(source):
+    lexer.lineno = 1
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    return time.perf_counter() - t0, ast
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 100000])
+    args = ap.parse_args(argv)
+
+    print(f"{'shape':<6} {'stmts':>8} {'seconds':>9} {'us/stmt':>9} {'x':>6}")
+    for shape, make in (("long", long_program), ("wide", wide_program)):
+        base = None
+        for n in args.sizes:
+            secs, ast = parse_time(make(n))
+            per = 1e6 * secs / n
+            base = base or per
+            print(f"{shape:<6} {n:8d} {secs:9.2f} {per:9.1f} {per / base:6.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
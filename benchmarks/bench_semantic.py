@@ -0,0 +1,112 @@
+"""
+Benchmark του semantic analyzer (semantic_check.py) σε μεγάλα, τεχνητά προγράμματα.
+
+Για κάθε μέγεθος τυπώνει: μεθόδους, κόμβους (statements + εκφράσεις), πόσα περάσματα έγιναν
+πάνω στο πρόγραμμα, πόσες φορές διασχίστηκε κάθε μέθοδος, κόμβους που επισκεφθήκαμε και χρόνο.
+Το traversals πρέπει να είναι 1 και visited == nodes, ανεξάρτητα από το πλήθος των ελέγχων.
+
+    python benchmarks/bench_semantic.py [--methods 10 100 1000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PKG)
+
+from lexer import lexer                          # noqa: E402
+from parser import parser                        # noqa: E402
+from symbol_table import build_symbol_table     # noqa: E402
+from semantic_check import CHECKS, SemanticAnalyzer  # noqa: E402
+
+METHOD = '''
+int f{k}(int a, int b)
+{{
+ int i, s;
+ s = 0; i = 0;
+ while (i < b) {{
+  if (a > i) {{ s = s + (a * i) / 3; }} else {{ s = s - i; if (s < 0) break; }}
+  i = i + 1;
+ }}
+ return s + f{prev}(a, 1);
+}}
+'''
+
+
+def program(n):
+    parts = ["int f0(int a, int b)\n{\n return a + b;\n}\n"]
+    parts += [METHOD.format(k=k, prev=k - 1) for k in range(1, n)]
+    parts.append("int main()\n{\n return f%d(3, 4);\n}\n" % (n - 1))
+    return "".join(parts)
+
+
+def count_nodes(node):
+    # statements + εκφράσεις, όπως τα μετράει ο analyzer
+    n = 0
+
+    def expr(e):
+        nonlocal n
+        if e is None:
+            return
+        n += 1
+        if isinstance(e, tuple) and e:
+            for sub in (e[2] if e[0] == 'call' else (() if e[0] == 'bool' else e[2:])):
+                expr(sub)
+
+    def stmt(s):
+        nonlocal n
+        if not s:
+            return
+        n += 1
+        tag = s[0]
+        if tag == 'assign_stmt':
+            expr(s[1][2])
+        elif tag == 'return_stmt':
+            expr(s[1])
+        elif tag in ('if_stmt', 'while_stmt'):
+            expr(s[1])
+            for sub in s[2:]:
+                stmt(sub)
+        elif tag == 'block':
+            for x in s[1]:
+                stmt(x)
+
+    for m in node[1]:
+        for d in m[4][1]:
+            for _, init in d[2]:
+                expr(init)
+        for s in m[4][2]:
+            stmt(s)
+    return n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--methods", type=int, nargs="*", default=[10, 100, 1000])
+    args = ap.parse_args(argv)
+
+    ok = True
+    print(f"checks: {', '.join(c.name for c in CHECKS)}")
+    print(f"{'methods':>8} {'nodes':>8} {'traversals':>10} {'walks/method':>12} {'visited':>8} {'diags':>6} {'ms':>8}")
+    for n in args.methods:
+        lexer.lineno = 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            ast = parser.parse(program(n), lexer=lexer)
+        symbol_table = build_symbol_table(ast)
+        an = SemanticAnalyzer(symbol_table)
+        t0 = time.perf_counter()
+        diags = an.analyze(ast)
+        ms = 1000 * (time.perf_counter() - t0)
+        nodes = count_nodes(ast)
+        st = an.stats
+        walks = st["method_walks"] / len(ast[1])
+        print(f"{n + 1:8d} {nodes:8d} {st['traversals']:10d} {walks:12.2f} {st['nodes']:8d} {len(diags):6d} {ms:8.1f}")
+        ok = ok and st["traversals"] == 1 and st["nodes"] == nodes and walks == 1 and not diags
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
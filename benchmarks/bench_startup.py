@@ -0,0 +1,58 @@
+"""
+Benchmark χρόνου εκκίνησης του compiler (import lexer + parser σε καινούριο interpreter).
+
+Συγκρίνει:
+  - precomputed : με τα lextab.py/parsetab.py του repo (κανονική διαδρομή)
+  - rebuild     : χωρίς artifacts (αντίγραφο των modules σε προσωρινό φάκελο), δηλ. κατασκευή
+                  LALR πινάκων/master regex σε κάθε εκκίνηση όπως πριν
+  - python      : σκέτος interpreter (βάση σύγκρισης)
+
+    python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["lexer.py", "parser.py", "ply_tables.py", "ast_nodes.py"]
+
+
+def _time_import(pkg_dir, code, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=pkg_dir, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), min(samples)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=15)
+    args = ap.parse_args(argv)
+
+    imp = "import sys; sys.path.insert(0, '.'); import lexer, parser"
+    rows = [("python", _time_import(PKG, "pass", args.runs)),
+            ("precomputed", _time_import(PKG, imp, args.runs))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for m in MODULES:
+            shutil.copy(os.path.join(PKG, m), tmp)
+        rows.append(("rebuild", _time_import(tmp, imp, args.runs)))
+        leaked = sorted(set(os.listdir(tmp)) - set(MODULES) - {"__pycache__"})
+
+    base = rows[0][1][0]
+    print(f"{'variant':<12} {'median ms':>10} {'min ms':>8} {'import ms':>10}")
+    for name, (med, best) in rows:
+        print(f"{name:<12} {med * 1000:10.1f} {best * 1000:8.1f} {(med - base) * 1000:10.1f}")
+    print(f"files written by the rebuild run: {leaked or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Content-addressed cache στον δίσκο, ανά μέθοδο.
+
+Κλειδί μιας μεθόδου = sha256 από:
+  - τον κόμβο ('method', ...) του AST,
+  - το scope της μεθόδου στο symbol table,
+  - τις υπογραφές (όνομα, params) των συναρτήσεων που καλεί,
+  - το entry point, τις επιλογές του generator και ένα fingerprint του ίδιου του compiler.
+
+Αποθηκεύονται:
+  - "sem": τα semantic diagnostics της μεθόδου (λίστα από Diagnostic.to_dict()),
+  - "gen": ο κώδικας της μεθόδου σε "relocatable" μορφή. Τα labels αντικαθίστανται από
+    αναφορές σε κλήσεις allocation του MixalGenerator (var/const/func/ret/new label) ώστε
+    στο gen_program να ξαναγίνεται μόνο το layout labels/data του συνολικού προγράμματος.
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+from ast_utils import calls_in
+
+CACHE_FORMAT = 1
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_fingerprint = None
+
+
+def compiler_fingerprint() -> str:
+    # Hash όλων των modules του compiler: οποιαδήποτε αλλαγή στον κώδικα ακυρώνει το cache
+    global _fingerprint
+    if _fingerprint is None:
+        h = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(_HERE, "*.py"))):
+            h.update(os.path.basename(path).encode("utf-8"))
+            with open(path, "rb") as f:
+                h.update(f.read())
+        _fingerprint = h.hexdigest()
+    return _fingerprint
+
+
+class CompileCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ---------------- keys ----------------
+    def method_key(self, method, symbol_table, entry: str = "main", options=None) -> str:
+        _, _, name, _, _ = method
+        callees = sorted(calls_in(method[4], set()))
+        material = [
+            CACHE_FORMAT,
+            compiler_fingerprint(),
+            entry,
+            name == entry,
+            sorted((options or {}).items()),
+            method,
+            symbol_table.scope(name).entries,
+            [(c, list(symbol_table.signatures[c].params) if c in symbol_table else None) for c in callees],
+        ]
+        return hashlib.sha256(repr(material).encode("utf-8")).hexdigest()
+
+    # ---------------- storage ----------------
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, key[:2], key + ".json")
+
+    def get(self, kind: str, key: str):
+        try:
+            with open(self._path(kind, key), encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, kind: str, key: str, value):
+        # Ατομική εγγραφή (tmp + rename) ώστε παράλληλα workers να μη βλέπουν μισά αρχεία
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+# ---------------- semantic checks ανά μέθοδο ----------------
+
+def run_semantic_checks(ast, symbol_table, stream=None, cache=None):
+    """
+    Τρέχει τον SemanticAnalyzer (μία διάσχιση του AST) και γράφει τα diagnostics στο stream.
+    Με cache, τα diagnostics κάθε μεθόδου ξαναχρησιμοποιούνται αν η μέθοδος και οι
+    υπογραφές των συναρτήσεων που καλεί δεν άλλαξαν. Οι έλεγχοι του symbol table τρέχουν πάντα.
+    Επιστρέφει τη λίστα με τα Diagnostic.
+    """
+    from semantic_check import Diagnostic, SemanticAnalyzer, format_diagnostics
+
+    analyzer = SemanticAnalyzer(symbol_table)
+    symbol_table = analyzer.symbol_table          # SymbolTable και όταν δόθηκε dict
+    if cache is None:
+        diagnostics = analyzer.analyze(ast)
+    else:
+        diagnostics = list(analyzer.run_program_checks())
+        for m in (ast[1] if (ast and ast[0] == 'program') else []):
+            if not m or m[0] != 'method':
+                continue
+            key = cache.method_key(m, symbol_table)
+            hit = cache.get("sem", key)
+            if hit is None:
+                found = analyzer.analyze_method(m)
+                cache.put("sem", key, [d.to_dict() for d in found])
+            else:
+                found = [Diagnostic.from_dict(d) for d in hit]
+            diagnostics.extend(found)
+        diagnostics = analyzer.sorted(diagnostics)
+
+    if stream and diagnostics:
+        stream.write(format_diagnostics(diagnostics))
+    return diagnostics
@@ -0,0 +1,269 @@
+"""
+Constant folding / propagation πάνω στο AST (τρέχει μετά τους semantic ελέγχους, πριν το codegen).
+
+  - διπλώνει υποδέντρα add / mulop / relop / bool με σταθερούς τελεστέους,
+  - διαδίδει γνωστές σταθερές τιμές τοπικών μεταβλητών σε ευθύγραμμο κώδικα
+    (ενώνει στα if, "σκοτώνει" ό,τι γράφεται μέσα σε while),
+  - απλοποιεί ταυτότητες: x+0, x-0, x*1, x*0, x-x, (x*c)/c,
+  - if/while με σταθερή συνθήκη αντικαθίστανται από τον κλάδο που εκτελείται.
+
+Σεβόμαστε τη σημασιολογία του κώδικα που παράγει ο MixalGenerator:
+  - δεν διπλώνουμε αποτέλεσμα που δεν χωράει σε λέξη MIX (|v| > WORD_MAX → overflow στο ADD/MUL),
+  - δεν κάνουμε reassociation ((a+10)-10 ≠ a όταν το a+10 κάνει overflow),
+  - διαίρεση σταθερών με αποκοπή προς το μηδέν: ο DIV του generator κρατά το πρόσημο του διαιρετέου
+    στο A (και στον δρόμο μίας λέξης), άρα το πηλίκο έχει πρόσημο διαιρετέος × διαιρέτης,
+  - x*1 δεν απλοποιείται ως αριστερός τελεστέος διαίρεσης (αλλάζει ο wide δρόμος του DIV),
+  - οι μεταβλητές είναι στατικές λέξεις: μια κλήση που μπορεί να ξαναμπεί στην τρέχουσα
+    μέθοδο (αναδρομή) ακυρώνει όλες τις γνωστές τιμές.
+"""
+from typing import Dict, Optional, Set
+
+from ast_utils import call_reach, calls_in, const_value
+from mix_simulator import WORD_MAX
+
+
+def count_nodes(node) -> int:
+    # Πλήθος κόμβων του AST (tuples + φύλλα), για τα στατιστικά
+    if isinstance(node, tuple):
+        return 1 + sum(count_nodes(c) for c in node[1:])
+    if isinstance(node, list):
+        return sum(count_nodes(c) for c in node)
+    return 0 if node is None else 1
+
+
+def _has_call(e) -> bool:
+    if isinstance(e, tuple) and e:
+        if e[0] == 'call':
+            return True
+        return any(_has_call(c) for c in e[1:])
+    if isinstance(e, list):
+        return any(_has_call(c) for c in e)
+    return False
+
+
+def _assigned_in(node, out: Set[str]) -> Set[str]:
+    # Ονόματα που γράφονται μέσα σε ένα statement (αναδρομικά)
+    if isinstance(node, tuple) and node:
+        if node[0] == 'assign':
+            out.add(node[1])
+        for c in node[1:]:
+            _assigned_in(c, out)
+    elif isinstance(node, list):
+        for c in node:
+            _assigned_in(c, out)
+    return out
+
+
+class ConstFolder:
+    def __init__(self):
+        self.stats = {
+            "nodes_before": 0,
+            "nodes_after": 0,
+            "folded": 0,        # υποδέντρα που έγιναν σταθερά
+            "propagated": 0,    # χρήσεις μεταβλητών που αντικαταστάθηκαν από σταθερά
+            "identities": 0,    # x+0, x*1, x*0, x-x, (x*c)/c
+            "branches": 0,      # if/while με σταθερή συνθήκη
+        }
+        self.current_method: Optional[str] = None
+        self.reaches: Dict[str, Set[str]] = {}    # συνάρτηση -> συναρτήσεις που μπορεί να καλέσει (μεταβατικά)
+
+    # ---------------- program / method ----------------
+    def fold_program(self, ast):
+        if not ast or ast[0] != 'program':
+            return ast
+        self.stats["nodes_before"] += count_nodes(ast)
+        self.reaches = call_reach(ast[1])
+        methods = [self._fold_method(m) if m and m[0] == 'method' else m for m in ast[1]]
+        out = ('program', methods)
+        self.stats["nodes_after"] += count_nodes(out)
+        return out
+
+    def _fold_method(self, m):
+        _, ret_type, name, params, body = m
+        self.current_method = name
+        env: Dict[str, int] = {}
+        _, decls, stmts = body
+        new_decls = []
+        for d in decls:
+            if not d or d[0] != 'decl':
+                new_decls.append(d)
+                continue
+            items = []
+            for vname, expr in d[2]:
+                if expr is not None:
+                    expr = self._expr_stmt(expr, env)
+                    self._bind(env, vname, expr)
+                else:
+                    env.pop(vname, None)   # στατική λέξη: κρατά την τιμή της προηγούμενης κλήσης
+                items.append((vname, expr))
+            new_decls.append(('decl', d[1], items))
+        new_stmts = self._fold_stmts(stmts, env)
+        return ('method', ret_type, name, params, ('body', new_decls, new_stmts))
+
+    # ---------------- helpers ----------------
+    def _clobbers(self, e) -> bool:
+        # Κλήση που μπορεί να ξαναμπεί στην τρέχουσα μέθοδο -> οι στατικές της μεταβλητές αλλάζουν
+        cur = self.current_method
+        return any(f == cur or cur in self.reaches.get(f, ()) for f in calls_in(e, set()))
+
+    def _bind(self, env, name, expr):
+        v = const_value(expr)
+        if v is None:
+            env.pop(name, None)
+        else:
+            env[name] = v
+
+    def _expr_stmt(self, e, env):
+        # Έκφραση σε επίπεδο statement: αν περιέχει "επικίνδυνη" κλήση, καμία διάδοση πριν/μετά
+        if self._clobbers(e):
+            env.clear()
+        return self._fold_expr(e, env)
+
+    # ---------------- statements ----------------
+    def _fold_stmts(self, stmts, env):
+        return [self._fold_stmt(s, env) for s in stmts]
+
+    def _fold_stmt(self, s, env):
+        if not s:
+            return s
+        tag = s[0]
+
+        if tag == 'assign_stmt':
+            _, (_, varname, expr) = s
+            expr = self._expr_stmt(expr, env)
+            self._bind(env, varname, expr)
+            return ('assign_stmt', ('assign', varname, expr))
+
+        if tag == 'return_stmt':
+            expr = s[1]
+            return ('return_stmt', None if expr is None else self._expr_stmt(expr, env))
+
+        if tag == 'if_stmt':
+            _, cond, then_stmt, else_stmt = s
+            cond = self._expr_stmt(cond, env)
+            v = const_value(cond)
+            if v is not None:
+                # γνωστή συνθήκη: μένει μόνο ο κλάδος που εκτελείται
+                self.stats["branches"] += 1
+                return self._fold_stmt(then_stmt if v else else_stmt, env)
+            env_else = dict(env)
+            then_stmt = self._fold_stmt(then_stmt, env)
+            else_stmt = self._fold_stmt(else_stmt, env_else)
+            for k in list(env):
+                if env_else.get(k) != env[k]:
+                    del env[k]
+            return ('if_stmt', cond, then_stmt, else_stmt)
+
+        if tag == 'while_stmt':
+            _, cond, body = s
+            if self._clobbers(s):
+                env.clear()
+            for k in _assigned_in(body, set()):
+                env.pop(k, None)
+            cond = self._fold_expr(cond, env)
+            v = const_value(cond)
+            if v == 0:
+                self.stats["branches"] += 1
+                return ('empty_stmt',)
+            body = self._fold_stmt(body, dict(env))
+            return ('while_stmt', cond, body)
+
+        if tag == 'block':
+            return ('block', self._fold_stmts(s[1], env))
+
+        return s   # break_stmt / empty_stmt
+
+    # ---------------- expressions ----------------
+    def _fold_expr(self, e, env, div_left: bool = False):
+        if isinstance(e, str):
+            if e in env:
+                self.stats["propagated"] += 1
+                return env[e]
+            return e
+        if not isinstance(e, tuple) or not e:
+            return e
+        tag = e[0]
+
+        if tag == 'add':
+            _, op, L, R = e
+            L, R = self._fold_expr(L, env), self._fold_expr(R, env)
+            cl, cr = const_value(L), const_value(R)
+            if cl is not None and cr is not None:
+                v = cl + cr if op == '+' else cl - cr
+                if abs(v) <= WORD_MAX:
+                    self.stats["folded"] += 1
+                    return v
+            if cr == 0:
+                self.stats["identities"] += 1
+                return L
+            if op == '+' and cl == 0:
+                self.stats["identities"] += 1
+                return R
+            if op == '-' and L == R and not _has_call(L):
+                self.stats["identities"] += 1
+                return 0
+            return ('add', op, L, R)
+
+        if tag == 'mulop':
+            _, op, L, R = e
+            L = self._fold_expr(L, env, div_left=(op == '/'))
+            R = self._fold_expr(R, env)
+            cl, cr = const_value(L), const_value(R)
+            if op == '*':
+                if cl is not None and cr is not None and abs(cl * cr) <= WORD_MAX:
+                    self.stats["folded"] += 1
+                    return cl * cr
+                if (cl == 0 and not _has_call(R)) or (cr == 0 and not _has_call(L)):
+                    self.stats["identities"] += 1
+                    return 0
+                if not div_left and (cr == 1 or cl == 1):
+                    self.stats["identities"] += 1
+                    return L if cr == 1 else R
+                return ('mulop', op, L, R)
+            # '/'
+            if cl is not None and cr:
+                self.stats["folded"] += 1
+                q = abs(cl) // abs(cr)
+                return q if (cl < 0) == (cr < 0) else -q
+            # (x*c)/c -> x: ο wide MUL/DIV δίνει ακριβώς x (το γινόμενο χωράει στο A:X)
+            if cr and isinstance(L, tuple) and L[0] == 'mulop' and L[1] == '*':
+                if const_value(L[3]) == cr:
+                    self.stats["identities"] += 1
+                    return L[2]
+                if const_value(L[2]) == cr:
+                    self.stats["identities"] += 1
+                    return L[3]
+            return ('mulop', op, L, R)
+
+        if tag == 'relop':
+            _, op, L, R = e
+            L, R = self._fold_expr(L, env), self._fold_expr(R, env)
+            cl, cr = const_value(L), const_value(R)
+            if cl is not None and cr is not None:
+                self.stats["folded"] += 1
+                return int({'==': cl == cr, '!=': cl != cr, '<': cl < cr,
+                            '<=': cl <= cr, '>': cl > cr, '>=': cl >= cr}[op])
+            return ('relop', op, L, R)
+
+        if tag == 'call':
+            _, callee, actuals = e
+            return ('call', callee, [self._fold_expr(a, env) for a in actuals])
+
+        return e   # ('bool', v)
+
+
+def fold_constants(ast):
+    """Επιστρέφει (νέο AST, stats). Το αρχικό AST δεν αλλάζει."""
+    folder = ConstFolder()
+    return folder.fold_program(ast), folder.stats
+
+
+def format_stats(stats) -> str:
+    removed = stats["nodes_before"] - stats["nodes_after"]
+    return "\n".join([
+        f"{'AST nodes':<18}{stats['nodes_before']} -> {stats['nodes_after']} ({removed} eliminated)",
+        f"{'folded subtrees':<18}{stats['folded']}",
+        f"{'propagated uses':<18}{stats['propagated']}",
+        f"{'identities':<18}{stats['identities']}",
+        f"{'constant branches':<18}{stats['branches']}",
+    ])
@@ -0,0 +1,248 @@
+"""
+Τοπική αρίθμηση τιμών (local value numbering) / απαλοιφή κοινών υπο-εκφράσεων πάνω στο AST.
+
+Σε ευθύγραμμο κώδικα μιας μεθόδου (διαδοχικά statements, η συνθήκη ενός if και οι κλάδοι του
+που ακολουθούν) κρατάμε έναν πίνακα: έκφραση -> όνομα που έχει ήδη την τιμή της. Υποψήφιες είναι
+add / mulop, κλήσεις "καθαρών" συναρτήσεων (licm.pure_functions) και inline σώματα χωρίς fresh
+λέξεις· το + και το * ταιριάζουν και με ανάποδους τελεστέους. Όταν μια έκφραση ξαναεμφανίζεται, ο κόμβος αντικαθίσταται από το όνομα:
+  - τη μεταβλητή της ανάθεσης v = e, όσο ούτε το v ούτε οι τελεστέοι δεν έχουν ξαναγραφτεί,
+  - αλλιώς μια νέα τοπική λέξη ("cse.1", ...) που γράφεται πριν από το statement της πρώτης
+    εμφάνισης. Ένα σκέτο ADD/SUB δύο φύλλων δεν αξίζει νέα λέξη (STA + LDA = όσο ο υπολογισμός).
+Η απόφαση θέλει δύο περάσματα με την ίδια σειρά επίσκεψης: το πρώτο βρίσκει ποιες εμφανίσεις
+ξαναχρησιμοποιούνται, το δεύτερο γράφει τα temporaries και αντικαθιστά.
+
+Ακυρώσεις: ανάθεση σε v σβήνει ό,τι διαβάζει ή κρατιέται στο v· ένα statement με κλήση
+συνάρτησης που δεν είναι καθαρή αδειάζει τον πίνακα (οι μεταβλητές είναι στατικές λέξεις) και
+μένει ως έχει, ώστε να μην αλλάξει η σειρά των κλήσεων. Μετά από if σβήνεται ό,τι γράφει
+οποιοσδήποτε κλάδος. Το σώμα ενός while ξεκινά με άδειο πίνακα και η συνθήκη του δεν αλλάζει
+(υπολογίζεται σε κάθε επανάληψη)· το ίδιο και το if που φυλάει βρόχο του licm (`if (c) { ...;
+while (c) ... }`), για να το αναγνωρίσει ο generator. Ένα `a * b` που είναι αριστερός τελεστέος
+άλλου * ή / μένει στη θέση του (wide γινόμενο στο A:X), όπως και στο licm.
+"""
+from typing import Dict, List, Set
+
+from ast_utils import OPS, calls_in, count_ops, names_read, names_written
+from licm import pure_functions
+from mix_simulator import format_cycles
+
+
+def _key(e):
+    # Κλειδί σύγκρισης: λίστες -> tuples, + και * με ταξινομημένους τελεστέους
+    if isinstance(e, list):
+        return tuple(_key(c) for c in e)
+    if isinstance(e, tuple) and e:
+        if e[0] in ('add', 'mulop', 'relop'):
+            L, R = _key(e[2]), _key(e[3])
+            if e[1] in ('+', '*') and repr(R) < repr(L):
+                L, R = R, L
+            return (e[0], e[1], L, R)
+        return tuple(_key(c) for c in e)
+    return e
+
+
+def _has_binds(e) -> bool:
+    # inline με fresh λέξεις: γράφει μνήμη και το σώμα του διαβάζει ονόματα που δεν είναι του caller
+    if isinstance(e, tuple) and e:
+        if e[0] == 'inline':
+            return bool(e[2]) or _has_binds(e[3])
+        return any(_has_binds(c) for c in (e[2] if e[0] == 'call' else e[2:]))
+    return False
+
+
+def _loop_guard(s) -> bool:
+    # if (c) { ...; while (c) ... } : το σχήμα με το οποίο το licm φυλάει το preheader
+    then = s[2]
+    return (bool(then) and then[0] == 'block' and bool(then[1]) and bool(then[1][-1])
+            and then[1][-1][0] == 'while_stmt' and then[1][-1][1] == s[1])
+
+
+class ValueNumberer:
+    def __init__(self, symbol_table, entry: str = "main"):
+        self.symbol_table = symbol_table
+        self.entry = entry
+        self.pure: Set[str] = set()
+        self.method = None
+        self.rewrite = False                       # False: 1ο πέρασμα (μόνο μέτρημα), True: 2ο (αλλαγές)
+        self.occ = 0                               # αύξων αριθμός εμφάνισης υποψήφιας έκφρασης
+        self.needed: Set[int] = set()              # εμφανίσεις που ξαναχρησιμοποιούνται
+        self.holder: Dict[int, str] = {}           # εμφάνιση -> μεταβλητή ανάθεσης που κρατά την τιμή (ως εδώ)
+        self.held: Dict[int, str] = {}             # ... όλο το holder του 1ου περάσματος, για το 2ο
+        self.names: Dict[int, str] = {}            # εμφάνιση -> όνομα (holder ή cse.N), στο 2ο πέρασμα
+        self.fresh = 0
+        self.stats = {
+            "exprs": 0,          # εμφανίσεις που αντικαταστάθηκαν από όνομα
+            "temps": 0,          # νέες λέξεις cse.N
+            "ops": {op: 0 for op in OPS},
+            "methods": {},       # μέθοδος -> {"exprs", "temps", "ops"} (μόνο όπου έγινε κάτι)
+        }
+
+    # ---------------- program / method ----------------
+    def number_program(self, ast):
+        if not ast or ast[0] != 'program':
+            return ast
+        self.pure = pure_functions([m for m in ast[1] if m and m[0] == 'method'], self.symbol_table, self.entry)
+        return ('program', [self._number_method(m) if m and m[0] == 'method' else m for m in ast[1]])
+
+    def _number_method(self, m):
+        _, ret_type, name, params, (_, decls, stmts) = m
+        self.method = name
+        self.needed, self.held, self.names = set(), {}, {}
+        self.fresh = 0
+        for rewrite in (False, True):
+            self.rewrite = rewrite
+            self.occ = 0
+            self.holder = {}
+            out = self._stmts(stmts, {})
+            self.held = self.holder
+        return ('method', ret_type, name, params, ('body', decls, out))
+
+    # ---------------- statements ----------------
+    def _stmts(self, stmts: List, table: Dict) -> List:
+        out = []
+        for s in stmts:
+            out.extend(self._stmt(s, table))
+        return out
+
+    def _single(self, s, table):
+        out = self._stmt(s, table)
+        return out[0] if len(out) == 1 else ('block', out)
+
+    def _impure(self, node) -> bool:
+        return bool(calls_in(node, set()) - self.pure)
+
+    def _kill(self, table: Dict, names: Set[str]):
+        for k, (occ, reads, _) in list(table.items()):
+            if reads & names or self.holder.get(occ) in names:
+                del table[k]
+
+    def _stmt(self, s, table: Dict) -> List:
+        # Επιστρέφει λίστα: πριν από το statement μπορεί να μπουν αναθέσεις σε cse.N
+        if not s:
+            return [s]
+        tag = s[0]
+        pre: List = []
+        if tag == 'assign_stmt':
+            _, (_, v, e) = s
+            if self._impure(e):
+                table.clear()
+                return [s]
+            top = self.occ
+            e2 = self._expr(e, table, pre)
+            self._kill(table, {v} | names_written(e, set()))
+            ent = table.get(_key(e))
+            if ent is not None and ent[0] >= top and v not in ent[1]:
+                self.holder[ent[0]] = v          # η τιμή του e μένει στο v
+                if self.rewrite:
+                    self.names[ent[0]] = v
+            return pre + [('assign_stmt', ('assign', v, e2))]
+        if tag == 'return_stmt':
+            if s[1] is None or self._impure(s[1]):
+                return [s]
+            e2 = self._expr(s[1], table, pre)
+            return pre + [('return_stmt', e2)]
+        if tag == 'if_stmt':
+            _, cond, then_stmt, else_stmt = s
+            if self._impure(cond):
+                table.clear()
+            elif not _loop_guard(s):
+                cond = self._expr(cond, table, pre)
+            then_stmt = self._single(then_stmt, dict(table))
+            else_stmt = self._single(else_stmt, dict(table))
+            if self._impure(s[2]) or self._impure(s[3]):
+                table.clear()
+            else:
+                self._kill(table, names_written(s, set()))
+            return pre + [('if_stmt', cond, then_stmt, else_stmt)]
+        if tag == 'while_stmt':
+            body = self._single(s[2], {})
+            if self._impure(s):
+                table.clear()
+            else:
+                self._kill(table, names_written(s, set()))
+            return [('while_stmt', s[1], body)]
+        if tag == 'block':
+            return [('block', self._stmts(s[1], table))]
+        return [s]
+
+    # ---------------- expressions ----------------
+    def _candidate(self, e, wide: bool) -> bool:
+        tag = e[0]
+        if tag == 'call':
+            ok = e[1] in self.pure
+        else:
+            ok = tag in ('add', 'mulop', 'inline') and not (wide and tag == 'mulop' and e[1] == '*')
+        return ok and not _has_binds(e)
+
+    def _expr(self, e, table: Dict, pre: List, wide: bool = False):
+        # wide: αριστερός τελεστέος * ή / -> ένα * εδώ δεν αντικαθίσταται
+        if not isinstance(e, tuple) or not e or e[0] == 'bool':
+            return e
+        tag = e[0]
+        cand = self._candidate(e, wide)
+        if cand:
+            key = _key(e)
+            ent = table.get(key)
+            if ent is not None:
+                occ, _, heavy = ent
+                if not self.rewrite and (heavy or occ in self.holder):
+                    self.needed.add(occ)
+                    return e
+                if self.rewrite and occ in self.needed:
+                    self._count(e)
+                    return self.names[occ]
+        if tag == 'call':
+            e2 = ('call', e[1], [self._expr(a, table, pre) for a in e[2]])
+        elif tag == 'inline' and not e[2]:
+            e2 = ('inline', e[1], [], self._expr(e[3], table, pre))      # σώμα χωρίς fresh: έκφραση του caller
+        elif tag == 'inline':
+            e2 = ('inline', e[1], [(fresh, self._expr(a, table, pre)) for fresh, a in e[2]], e[3])
+        elif tag == 'mulop':
+            e2 = ('mulop', e[1], self._expr(e[2], table, pre, wide=True), self._expr(e[3], table, pre))
+        else:
+            e2 = (e[0], e[1]) + tuple(self._expr(c, table, pre) for c in e[2:])
+        if not cand:
+            return e2
+        occ = self.occ
+        self.occ += 1
+        counts = {op: 0 for op in OPS}
+        count_ops(e, counts)
+        table[key] = (occ, names_read(e, set()), sum(counts.values()) > 1 or counts["ADD"] == 0)
+        if self.rewrite and occ in self.needed and occ not in self.held:
+            self.fresh += 1
+            name = f"cse.{self.fresh}"
+            pre.append(('assign_stmt', ('assign', name, e2)))
+            self.names[occ] = name
+            self._stat("temps", 1)
+            return name
+        return e2
+
+    def _count(self, e):
+        counts = {op: 0 for op in OPS}
+        count_ops(e, counts)
+        self._stat("exprs", 1)
+        for op, n in counts.items():
+            self.stats["ops"][op] += n
+            self.stats["methods"][self.method]["ops"][op] += n
+
+    def _stat(self, what: str, n: int):
+        self.stats[what] += n
+        per = self.stats["methods"].setdefault(self.method, {"exprs": 0, "temps": 0, "ops": {op: 0 for op in OPS}})
+        per[what] += n
+
+
+def eliminate_common_subexpressions(ast, symbol_table, entry: str = "main"):
+    """Επιστρέφει (νέο AST, stats). Το αρχικό AST δεν αλλάζει."""
+    numberer = ValueNumberer(symbol_table, entry)
+    return numberer.number_program(ast), numberer.stats
+
+
+def format_stats(stats: Dict) -> str:
+    rows = [
+        f"{'reused exprs':<18}{stats['exprs']} ({stats['temps']} new temporaries)",
+        f"{'ops eliminated':<18}" + ", ".join(f"{op} {stats['ops'][op]}" for op in OPS),
+    ]
+    for name, per in stats["methods"].items():
+        ops = ", ".join(f"{op} {n}" for op, n in per["ops"].items() if n) or "-"
+        rows.append(f"  {name:<16}{per['exprs']} exprs, {per['temps']} temps ({ops})")
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
@@ -0,0 +1,333 @@
+"""
+Ανάλυση ροής δεδομένων (dataflow) πάνω στο CFG του IR (ir.py), με σύνολα ως ακέραια bitsets.
+
+Κάθε πρόβλημα (Problem) δίνει ανά block gen / kill bitsets, κατεύθυνση (forward / backward),
+τελεστή συνάντησης (ένωση ή τομή) και την τιμή στο όριο (είσοδος ή έξοδοι της μεθόδου).
+Ο solve() τρέχει worklist με αρχική σειρά reverse post-order (post-order για backward): σε CFG
+χωρίς ακανόνιστα άλματα αρκούν λίγα περάσματα (βάθος φωλιάσματος βρόχων + 2), και κάθε βήμα
+είναι λίγες πράξεις σε ακέραιους, άρα σχεδόν γραμμικός χρόνος στο μέγεθος της μεθόδου.
+
+Έτοιμες αναλύσεις, με bit ανά μεταβλητή (η σειρά του πίνακα συμβόλων: params, locals και μετά
+fresh / licm.N / cse.N), ανά ορισμό ή ανά έκφραση:
+  - liveness: μεταβλητές που διαβάζονται αργότερα πριν ξαναγραφτούν. Οι μεταβλητές είναι στατικές
+    λέξεις, άρα όσες η μέθοδος διαβάζει πριν τις γράψει είναι ζωντανές και στην έξοδο (τις βλέπει
+    η επόμενη κλήση).
+  - reaching definitions: ποιες αναθέσεις μπορεί να φτάνουν σε κάθε σημείο· στην είσοδο ένας
+    ψευδο-ορισμός ανά μεταβλητή (τιμή του caller ή της προηγούμενης κλήσης).
+  - available expressions: εκφράσεις πάνω σε μεταβλητές / σταθερές που έχουν ήδη υπολογιστεί σε
+    κάθε μονοπάτι και κανένας τελεστέος τους δεν έχει ξαναγραφτεί.
+Μια κλήση σε μέθοδο από την οποία ξαναφτάνουμε σε αυτήν (αναδρομή) μπορεί να διαβάσει και να
+γράψει όλες τις μεταβλητές· το ίδιο το arg προς την ίδια μέθοδο γράφει την παράμετρο.
+"""
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from ir import MethodIR, is_vreg
+
+EXPR_OPS = ("add", "sub", "mul", "div", "muldiv", "set")
+
+
+def bits(mask: int) -> List[int]:
+    # Θέσεις των bits του mask (αύξουσα σειρά)
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+class Problem:
+    """gen / kill ανά block (id -> int), boundary: τιμή στην είσοδο (forward) ή στις εξόδους (backward)."""
+    __slots__ = ("name", "forward", "union", "gen", "kill", "boundary", "universe")
+
+    def __init__(self, name: str, forward: bool, union: bool, gen: Dict[int, int], kill: Dict[int, int],
+                 boundary: int = 0, universe: int = 0):
+        self.name = name
+        self.forward = forward
+        self.union = union
+        self.gen = gen
+        self.kill = kill
+        self.boundary = boundary
+        self.universe = universe
+
+
+class Solution:
+    """before / after: τιμή στην αρχή / στο τέλος κάθε block (σειρά προγράμματος, και για backward)."""
+    __slots__ = ("before", "after", "visits")
+
+    def __init__(self, before: Dict[int, int], after: Dict[int, int], visits: int):
+        self.before = before
+        self.after = after
+        self.visits = visits
+
+
+def solve(ir: MethodIR, p: Problem) -> Solution:
+    order = ir.rpo()
+    if not p.forward:
+        order.reverse()
+    blocks = {b.id: b for b in order}
+    sources = {b.id: (b.preds if p.forward else b.succs) for b in order}   # από πού έρχεται η τιμή
+    targets = {b.id: (b.succs if p.forward else b.preds) for b in order}   # ποιους επηρεάζει
+    edge = {order[0].id} if p.forward else {i for i in blocks if not blocks[i].succs}
+    top = 0 if p.union else p.universe
+    into = {i: top for i in blocks}                  # τιμή πριν από τη μεταφορά (κατά την κατεύθυνση)
+    out = {i: p.gen[i] | (top & ~p.kill[i]) for i in blocks}
+    work = deque(b.id for b in order)
+    queued = set(work)
+    visits = 0
+    while work:
+        i = work.popleft()
+        queued.discard(i)
+        visits += 1
+        srcs = [out[s] for s in sources[i] if s in out]
+        if i in edge:
+            srcs.append(p.boundary)
+        x = top if not srcs else srcs[0]
+        for v in srcs[1:]:
+            x = x | v if p.union else x & v
+        into[i] = x
+        new = p.gen[i] | (x & ~p.kill[i])
+        if new != out[i]:
+            out[i] = new
+            for t in targets[i]:
+                if t not in queued:
+                    queued.add(t)
+                    work.append(t)
+    if p.forward:
+        return Solution(into, out, visits)
+    return Solution(out, into, visits)
+
+
+class Facts:
+    """
+    Μεταβλητές και ορισμοί μιας μεθόδου με τα bits τους.
+    reenter: callees από τους οποίους ξαναφτάνουμε στη μέθοδο (βλ. MixalGenerator._recursive_callees).
+    """
+
+    def __init__(self, ir: MethodIR, reenter=()):
+        self.ir = ir
+        self.names: List[str] = ir.variables()
+        self.bit: Dict[str, int] = {v: 1 << k for k, v in enumerate(self.names)}
+        self.all = (1 << len(self.names)) - 1
+        self.params = sum(self.bit[v] for v in ir.params)
+        self.reenter: Set[str] = set(reenter) | {ir.name}
+
+    def clobbers(self, ins) -> bool:
+        # κλήση που μπορεί να ξαναμπεί στη μέθοδο: διαβάζει / γράφει οτιδήποτε
+        return ins.op == "call" and ins.args[0] in self.reenter
+
+    def uses(self, ins) -> int:
+        if self.clobbers(ins):
+            return self.all
+        return sum(self.bit[x] for x in set(ins.uses()) if isinstance(x, str) and not is_vreg(x))
+
+    def defs(self, ins) -> int:
+        # Μεταβλητές που γράφει σίγουρα η ins (όχι οι κλήσεις που ίσως τις γράψουν)
+        d = ins.defines()
+        if d is not None and not is_vreg(d):
+            return self.bit[d]
+        if ins.op == "arg" and ins.dst == self.ir.name:
+            return self.bit[self.ir.params[ins.args[0]]]
+        return 0
+
+
+# ---------------- liveness ----------------
+def liveness(facts: Facts) -> Solution:
+    gen, kill = {}, {}
+    for b in facts.ir.blocks:
+        g = k = 0
+        for ins in reversed(b.instrs):
+            d = facts.defs(ins)
+            g = (g & ~d) | facts.uses(ins)
+            k |= d
+        gen[b.id], kill[b.id] = g, k & ~g
+    # Οι τοπικές που διαβάζονται πριν γραφτούν είναι ζωντανές και στις εξόδους (στατικές λέξεις)
+    boundary, visits = 0, 0
+    while True:
+        sol = solve(facts.ir, Problem("liveness", False, True, gen, kill, boundary, facts.all))
+        visits += sol.visits
+        carried = sol.before[facts.ir.blocks[0].id] & ~facts.params
+        if carried | boundary == boundary:
+            sol.visits = visits
+            return sol
+        boundary |= carried
+
+
+def dead_stores(facts: Facts, live: Solution) -> List[Tuple[int, int]]:
+    # (block, θέση) των αναθέσεων σε μεταβλητή που δεν διαβάζεται πριν ξαναγραφτεί
+    out = []
+    for b in facts.ir.blocks:
+        x = live.after[b.id]
+        for k in range(len(b.instrs) - 1, -1, -1):
+            ins = b.instrs[k]
+            d = facts.defs(ins)
+            if d and not x & d and ins.op != "arg":
+                out.append((b.id, k))
+            x = (x & ~d) | facts.uses(ins)
+    return out[::-1]
+
+
+# ---------------- reaching definitions ----------------
+class Definitions:
+    """Ορισμοί: 0..len(names)-1 οι ψευδο-ορισμοί της εισόδου, μετά (block, θέση, μεταβλητή) με τη σειρά."""
+
+    def __init__(self, facts: Facts):
+        self.sites: List[Tuple[Optional[int], int, str]] = [(None, -1, v) for v in facts.names]
+        self.of: Dict[str, int] = {v: 1 << k for k, v in enumerate(facts.names)}   # μεταβλητή -> ορισμοί της
+        self.at: Dict[Tuple[int, int], int] = {}                                    # (block, θέση) -> ορισμοί εκεί
+        for b in facts.ir.blocks:
+            for k, ins in enumerate(b.instrs):
+                names = facts.names if facts.clobbers(ins) else [facts.names[i] for i in bits(facts.defs(ins))]
+                mask = 0
+                for v in names:
+                    bit = 1 << len(self.sites)
+                    self.sites.append((b.id, k, v))
+                    self.of[v] |= bit
+                    mask |= bit
+                if mask:
+                    self.at[(b.id, k)] = mask
+
+
+def reaching_definitions(facts: Facts, defs: Optional[Definitions] = None) -> Tuple[Solution, Definitions]:
+    defs = defs or Definitions(facts)
+    gen, kill = {}, {}
+    for b in facts.ir.blocks:
+        g = k = 0
+        for i, ins in enumerate(b.instrs):
+            mask = defs.at.get((b.id, i), 0)
+            if not mask:
+                continue
+            if facts.clobbers(ins):                  # ίσως γράφει: προστίθεται χωρίς να σβήνει
+                g |= mask
+                continue
+            for n in bits(facts.defs(ins)):
+                k |= defs.of[facts.names[n]]
+                g &= ~defs.of[facts.names[n]]
+            g |= mask
+        gen[b.id], kill[b.id] = g, k & ~g
+    entry = (1 << len(facts.names)) - 1
+    universe = (1 << len(defs.sites)) - 1
+    return solve(facts.ir, Problem("reaching definitions", True, True, gen, kill, entry, universe)), defs
+
+
+def entry_reads(facts: Facts, reach: Solution, defs: Definitions) -> List[Tuple[int, int, str]]:
+    # Αναγνώσεις τοπικής (όχι παραμέτρου) που μπορεί να δουν την τιμή της εισόδου (προηγούμενη κλήση / 0)
+    out = []
+    for b in facts.ir.blocks:
+        x = reach.before[b.id]
+        for k, ins in enumerate(b.instrs):
+            if not facts.clobbers(ins):
+                for n in bits(facts.uses(ins) & ~facts.params):
+                    if x & (1 << n):
+                        out.append((b.id, k, facts.names[n]))
+            mask = defs.at.get((b.id, k), 0)
+            if mask and not facts.clobbers(ins):
+                for n in bits(facts.defs(ins)):
+                    x &= ~defs.of[facts.names[n]]
+            x |= mask
+    return out
+
+
+# ---------------- available expressions ----------------
+def expr_key(ins):
+    # (op, τελεστέοι) για εκφράσεις μόνο πάνω σε μεταβλητές / σταθερές, αλλιώς None
+    if ins.op not in EXPR_OPS:
+        return None
+    args = ins.args[1:] if ins.op == "set" else ins.args
+    if any(is_vreg(a) for a in args):
+        return None
+    op = ins.args[0] if ins.op == "set" else ins.op
+    if op in ("add", "mul", "==", "!="):
+        args = tuple(sorted(args, key=repr))
+    return (op,) + tuple(args)
+
+
+class Expressions:
+    """Διακριτές εκφράσεις της μεθόδου με bit η καθεμία, και ανά μεταβλητή οι εκφράσεις που τη διαβάζουν."""
+
+    def __init__(self, facts: Facts):
+        self.keys: Dict[tuple, int] = {}
+        self.reading: Dict[str, int] = {v: 0 for v in facts.names}
+        for b in facts.ir.blocks:
+            for ins in b.instrs:
+                key = expr_key(ins)
+                if key is not None and key not in self.keys:
+                    bit = 1 << len(self.keys)
+                    self.keys[key] = bit
+                    for a in key[1:]:
+                        if isinstance(a, str):
+                            self.reading[a] |= bit
+        self.all = (1 << len(self.keys)) - 1
+
+    def killed_by(self, facts: Facts, ins) -> int:
+        if facts.clobbers(ins):
+            return self.all
+        out = 0
+        for n in bits(facts.defs(ins)):
+            out |= self.reading[facts.names[n]]
+        return out
+
+
+def available_expressions(facts: Facts, exprs: Optional[Expressions] = None) -> Tuple[Solution, Expressions]:
+    exprs = exprs or Expressions(facts)
+    gen, kill = {}, {}
+    for b in facts.ir.blocks:
+        g = k = 0
+        for ins in b.instrs:
+            key = expr_key(ins)
+            if key is not None:
+                g |= exprs.keys[key]
+            dead = exprs.killed_by(facts, ins)
+            g &= ~dead
+            k |= dead
+        gen[b.id], kill[b.id] = g, k & ~g
+    return solve(facts.ir, Problem("available expressions", True, False, gen, kill, 0, exprs.all)), exprs
+
+
+def redundant_exprs(facts: Facts, avail: Solution, exprs: Expressions) -> List[Tuple[int, int]]:
+    # (block, θέση) όπου η έκφραση είναι ήδη διαθέσιμη (υπολογίζεται ξανά)
+    out = []
+    for b in facts.ir.blocks:
+        x = avail.before[b.id]
+        for k, ins in enumerate(b.instrs):
+            key = expr_key(ins)
+            if key is not None:
+                if x & exprs.keys[key]:
+                    out.append((b.id, k))
+                x |= exprs.keys[key]
+            x &= ~exprs.killed_by(facts, ins)
+    return out
+
+
+# ---------------- πρόγραμμα ----------------
+def analyze_program(methods: Dict[str, MethodIR], call_reach=None) -> Dict:
+    """Οι τρεις αναλύσεις σε κάθε μέθοδο (ir.lower_program) -> stats ανά μέθοδο."""
+    reach = call_reach or {}
+    stats = {"methods": {}}
+    for name, ir in methods.items():
+        reenter = {f for f in reach.get(name, ()) if name in reach.get(f, ())}
+        facts = Facts(ir, reenter)
+        live = liveness(facts)
+        rd, defs = reaching_definitions(facts)
+        av, exprs = available_expressions(facts)
+        stats["methods"][name] = {
+            "blocks": len(ir.blocks),
+            "vars": len(facts.names),
+            "defs": len(defs.sites) - len(facts.names),
+            "exprs": len(exprs.keys),
+            "visits": live.visits + rd.visits + av.visits,
+            "dead_stores": len(dead_stores(facts, live)),
+            "entry_reads": len(entry_reads(facts, rd, defs)),
+            "redundant": len(redundant_exprs(facts, av, exprs)),
+        }
+    return stats
+
+
+def format_stats(stats: Dict) -> str:
+    rows = [f"{'method':<14}{'blocks':>7}{'vars':>6}{'defs':>6}{'exprs':>7}{'visits':>8}"
+            f"{'dead stores':>13}{'entry reads':>13}{'redundant':>11}"]
+    for name, m in stats["methods"].items():
+        rows.append(f"{name:<14}{m['blocks']:>7}{m['vars']:>6}{m['defs']:>6}{m['exprs']:>7}{m['visits']:>8}"
+                    f"{m['dead_stores']:>13}{m['entry_reads']:>13}{m['redundant']:>11}")
+    return "\n".join(rows)
@@ -0,0 +1,125 @@
+"""
+Απαλοιφή νεκρού κώδικα πάνω στο AST (μέσα στο MixalGenerator, πριν από το regalloc και το codegen).
+
+  - statements μετά από return / break, ή μετά από statement που δεν "πέφτει" ποτέ στο επόμενο
+    (if με return/break και στους δύο κλάδους, block που τελειώνει έτσι, while με σταθερά αληθή
+    συνθήκη χωρίς δικό του break), αφαιρούνται από τη λίστα τους,
+  - if / while με σταθερή συνθήκη (αν δεν τα έχει ήδη διπλώσει το const_fold) κρατούν μόνο ό,τι εκτελείται,
+  - μέθοδοι που δεν είναι προσβάσιμες από την entry στον γράφο κλήσεων (μετά το κλάδεμα των
+    statements, άρα μια κλήση μόνο από νεκρό κώδικα δεν μετράει) αφαιρούνται ολόκληρες·
+    μαζί τους φεύγουν και οι λέξεις δεδομένων των params/locals τους, αφού ο generator
+    δεσμεύει data μόνο για τις μεθόδους που παράγει.
+"""
+from typing import Dict, List, Set
+
+from ast_utils import always_exits, calls_in, const_value
+
+
+def _count_stmts(s) -> int:
+    # statements μέσα σε ένα statement (μαζί με το ίδιο)
+    if not s:
+        return 0
+    tag = s[0]
+    if tag == 'if_stmt':
+        return 1 + _count_stmts(s[2]) + _count_stmts(s[3])
+    if tag == 'while_stmt':
+        return 1 + _count_stmts(s[2])
+    if tag == 'block':
+        return 1 + sum(_count_stmts(x) for x in s[1])
+    return 0 if tag == 'empty_stmt' else 1
+
+
+class DeadCodeEliminator:
+    def __init__(self, entry: str = "main"):
+        self.entry = entry
+        self.stats = {
+            "statements": 0,    # statements που αφαιρέθηκαν (και όσα ήταν μέσα τους) σε μεθόδους που μένουν
+            "branches": 0,      # if/while με σταθερή συνθήκη
+            "methods": [],      # ονόματα μεθόδων που δεν καλούνται από την entry
+        }
+
+    # ---------------- program ----------------
+    def eliminate_program(self, ast):
+        if not ast or ast[0] != 'program':
+            return ast
+        methods = [self._prune_method(m) if m and m[0] == 'method' else m for m in ast[1]]
+        live = self._reachable(methods)
+        kept = []
+        for m in methods:
+            if m and m[0] == 'method' and m[2] not in live:
+                self.stats["methods"].append(m[2])
+                continue
+            kept.append(m)
+        return ('program', kept)
+
+    def _reachable(self, methods) -> Set[str]:
+        # Γράφος κλήσεων με ρίζα την entry (κλήσεις σε statements ΚΑΙ σε αρχικοποιήσεις decls)
+        direct = {}
+        for m in methods:
+            if m and m[0] == 'method':
+                direct.setdefault(m[2], set()).update(calls_in(m[4], set()))
+        live, todo = set(), [self.entry]
+        while todo:
+            f = todo.pop()
+            if f not in live:
+                live.add(f)
+                todo.extend(direct.get(f, ()))
+        return live
+
+    # ---------------- method / statements ----------------
+    def _prune_method(self, m):
+        _, ret_type, name, params, (_, decls, stmts) = m
+        return ('method', ret_type, name, params, ('body', decls, self._prune_stmts(stmts)))
+
+    def _prune_stmts(self, stmts: List) -> List:
+        out = []
+        for k, s in enumerate(stmts):
+            s = self._prune_stmt(s)
+            out.append(s)
+            if always_exits(s):
+                self.stats["statements"] += sum(_count_stmts(x) for x in stmts[k + 1:])
+                break
+        return out
+
+    def _prune_stmt(self, s):
+        if not s:
+            return s
+        tag = s[0]
+        if tag == 'if_stmt':
+            _, cond, then_stmt, else_stmt = s
+            v = const_value(cond)
+            if v is not None:
+                self.stats["branches"] += 1
+                self.stats["statements"] += 1 + _count_stmts(else_stmt if v else then_stmt)
+                return self._prune_stmt(then_stmt if v else else_stmt)
+            return ('if_stmt', cond, self._prune_stmt(then_stmt), self._prune_stmt(else_stmt))
+        if tag == 'while_stmt':
+            _, cond, body = s
+            if const_value(cond) == 0:
+                self.stats["branches"] += 1
+                self.stats["statements"] += _count_stmts(s)
+                return ('empty_stmt',)
+            return ('while_stmt', cond, self._prune_stmt(body))
+        if tag == 'block':
+            return ('block', self._prune_stmts(s[1]))
+        return s
+
+
+def eliminate_dead_code(ast, entry: str = "main"):
+    """Επιστρέφει (νέο AST, stats). Το αρχικό AST δεν αλλάζει."""
+    dce = DeadCodeEliminator(entry)
+    return dce.eliminate_program(ast), dce.stats
+
+
+def format_stats(stats: Dict) -> str:
+    rows = [
+        f"{'unreachable stmts':<18}{stats['statements']}",
+        f"{'constant branches':<18}{stats['branches']}",
+        f"{'uncalled methods':<18}{len(stats['methods'])}"
+        + (f" ({', '.join(stats['methods'])})" if stats['methods'] else ""),
+    ]
+    for what in ("code", "data"):
+        before, after = stats.get(f"{what}_before"), stats.get(f"{what}_after")
+        if before is not None:
+            rows.append(f"{what + ' words':<18}{before} -> {after} ({before - after} removed)")
+    return "\n".join(rows)
@@ -0,0 +1,165 @@
+"""
+Inlining μικρών "φύλλων" (συναρτήσεις χωρίς κλήσεις) στα σημεία κλήσης, πάνω στο AST.
+
+Υποψήφια callee: δεν καλεί καμία συνάρτηση (άρα ούτε κύκλο αναδρομής), δεν έχει τοπικές
+μεταβλητές, δεν είναι η entry, και το πρώτο της statement είναι `return expr;`.
+Μια κλήση ('call', f, args) γίνεται ('inline', f, binds, body):
+  - binds: [(fresh, arg), ...] για κάθε όρισμα που δεν είναι απλό (σταθερά / μεταβλητή): ο generator
+    υπολογίζει το arg και το γράφει σε νέα τοπική λέξη του caller (fresh, π.χ. "square.1.x"),
+    με την ίδια σειρά που θα γράφονταν οι παράμετροι πριν από το JMP,
+  - body: το expr του callee με τις παραμέτρους αντικατεστημένες από τα fresh ονόματα ή
+    απευθείας από τα απλά ορίσματα.
+Η τιμή καταλήγει στο A όπως και με την κλήση· γλιτώνουμε STA ανά παράμετρο, JMP, NOP label,
+STJ, JMP RET και JMP 0 (2·n + 6 u).
+
+Ευρετική: inline μόνο αν το μέγεθος του σώματος (εκτίμηση εντολών) + τα STA των fresh
+χωράει στο SIZE_LIMIT, ή στο SIZE_LIMIT * LOOP_FACTOR όταν η κλήση είναι μέσα σε while
+(εκτελείται πολλές φορές, οπότε αξίζει περισσότερος κώδικας).
+"""
+from typing import Dict
+
+from ast_utils import calls_in
+from mix_simulator import format_cycles
+
+SIZE_LIMIT = 8          # εντολές που δεχόμαστε να αντιγράψουμε σε κλήση εκτός βρόχου
+LOOP_FACTOR = 3         # ... και τόσες φορές περισσότερες μέσα σε while
+
+
+def expr_size(e) -> int:
+    # Εκτίμηση εντολών για τον υπολογισμό του e στο A (όπως τις βγάζει ο generator χωρίς peephole)
+    if isinstance(e, tuple) and e:
+        tag = e[0]
+        if tag == 'bool':
+            return 1
+        if tag == 'add':
+            return 1 + expr_size(e[2]) + _operand_size(e[3])
+        if tag == 'mulop':
+            return (3 if e[1] == '*' else 4) + expr_size(e[2]) + _operand_size(e[3])
+        if tag == 'relop':
+            return 5 + expr_size(e[2]) + _operand_size(e[3])
+        if tag == 'inline':
+            return sum(expr_size(a) + 1 for _, a in e[2]) + expr_size(e[3])
+        return 6 + sum(expr_size(a) + 1 for a in e[2])    # call
+    return 1
+
+
+def _operand_size(e) -> int:
+    # δεξιός τελεστέος: σταθερά/μεταβλητή χωρίς εντολή, αλλιώς υπολογισμός + spill
+    return 0 if not isinstance(e, tuple) or e[0] == 'bool' else expr_size(e) + 1
+
+
+def _simple(e) -> bool:
+    return isinstance(e, (int, str)) or (isinstance(e, tuple) and e and e[0] == 'bool')
+
+
+def _substitute(e, env: Dict[str, object]):
+    if isinstance(e, str):
+        return env.get(e, e)
+    if isinstance(e, tuple) and e and e[0] != 'bool':
+        return (e[0], e[1]) + tuple(_substitute(c, env) for c in e[2:])
+    return e
+
+
+class Inliner:
+    def __init__(self, entry: str = "main"):
+        self.entry = entry
+        self.leaves: Dict[str, tuple] = {}     # όνομα -> (params, expr) των υποψήφιων callee
+        self.fresh = 0
+        self.stats = {
+            "sites": 0,          # κλήσεις που αντικαταστάθηκαν
+            "skipped": 0,        # κλήσεις σε υποψήφια που δεν πέρασαν την ευρετική
+            "functions": [],     # callee που έγιναν inline σε τουλάχιστον ένα σημείο
+            "est_cycles": 0,     # εκτίμηση: Σ (2·n + 6 - 2·fresh) · 10^βάθος βρόχου
+        }
+
+    # ---------------- program ----------------
+    def inline_program(self, ast):
+        if not ast or ast[0] != 'program':
+            return ast
+        for m in ast[1]:
+            if m and m[0] == 'method':
+                self._consider(m)
+        return ('program', [self._inline_method(m) if m and m[0] == 'method' else m for m in ast[1]])
+
+    def _consider(self, m):
+        _, _, name, params, (_, decls, stmts) = m
+        if name == self.entry or decls or not stmts or calls_in(m[4], set()):
+            return
+        first = stmts[0]
+        if first and first[0] == 'return_stmt' and first[1] is not None:
+            self.leaves[name] = (tuple(p[1] for p in params), first[1])
+
+    # ---------------- method / statements ----------------
+    def _inline_method(self, m):
+        _, ret_type, name, params, (_, decls, stmts) = m
+        self.fresh = 0
+        decls = [('decl', d[1], [(v, self._expr(init, 0)) for v, init in d[2]]) if d and d[0] == 'decl' else d
+                 for d in decls]
+        return ('method', ret_type, name, params, ('body', decls, [self._stmt(s, 0) for s in stmts]))
+
+    def _stmt(self, s, depth):
+        if not s:
+            return s
+        tag = s[0]
+        if tag == 'assign_stmt':
+            _, (_, v, expr) = s
+            return ('assign_stmt', ('assign', v, self._expr(expr, depth)))
+        if tag == 'return_stmt':
+            return ('return_stmt', self._expr(s[1], depth))
+        if tag == 'if_stmt':
+            return ('if_stmt', self._expr(s[1], depth), self._stmt(s[2], depth), self._stmt(s[3], depth))
+        if tag == 'while_stmt':
+            return ('while_stmt', self._expr(s[1], depth + 1), self._stmt(s[2], depth + 1))
+        if tag == 'block':
+            return ('block', [self._stmt(x, depth) for x in s[1]])
+        return s
+
+    # ---------------- expressions ----------------
+    def _expr(self, e, depth):
+        if not isinstance(e, tuple) or not e or e[0] == 'bool':
+            return e
+        if e[0] != 'call':
+            return (e[0], e[1]) + tuple(self._expr(c, depth) for c in e[2:])
+        _, callee, args = e
+        args = [self._expr(a, depth) for a in args]
+        leaf = self.leaves.get(callee)
+        if leaf is None or len(leaf[0]) != len(args):
+            return ('call', callee, args)
+        params, body = leaf
+        # Αν κάποιο όρισμα καλεί συνάρτηση, και οι μεταβλητές πάνε σε fresh (κρατάμε την τιμή της στιγμής της κλήσης)
+        keep = not any(calls_in(a, set()) for a in args)
+        simple = [_simple(a) and (keep or not isinstance(a, str)) for a in args]
+        n_fresh = simple.count(False)
+        if expr_size(body) + n_fresh > SIZE_LIMIT * (LOOP_FACTOR if depth else 1):
+            self.stats["skipped"] += 1
+            return ('call', callee, args)
+        env, binds = {}, []
+        self.fresh += 1
+        for p, a, direct in zip(params, args, simple):
+            if direct:
+                env[p] = a
+            else:
+                env[p] = f"{callee}.{self.fresh}.{p}"
+                binds.append((env[p], a))
+        self.stats["sites"] += 1
+        self.stats["est_cycles"] += (2 * len(args) + 6 - 2 * len(binds)) * 10 ** min(depth, 4)
+        if callee not in self.stats["functions"]:
+            self.stats["functions"].append(callee)
+        return ('inline', callee, binds, _substitute(body, env))
+
+
+def inline_calls(ast, entry: str = "main"):
+    """Επιστρέφει (νέο AST, stats). Το αρχικό AST δεν αλλάζει."""
+    inliner = Inliner(entry)
+    return inliner.inline_program(ast), inliner.stats
+
+
+def format_stats(stats: Dict) -> str:
+    rows = [
+        f"{'inlined calls':<18}{stats['sites']}"
+        + (f" ({', '.join(stats['functions'])})" if stats['functions'] else ""),
+        f"{'over size limit':<18}{stats['skipped']}",
+        f"{'est. cycles saved':<18}{stats['est_cycles']}",
+    ]
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
@@ -0,0 +1,451 @@
+"""
+Ενδιάμεση αναπαράσταση τριών διευθύνσεων (three-address code) με basic blocks και CFG ανά μέθοδο.
+
+Τελεστέοι: σταθερά (int), μεταβλητή της μεθόδου (str, π.χ. "x", "licm.1") ή εικονικός register
+("%1", "%2", ...: μία ανάθεση, ζει μέσα σε ένα statement και στο ίδιο block).
+Εντολές (Instr: op, dst, args):
+    copy    dst, a                 dst = a
+    add/sub dst, a, b              dst = a ± b
+    mul     dst, a, b              dst = a * b (low λέξη του γινομένου)
+    div     dst, a, b              dst = a / b (μέρισμα μία λέξη)
+    muldiv  dst, a, b, c           dst = (a * b) / c με ολόκληρο το γινόμενο στο A:X (όπως ο generator)
+    set     dst, op, a, b          dst = (a op b) ? 1 : 0
+    arg     f, i, a                i-οστή παράμετρος του f = a (με τη σειρά των ορισμάτων)
+    call    dst, f                 κλήση του f, η τιμή επιστροφής στο dst
+Τερματικές (τελευταία εντολή κάθε block):
+    jmp     B                      άλμα
+    cbr     op, a, b, T, F         αν a op b τότε T αλλιώς F
+    ret     a                      επιστροφή (a ή None)· στην entry τερματισμός
+    tail    f                      tail call (τα ορίσματα έχουν ήδη γραφτεί με arg / copy)
+    end                            τέλος του σώματος: συνέχεια στο "JMP 0" της επιστροφής
+
+Η σειρά υπολογισμού είναι ίδια με του MixalGenerator πάνω στο AST (ο δεξιός τελεστέος πριν από
+τον αριστερό, τα ορίσματα με τη σειρά τους), ώστε κλήσεις με παρενέργειες να γίνονται με την ίδια σειρά.
+Οι βρόχοι χαμηλώνουν ήδη "rotated": guard πριν από τον βρόχο και έλεγχος στο τέλος του σώματος.
+Blocks που δεν είναι προσβάσιμα από την είσοδο (μετά από return / break) αφαιρούνται.
+"""
+from typing import Dict, List, Optional, Set
+
+from ast_utils import const_value, guards_loop, names_read
+from mix_simulator import format_cycles
+
+TERMINATORS = ("jmp", "cbr", "ret", "tail", "end")
+NEGATE = {'==': '!=', '!=': '==', '<': '>=', '<=': '>', '>': '<=', '>=': '<'}
+
+
+def is_vreg(x) -> bool:
+    return isinstance(x, str) and x.startswith("%")
+
+
+class Instr:
+    __slots__ = ("op", "dst", "args")
+
+    def __init__(self, op: str, dst=None, *args):
+        self.op = op
+        self.dst = dst
+        self.args = args
+
+    def uses(self) -> List:
+        # Τελεστέοι που διαβάζονται (σταθερές, μεταβλητές, vregs)
+        if self.op == "set":
+            return list(self.args[1:3])
+        if self.op == "cbr":
+            return list(self.args[0:2])
+        if self.op == "arg":
+            return [self.args[1]]
+        if self.op in ("call", "jmp", "tail", "end"):
+            return []
+        if self.op == "ret":
+            return [] if self.dst is None else [self.dst]
+        return list(self.args)
+
+    def defines(self) -> Optional[str]:
+        return self.dst if self.op in ("copy", "add", "sub", "mul", "div", "muldiv", "set", "call") else None
+
+    def __repr__(self):
+        if self.op == "cbr":
+            return f"cbr {self.dst} {self.args[0]} {self.args[1]} ? B{self.args[2]} : B{self.args[3]}"
+        if self.op == "jmp":
+            return f"jmp B{self.dst}"
+        if self.op in ("ret", "tail"):
+            return f"{self.op} {'' if self.dst is None else self.dst}".rstrip()
+        if self.op == "end":
+            return "end"
+        if self.op == "arg":
+            return f"arg {self.dst}.{self.args[0]} = {self.args[1]}"
+        if self.op == "call":
+            return f"{self.dst} = call {self.args[0]}"
+        if self.op == "set":
+            return f"{self.dst} = {self.args[1]} {self.args[0]} {self.args[2]}"
+        if self.op == "copy":
+            return f"{self.dst} = {self.args[0]}"
+        if self.op == "muldiv":
+            return f"{self.dst} = {self.args[0]} * {self.args[1]} / {self.args[2]}"
+        sym = {"add": "+", "sub": "-", "mul": "*", "div": "/"}[self.op]
+        return f"{self.dst} = {self.args[0]} {sym} {self.args[1]}"
+
+
+class Block:
+    __slots__ = ("id", "instrs", "succs", "preds", "depth")
+
+    def __init__(self, id: int, depth: int = 0):
+        self.id = id
+        self.instrs: List[Instr] = []
+        self.succs: List[int] = []
+        self.preds: List[int] = []
+        self.depth = depth               # βάθος βρόχου (για βάρη / στατιστικά)
+
+    @property
+    def term(self) -> Optional[Instr]:
+        return self.instrs[-1] if self.instrs and self.instrs[-1].op in TERMINATORS else None
+
+
+class MethodIR:
+    """
+    IR μιας μεθόδου: blocks με τη σειρά διάταξης (blocks[0] η είσοδος), CFG με succs / preds.
+    params / locals από τον πίνακα συμβόλων (οι fresh των inline και τα licm.N / cse.N βγαίνουν από variables()).
+    """
+    __slots__ = ("name", "params", "locals", "blocks", "nvregs", "loops")
+
+    def __init__(self, name: str, params=(), locals=()):
+        self.name = name
+        self.params = tuple(params)
+        self.locals = tuple(locals)
+        self.blocks: List[Block] = []
+        self.nvregs = 0
+        self.loops = 0
+
+    def block(self, id: int) -> Block:
+        return self.blocks[self._index()[id]]
+
+    def _index(self) -> Dict[int, int]:
+        return {b.id: k for k, b in enumerate(self.blocks)}
+
+    def variables(self) -> List[str]:
+        # Όλες οι μεταβλητές (όχι vregs), με σταθερή σειρά: params, locals και μετά όσες εμφανίζονται (fresh, licm.N, ...)
+        seen = dict.fromkeys(self.params + self.locals)
+        for b in self.blocks:
+            for ins in b.instrs:
+                for x in ins.uses() + [ins.defines()]:
+                    if isinstance(x, str) and not is_vreg(x):
+                        seen.setdefault(x)
+        return list(seen)
+
+    def link(self):
+        # succs από τις τερματικές (άλματα σε block που είναι μόνο "jmp X" πάνε κατευθείαν στο X),
+        # preds αντίστροφα· αφαίρεση blocks χωρίς πρόσβαση από την είσοδο
+        index = self._index()
+
+        def target(i):
+            seen = set()
+            while i not in seen:
+                seen.add(i)
+                instrs = self.blocks[index[i]].instrs
+                if len(instrs) != 1 or instrs[0].op != "jmp":
+                    break
+                i = instrs[0].dst
+            return i
+
+        for b in self.blocks:
+            t = b.term
+            if t.op == "jmp":
+                t.dst = target(t.dst)
+            elif t.op == "cbr":
+                t.args = t.args[:2] + (target(t.args[2]), target(t.args[3]))
+            b.succs = [t.dst] if t.op == "jmp" else list(t.args[2:4]) if t.op == "cbr" else []
+            if t.op == "cbr" and b.succs[0] == b.succs[1]:
+                b.instrs[-1] = Instr("jmp", b.succs[0])
+                b.succs = b.succs[:1]
+        seen, todo = set(), [self.blocks[0].id]
+        while todo:
+            i = todo.pop()
+            if i not in seen:
+                seen.add(i)
+                todo.extend(self.blocks[index[i]].succs)
+        self.blocks = [b for b in self.blocks if b.id in seen]
+        for b in self.blocks:
+            b.preds = []
+        index = self._index()
+        for b in self.blocks:
+            for s in b.succs:
+                self.blocks[index[s]].preds.append(b.id)
+
+    def rpo(self) -> List[Block]:
+        # Reverse post-order από την είσοδο (σειρά για forward dataflow)· χωρίς αναδρομή (μεγάλες μέθοδοι)
+        index = self._index()
+        order, seen = [], {self.blocks[0].id}
+        stack = [(self.blocks[0], 0)]
+        while stack:
+            b, k = stack.pop()
+            if k < len(b.succs):
+                stack.append((b, k + 1))
+                s = b.succs[k]
+                if s not in seen:
+                    seen.add(s)
+                    stack.append((self.blocks[index[s]], 0))
+            else:
+                order.append(b)
+        return order[::-1]
+
+    def instr_count(self) -> int:
+        return sum(len(b.instrs) for b in self.blocks)
+
+
+class Lowering:
+    """AST μιας μεθόδου -> MethodIR. tail_sites: callees που καλούνται σε θέση tail call (βλ. find_tail_calls)."""
+
+    def __init__(self, symbol_table, entry: str = "main"):
+        self.symbol_table = symbol_table
+        self.entry = entry
+        self.ir: Optional[MethodIR] = None
+        self.cur: Optional[Block] = None
+        self.loop_exits: List[int] = []
+        self.depth = 0
+        self.tail_sites: Set[str] = set()
+        self.recursive: Set[str] = set()
+        self.nblocks = 0
+
+    def lower_method(self, m, tail_sites=(), recursive=()) -> MethodIR:
+        _, _, name, _, (_, decls, stmts) = m
+        scope = self.symbol_table.scope(name)
+        self.ir = MethodIR(name, scope.params, scope.locals)
+        self.tail_sites = set(tail_sites)
+        self.recursive = set(recursive)
+        self.loop_exits = []
+        self.depth = 0
+        self.nblocks = 0
+        self._enter(self._new_block())
+        for d in decls:
+            for v, expr in (d[2] if d and d[0] == 'decl' else ()):
+                if expr is not None:
+                    self._assign(v, expr)
+        for s in stmts:
+            self._stmt(s)
+        self._terminate(Instr("end"))
+        self.ir.link()
+        return self.ir
+
+    # ---------------- blocks ----------------
+    def _new_block(self) -> Block:
+        self.nblocks += 1
+        return Block(self.nblocks - 1, self.depth)
+
+    def _enter(self, b: Block):
+        # Το b γίνεται τρέχον block και μπαίνει στη διάταξη (η σειρά των blocks είναι η σειρά του κώδικα)
+        self.ir.blocks.append(b)
+        self.cur = b
+
+    def _emit(self, ins: Instr):
+        self.cur.instrs.append(ins)
+
+    def _terminate(self, ins: Instr):
+        if self.cur.term is None:
+            self._emit(ins)
+
+    def _start(self, b: Block):
+        # Νέο τρέχον block· το προηγούμενο πέφτει σε αυτό αν δεν έχει τερματική
+        self._terminate(Instr("jmp", b.id))
+        self._enter(b)
+
+    def _vreg(self) -> str:
+        self.ir.nvregs += 1
+        return f"%{self.ir.nvregs}"
+
+    # ---------------- statements ----------------
+    def _assign(self, v: str, expr):
+        x = self._expr(expr)
+        last = self.cur.instrs[-1] if self.cur.instrs else None
+        if is_vreg(x) and last is not None and last.dst == x and last.defines() == x:
+            last.dst = v                             # v = a + b αντί για %t = a + b; v = %t
+        else:
+            self._emit(Instr("copy", v, x))
+
+    def _stmt(self, s):
+        if not s:
+            return
+        tag = s[0]
+        if tag == 'assign_stmt':
+            _, (_, v, expr) = s
+            self._assign(v, expr)
+        elif tag == 'return_stmt':
+            expr = s[1]
+            if isinstance(expr, tuple) and expr and expr[0] == 'call' and expr[1] in self.tail_sites:
+                self._tail_call(expr[1], expr[2])
+            else:
+                self._terminate(Instr("ret", None if expr is None else self._expr(expr)))
+            self._enter(self._new_block())             # ό,τι ακολουθεί δεν είναι προσβάσιμο
+        elif tag == 'break_stmt':
+            if self.loop_exits:
+                self._terminate(Instr("jmp", self.loop_exits[-1]))
+                self._enter(self._new_block())
+        elif tag == 'if_stmt':
+            self._if(s)
+        elif tag == 'while_stmt':
+            self._while(s)
+        elif tag == 'block':
+            for x in s[1]:
+                self._stmt(x)
+
+    def _if(self, s):
+        _, cond, then_stmt, else_stmt = s
+        if else_stmt and else_stmt[0] == 'empty_stmt' and guards_loop(cond, then_stmt, self.recursive):
+            # if (c) { t = ...; while (c) ... } (preheader του licm): ο βρόχος μπαίνει χωρίς δεύτερο guard
+            body, join = self._new_block(), self._new_block()
+            self._cond(cond, body.id, join.id)
+            self._start(body)
+            for x in then_stmt[1][:-1]:
+                self._stmt(x)
+            self._while(then_stmt[1][-1], entered=True)
+            self._start(join)
+            return
+        then_b, else_b, join = self._new_block(), self._new_block(), self._new_block()
+        self._cond(cond, then_b.id, else_b.id)
+        self._enter(then_b)
+        self._stmt(then_stmt)
+        self._terminate(Instr("jmp", join.id))
+        self._enter(else_b)
+        self._stmt(else_stmt)
+        self._start(join)
+
+    def _while(self, s, entered: bool = False):
+        _, cond, body_stmt = s
+        self.ir.loops += 1
+        self.depth += 1
+        body = self._new_block()
+        self.depth -= 1
+        exit_b = self._new_block()
+        if entered:
+            self._start(body)
+        else:
+            self._cond(cond, body.id, exit_b.id)     # guard
+            self._enter(body)
+        self.depth += 1
+        self.loop_exits.append(exit_b.id)
+        self._stmt(body_stmt)
+        self.loop_exits.pop()
+        self._cond(cond, body.id, exit_b.id)         # έλεγχος στο τέλος, άλμα πίσω στην αρχή
+        self.depth -= 1
+        self._enter(exit_b)
+
+    def _cond(self, cond, true_id: int, false_id: int):
+        v = const_value(cond)
+        if v is not None:
+            self._terminate(Instr("jmp", true_id if v else false_id))
+        elif isinstance(cond, tuple) and cond and cond[0] == 'relop':
+            _, op, L, R = cond
+            r = self._expr(R)
+            self._terminate(Instr("cbr", op, self._expr(L), r, true_id, false_id))
+        else:
+            self._terminate(Instr("cbr", '!=', self._expr(cond), 0, true_id, false_id))
+
+    def _tail_call(self, callee: str, actuals):
+        name = self.ir.name
+        if callee != name:
+            for i, a in enumerate(actuals):
+                self._emit(Instr("arg", callee, i, self._expr(a)))
+        else:
+            # Όπως ο generator: όλα τα ορίσματα βλέπουν τις παλιές τιμές των παραμέτρων
+            params = self.symbol_table.params(name)
+            pending = []
+            for i, (p, arg) in enumerate(zip(params, actuals)):
+                if arg == p:
+                    continue
+                later: Set[str] = set()
+                for a in actuals[i + 1:]:
+                    names_read(a, later)
+                x = self._expr(arg)
+                if p in later:
+                    t = self._vreg()
+                    self._emit(Instr("copy", t, x))
+                    pending.append((p, t))
+                else:
+                    self._emit(Instr("copy", p, x))
+            for p, t in pending:
+                self._emit(Instr("copy", p, t))
+        self._terminate(Instr("tail", callee))
+
+    # ---------------- expressions ----------------
+    def _expr(self, e):
+        # Επιστρέφει τελεστέο: σταθερά, μεταβλητή ή vreg με την τιμή του e
+        if e is None:
+            return 0
+        v = const_value(e)
+        if v is not None:
+            return v
+        if isinstance(e, str):
+            return e
+        tag = e[0]
+        if tag == 'add':
+            _, op, L, R = e
+            r = self._expr(R)
+            return self._op("add" if op == '+' else "sub", self._expr(L), r)
+        if tag == 'mulop':
+            _, op, L, R = e
+            r = self._expr(R)
+            if op == '/' and isinstance(L, tuple) and L and L[0] == 'mulop' and L[1] == '*':
+                b = self._expr(L[3])
+                t = self._vreg()
+                self._emit(Instr("muldiv", t, self._expr(L[2]), b, r))
+                return t
+            return self._op("mul" if op == '*' else "div", self._expr(L), r)
+        if tag == 'relop':
+            _, op, L, R = e
+            r = self._expr(R)
+            t = self._vreg()
+            self._emit(Instr("set", t, op, self._expr(L), r))
+            return t
+        if tag == 'inline':
+            _, _, binds, body = e
+            for fresh, arg in binds:
+                self._emit(Instr("copy", fresh, self._expr(arg)))
+            return self._expr(body)
+        if tag == 'call':
+            _, callee, actuals = e
+            for i, a in enumerate(actuals):
+                self._emit(Instr("arg", callee, i, self._expr(a)))
+            t = self._vreg()
+            self._emit(Instr("call", t, callee))
+            return t
+        return 0
+
+    def _op(self, op: str, a, b) -> str:
+        t = self._vreg()
+        self._emit(Instr(op, t, a, b))
+        return t
+
+
+def lower_program(ast, symbol_table, entry: str = "main", tail_sites=None, call_reach=None) -> Dict[str, MethodIR]:
+    """Μέθοδος -> MethodIR. tail_sites: {(μέθοδος, callee)}, call_reach: για το guard βρόχων του licm."""
+    lowering = Lowering(symbol_table, entry)
+    reach = call_reach or {}
+    out: Dict[str, MethodIR] = {}
+    for m in (ast[1] if ast and ast[0] == 'program' else []):
+        if m and m[0] == 'method':
+            name = m[2]
+            sites = {c for f, c in (tail_sites or ()) if f == name}
+            recursive = {f for f in reach.get(name, ()) if name in reach.get(f, ())}
+            out[name] = lowering.lower_method(m, sites, recursive)
+    return out
+
+
+def format_ir(methods: Dict[str, MethodIR]) -> str:
+    lines = []
+    for name, ir in methods.items():
+        lines.append(f"method {name}({', '.join(ir.params)})  locals: {', '.join(ir.locals) or '-'}")
+        for b in ir.blocks:
+            preds = ", ".join(f"B{p}" for p in b.preds) or "-"
+            lines.append(f"  B{b.id}:{'':<4}preds {preds}" + (f"  (loop depth {b.depth})" if b.depth else ""))
+            for ins in b.instrs:
+                lines.append(f"      {ins!r}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def format_stats(stats: Dict) -> str:
+    # stats: {"methods": μέθοδος -> MethodIR} (+ κύκλοι του MIX simulator, όπως στα άλλα passes)
+    rows = [f"{'method':<14}{'blocks':>7}{'edges':>7}{'instrs':>8}{'vregs':>7}{'loops':>7}"]
+    for name, ir in stats["methods"].items():
+        edges = sum(len(b.succs) for b in ir.blocks)
+        rows.append(f"{name:<14}{len(ir.blocks):>7}{edges:>7}{ir.instr_count():>8}{ir.nvregs:>7}{ir.loops:>7}")
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
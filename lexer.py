@@ -1,6 +1,8 @@
 import ply.lex as lex
 from ply.lex import TOKEN
 import re
+from array import array
+from ply_tables import LEXTAB, lexer_hash, load_tables, warn_stale
 
 reserved = {
     'if': 'IF',
@@ -18,7 +20,7 @@ reserved = {
 tokens = [
     'ID', 'NUM',
     'EQ', 'NE', 'LE', 'GE', 'LT', 'GT'
-] + list(set(reserved.values()))
+] + sorted(set(reserved.values()))
 
 literals = ['+', '-', '*', '/', '=', '(', ')', '{', '}', ';', ',', '[', ']']
 
@@ -75,5 +77,91 @@ def t_error(t):
     t.lexer.skip(1) #αποφυγη λουπας
     
 
-# Δημιουργία lexer
-lexer = lex.lex()
+# Δημιουργία lexer: από τον προϋπολογισμένο lextab.py αν είναι ενημερωμένος (χωρίς validation/εγγραφές),
+# αλλιώς χτίσιμο στη μνήμη
+_lextab = load_tables(LEXTAB, lexer_hash(globals()))
+if _lextab is not None:
+    lexer = lex.lex(optimize=True, lextab=_lextab)
+else:
+    warn_stale(LEXTAB)
+    lexer = lex.lex()
+
+
+# Όλα τα είδη token (ονόματα tokens + literals) για το compact TokenBuffer
+TOKEN_TYPES = list(tokens) + list(literals)
+_TYPE_INDEX = {t: k for k, t in enumerate(TOKEN_TYPES)}
+
+
+class TokenBuffer:
+    """
+    Λεξική ανάλυση ΜΙΑ φορά σε compact buffer (παράλληλοι πίνακες αντί για ένα LexToken ανά token):
+    είδος (index στο TOKEN_TYPES), τιμή, γραμμή, θέση στο κείμενο.
+    Ο parser το καταναλώνει μέσω του token() (ίδιο interface με τον PLY lexer) και το
+    lexical_analysis.txt γράφεται από το ίδιο buffer με dump().
+    """
+
+    def __init__(self, source: str, lex=None):
+        self._lex(source, lex or lexer)
+
+    def _lex(self, source, lex):
+        self.lexdata = source
+        self.types = array('B')      # index στο TOKEN_TYPES
+        self.values = []             # int για NUM/BOOLEAN, str για τα υπόλοιπα
+        self.linenos = array('i')
+        self.positions = array('i')  # lexpos
+        lex.lineno = 1
+        lex.input(source)
+        index = _TYPE_INDEX
+        while True:
+            tok = lex.token()
+            if not tok:
+                break
+            self.types.append(index[tok.type])
+            self.values.append(tok.value)
+            self.linenos.append(tok.lineno)
+            self.positions.append(tok.lexpos)
+        self.rewind()
+
+    def __len__(self):
+        return len(self.types)
+
+    def rewind(self):
+        self._next = 0
+        self.lineno = 1
+        self.lexpos = 0
+
+    def _make(self, i):
+        tok = lex.LexToken()
+        tok.type = TOKEN_TYPES[self.types[i]]
+        tok.value = self.values[i]
+        tok.lineno = self.linenos[i]
+        tok.lexpos = self.positions[i]
+        tok.lexer = self
+        return tok
+
+    # --- interface του PLY lexer για τον parser ---
+    def input(self, data):
+        # parser.parse(source, lexer=buf): ίδιο κείμενο -> απλώς από την αρχή, αλλιώς νέα λεξική ανάλυση
+        if data is self.lexdata or data == self.lexdata:
+            self.rewind()
+        else:
+            self._lex(data, lexer)
+
+    def token(self):
+        i = self._next
+        if i >= len(self.types):
+            return None
+        self._next = i + 1
+        self.lineno = self.linenos[i]
+        self.lexpos = self.positions[i]
+        return self._make(i)
+
+    def __iter__(self):
+        for i in range(len(self.types)):
+            yield self._make(i)
+
+    def dump(self, f):
+        # Ίδια μορφή με το str(LexToken) του PLY: LexToken(type,value,lineno,lexpos)
+        types, values, linenos, positions = self.types, self.values, self.linenos, self.positions
+        for i in range(len(types)):
+            f.write(f"LexToken({TOKEN_TYPES[types[i]]},{values[i]!r},{linenos[i]},{positions[i]})\n")
@@ -0,0 +1,12 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('BOOLEAN', 'BREAK', 'ELSE', 'EQ', 'GE', 'GT', 'ID', 'IF', 'INT', 'LE', 'LT', 'NE', 'NUM', 'PRINT', 'READ', 'RETURN', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = '+-*/=(){};,[]'
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_newline>\\n+)|(?P<t_comment>//[^\\n]*)|(?P<t_NUM>[0-9]+)|(?P<t_ID>[a-zA-Z][a-zA-Z0-9_]*)|(?P<t_EQ>==)|(?P<t_GE>>=)|(?P<t_LE><=)|(?P<t_NE>!=)|(?P<t_GT>>)|(?P<t_LT><)', [None, ('t_newline', 'newline'), ('t_comment', 'comment'), ('t_NUM', 'NUM'), ('t_ID', 'ID'), (None, 'EQ'), (None, 'GE'), (None, 'LE'), (None, 'NE'), (None, 'GT'), (None, 'LT')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_tables_version = 1
+_source_hash = '821949feaac33c32b93c7ce3cded6e34d8e8972909c2a1fb7328a6df5d47effa'
@@ -0,0 +1,277 @@
+"""
+Μετακίνηση αμετάβλητου κώδικα έξω από βρόχους (loop-invariant code motion) πάνω στο AST.
+
+Για κάθε while (από τον εξωτερικό προς τους εσωτερικούς), με def-use των μεταβλητών της μεθόδου:
+  - defs: ό,τι γράφεται μέσα στον βρόχο (αναθέσεις, fresh λέξεις των inline),
+  - αμετάβλητη έκφραση: διαβάζει μόνο params/locals της μεθόδου (από τον πίνακα συμβόλων) που δεν
+    είναι στα defs και δεν καλεί συνάρτηση, εκτός από "καθαρές" (pure) συναρτήσεις: χωρίς κλήσεις,
+    με locals που γράφονται πριν διαβαστούν και return με τιμή σε κάθε μονοπάτι, άρα η τιμή
+    εξαρτάται μόνο από τα ορίσματα,
+  - βρόχος με κλήση που μπορεί να ξαναφτάσει στη μέθοδο (αναδρομή) μένει ως έχει: οι μεταβλητές
+    είναι στατικές λέξεις και η κλήση μπορεί να τις αλλάξει,
+  - βρόχος με μη καθαρή κλήση στη συνθήκη μένει επίσης ως έχει: το guard παρακάτω υπολογίζει τη
+    συνθήκη μία φορά παραπάνω στην είσοδο, άρα θα επαναλάμβανε τις παρενέργειες της κλήσης.
+Η μεγαλύτερη αμετάβλητη υπο-έκφραση (add / mulop / relop / καθαρή κλήση / inline) γράφεται σε νέα
+τοπική λέξη ("licm.1", ...) πριν από τον βρόχο και στη θέση της μένει το όνομα.
+
+Μετακινούνται μόνο εκφράσεις που υπολογίζονται σε ΚΑΘΕ επανάληψη: η συνθήκη και τα statements
+του σώματος στο "πρώτο επίπεδο" μέχρι το πρώτο που μπορεί να βγει από τον βρόχο (break / return)·
+όχι κλάδοι if ή σώματα εσωτερικών βρόχων. Έτσι δεν υπολογίζεται τίποτα που δεν θα υπολογιζόταν,
+και το overflow του MIX μένει ίδιο. Όσα έρχονται από τη συνθήκη μπαίνουν πριν από το while· όσα
+έρχονται από το σώμα χρειάζονται guard, γιατί το σώμα μπορεί να μην εκτελεστεί καμία φορά:
+    t1 = ...;                       (συνθήκη)
+    if (cond) { t2 = ...; while (cond) body }
+εκτός αν το προηγούμενο statement είναι v = c και η συνθήκη ισχύει για v = c (ο βρόχος σίγουρα ξεκινά).
+Ένα `a * b` που είναι αριστερός τελεστέος άλλου * ή / δεν μετακινείται μόνο του: εκεί ο generator
+κρατά το γινόμενο "wide" στο A:X.
+"""
+from typing import Dict, List, Set
+
+from ast_utils import (OPS, always_exits, call_reach, calls_in, const_value, count_ops, definitely_assigned,
+                       has_break, names_read, names_written)
+from mix_simulator import format_cycles
+
+
+def _has_return(s) -> bool:
+    if not s:
+        return False
+    tag = s[0]
+    if tag == 'return_stmt':
+        return True
+    if tag == 'if_stmt':
+        return _has_return(s[2]) or _has_return(s[3])
+    if tag == 'while_stmt':
+        return _has_return(s[2])
+    if tag == 'block':
+        return any(_has_return(x) for x in s[1])
+    return False
+
+
+def _holds(cond, v: str, value: int) -> bool:
+    # Ισχύει η συνθήκη (v op K ή K op v) όταν v = value;
+    if not (isinstance(cond, tuple) and cond and cond[0] == 'relop'):
+        return False
+    _, op, L, R = cond
+    if L == v and const_value(R) is not None:
+        a, b = value, const_value(R)
+    elif R == v and const_value(L) is not None:
+        a, b = const_value(L), value
+    else:
+        return False
+    return {'<': a < b, '<=': a <= b, '>': a > b, '>=': a >= b, '==': a == b, '!=': a != b}[op]
+
+
+def _returns_value(s) -> bool:
+    if not s:
+        return True
+    tag = s[0]
+    if tag == 'return_stmt':
+        return s[1] is not None
+    if tag == 'if_stmt':
+        return _returns_value(s[2]) and _returns_value(s[3])
+    if tag == 'while_stmt':
+        return _returns_value(s[2])
+    if tag == 'block':
+        return all(_returns_value(x) for x in s[1])
+    return True
+
+
+def pure_functions(methods, symbol_table, entry: str = "main") -> Set[str]:
+    """Καθαρές συναρτήσεις: όχι η entry, χωρίς κλήσεις, κάθε local γράφεται πριν διαβαστεί, return με τιμή παντού."""
+    pure: Set[str] = set()
+    for m in methods:
+        if not (m and m[0] == 'method'):
+            continue
+        _, _, name, params, (_, decls, stmts) = m
+        if name == entry or calls_in(m[4], set()) or not stmts or not always_exits(stmts[-1]):
+            continue
+        if not _returns_value(('block', stmts)):
+            continue
+        scope = symbol_table.scope(name)
+        if scope.duplicates:
+            continue
+        cands = set(scope.locals) - set(scope.params)
+        bad: Set[str] = set()
+        assigned = set(scope.params)
+        for d in decls:
+            for v, expr in (d[2] if d and d[0] == 'decl' else ()):
+                if expr is not None:
+                    assigned = definitely_assigned([('assign_stmt', ('assign', v, expr))], assigned, cands, bad)
+        definitely_assigned(stmts, assigned, cands, bad)
+        if not bad:
+            pure.add(name)
+    return pure
+
+
+class LoopHoister:
+    def __init__(self, symbol_table, entry: str = "main"):
+        self.symbol_table = symbol_table
+        self.entry = entry
+        self.pure: Set[str] = set()                # καθαρές συναρτήσεις (βλ. pure_functions)
+        self.reach: Dict[str, Set[str]] = {}       # μέθοδος -> ό,τι μπορεί να καλέσει (μεταβατικά)
+        self.method = None
+        self.vars: Set[str] = set()
+        self.fresh = 0
+        self.loop_no = 0
+        self.stats = {
+            "loops": 0,          # while που εξετάστηκαν
+            "recursive": 0,      # ... που έμειναν ως έχουν λόγω κλήσης που ξαναφτάνει στη μέθοδο
+            "impure": 0,         # ... που έμειναν ως έχουν λόγω μη καθαρής κλήσης στη συνθήκη
+            "per_loop": [],      # {"method", "loop", "depth", "hoisted", "ops", "guarded"} για βρόχους με μετακινήσεις
+        }
+
+    # ---------------- program ----------------
+    def hoist_program(self, ast):
+        if not ast or ast[0] != 'program':
+            return ast
+        methods = [m for m in ast[1] if m and m[0] == 'method']
+        self.reach = call_reach(methods)
+        self.pure = pure_functions(methods, self.symbol_table, self.entry)
+        return ('program', [self._hoist_method(m) if m and m[0] == 'method' else m for m in ast[1]])
+
+    # ---------------- method / statements ----------------
+    def _hoist_method(self, m):
+        _, ret_type, name, params, (_, decls, stmts) = m
+        self.method = name
+        scope = self.symbol_table.scope(name)
+        self.vars = set(scope.params) | set(scope.locals)
+        self.fresh = 0
+        self.loop_no = 0
+        return ('method', ret_type, name, params, ('body', decls, self._stmts(stmts, 0)))
+
+    def _stmts(self, stmts: List, depth: int) -> List:
+        out = []
+        for s in stmts:
+            out.extend(self._stmt(s, depth, out[-1] if out else None))
+        return out
+
+    def _stmt(self, s, depth, prev) -> List:
+        # Επιστρέφει λίστα: ένα while μπορεί να γίνει preheader + while
+        if not s:
+            return [s]
+        tag = s[0]
+        if tag == 'while_stmt':
+            return self._loop(s, depth + 1, prev)
+        if tag == 'if_stmt':
+            return [('if_stmt', s[1], self._single(s[2], depth), self._single(s[3], depth))]
+        if tag == 'block':
+            return [('block', self._stmts(s[1], depth))]
+        return [s]
+
+    def _single(self, s, depth):
+        out = self._stmt(s, depth, None)
+        return out[0] if len(out) == 1 else ('block', out)
+
+    # ---------------- loops ----------------
+    def _loop(self, s, depth, prev) -> List:
+        _, cond, body = s
+        self.stats["loops"] += 1
+        self.loop_no += 1
+        number = self.loop_no
+        if any(f == self.method or self.method in self.reach.get(f, ()) for f in calls_in(s, set())):
+            self.stats["recursive"] += 1
+            return [('while_stmt', cond, self._single(body, depth))]
+        if calls_in(cond, set()) - self.pure:
+            # Το guard θα υπολόγιζε τη συνθήκη μία φορά παραπάνω στην είσοδο: όχι με κλήση που έχει παρενέργειες
+            self.stats["impure"] += 1
+            return [('while_stmt', cond, self._single(body, depth))]
+
+        defs = names_written(s, set())
+        cond_pre: List = []
+        body_pre: List = []
+        cond = self._rewrite(cond, defs, cond_pre)
+        body = self._rewrite_body(body, defs, body_pre)
+        entered = (prev is not None and prev[0] == 'assign_stmt' and const_value(prev[1][2]) is not None
+                   and _holds(cond, prev[1][1], const_value(prev[1][2])))
+        guarded = bool(body_pre) and not entered
+        if cond_pre or body_pre:
+            counts = {op: 0 for op in OPS}
+            for _, (_, _, e) in cond_pre + body_pre:
+                count_ops(e, counts)
+            self.stats["per_loop"].append({"method": self.method, "loop": number, "depth": depth,
+                                           "hoisted": len(cond_pre) + len(body_pre), "ops": counts,
+                                           "guarded": guarded})
+        loop = ('while_stmt', cond, self._single(body, depth))    # εσωτερικοί βρόχοι, πάνω στο νέο σώμα
+        if guarded:
+            return cond_pre + [('if_stmt', cond, ('block', body_pre + [loop]), ('empty_stmt',))]
+        return cond_pre + body_pre + [loop]
+
+    def _rewrite_body(self, body, defs, pre):
+        # Μόνο τα statements που εκτελούνται σε κάθε επανάληψη: μέχρι το πρώτο που μπορεί να βγει
+        stmts = body[1] if body and body[0] == 'block' else [body]
+        out = []
+        live = True
+        for s in stmts:
+            if live and s:
+                tag = s[0]
+                if tag == 'assign_stmt':
+                    _, (_, v, expr) = s
+                    s = ('assign_stmt', ('assign', v, self._rewrite(expr, defs, pre)))
+                elif tag == 'if_stmt':
+                    s = ('if_stmt', self._rewrite(s[1], defs, pre), s[2], s[3])
+                elif tag == 'while_stmt':
+                    s = ('while_stmt', self._rewrite(s[1], defs, pre), s[2])
+                elif tag == 'block':
+                    s = self._rewrite_body(s, defs, pre)
+                live = not (has_break(s) or _has_return(s) or always_exits(s))
+            out.append(s)
+        if body and body[0] == 'block':
+            return ('block', out)
+        return out[0]
+
+    # ---------------- expressions ----------------
+    def _invariant(self, e, defs) -> bool:
+        if isinstance(e, str):
+            return e in self.vars and e not in defs
+        if not isinstance(e, tuple) or not e or e[0] == 'bool':
+            return True
+        tag = e[0]
+        if tag == 'call':
+            return e[1] in self.pure and all(self._invariant(a, defs) for a in e[2])
+        if tag == 'inline':
+            own = {fresh for fresh, _ in e[2]}
+            return (all(self._invariant(a, defs) for _, a in e[2])
+                    and all(v in own or self._invariant(v, defs) for v in names_read(e[3], set())))
+        return all(self._invariant(c, defs) for c in e[2:])
+
+    def _rewrite(self, e, defs, pre, wide: bool = False):
+        # wide: αριστερός τελεστέος * ή / (ο generator θέλει A:X) -> ένα * εδώ δεν μετακινείται μόνο του
+        if not isinstance(e, tuple) or not e or e[0] == 'bool':
+            return e
+        tag = e[0]
+        if not (wide and tag == 'mulop' and e[1] == '*') and self._invariant(e, defs):
+            self.fresh += 1
+            name = f"licm.{self.fresh}"
+            pre.append(('assign_stmt', ('assign', name, e)))
+            return name
+        if tag == 'call':
+            return ('call', e[1], [self._rewrite(a, defs, pre) for a in e[2]])
+        if tag == 'inline':
+            return ('inline', e[1], [(fresh, self._rewrite(a, defs, pre)) for fresh, a in e[2]],
+                    self._rewrite(e[3], defs, pre))
+        if tag == 'mulop':
+            return ('mulop', e[1], self._rewrite(e[2], defs, pre, wide=True), self._rewrite(e[3], defs, pre))
+        return (e[0], e[1]) + tuple(self._rewrite(c, defs, pre) for c in e[2:])
+
+
+def hoist_invariants(ast, symbol_table, entry: str = "main"):
+    """Επιστρέφει (νέο AST, stats). Το αρχικό AST δεν αλλάζει."""
+    hoister = LoopHoister(symbol_table, entry)
+    return hoister.hoist_program(ast), hoister.stats
+
+
+def format_stats(stats: Dict) -> str:
+    hoisted = sum(p["hoisted"] for p in stats["per_loop"])
+    total = {op: sum(p["ops"][op] for p in stats["per_loop"]) for op in OPS}
+    rows = [
+        f"{'loops':<18}{stats['loops']} ({len(stats['per_loop'])} with hoisted code, "
+        f"{stats['recursive']} left alone: recursive call, {stats['impure']} impure call in the condition)",
+        f"{'hoisted exprs':<18}{hoisted} (" + ", ".join(f"{op} {total[op]}" for op in OPS) + ")",
+    ]
+    for p in stats["per_loop"]:
+        ops = ", ".join(f"{op} {n}" for op, n in p["ops"].items() if n) or "-"
+        where = f"{p['method']} loop {p['loop']}"
+        rows.append(f"  {where:<16}depth {p['depth']}, {p['hoisted']} exprs ({ops})"
+                    + (", guarded" if p["guarded"] else ""))
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
@@ -1,16 +1,22 @@
-from lexer import lexer
+from lexer import TokenBuffer
 from parser import parser
-import pprint, os, sys, io
+import argparse, glob, pprint, os, sys, io, time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from symbol_table import build_symbol_table
-from mixal_generator import MixalGenerator
-from semantic_check import (
-    check_undeclared_variables,
-    check_main_exists,
-    check_break_outside_while,
-    check_duplicate_declarations,
-    check_duplicate_functions,
-    check_division_by_zero,
-)
+from mixal_generator import (MixalGenerator, format_immediates, format_layout, format_moves, format_tail_calls,
+                             format_temps)
+from compile_cache import CompileCache, run_semantic_checks
+from peephole import format_stats as peephole_stats
+from const_fold import fold_constants, format_stats as fold_stats
+from regalloc import format_plan
+from dead_code import format_stats as dce_stats
+from inline import format_stats as inline_stats
+from licm import format_stats as licm_stats
+from cse import format_stats as cse_stats
+from ordering import format_stats as order_stats
+from ir import format_ir, format_stats as ir_stats
+from dataflow import analyze_program, format_stats as dataflow_stats
 
 
 test_code = '''
@@ -33,66 +39,274 @@ int main()
 }
 '''
 
-# 1)Δημιουργία φακέλου
-os.makedirs("output", exist_ok=True)
-
-# 2)Λεξική ανάλυση
-lexer.input(test_code)
-with open("output/lexical_analysis.txt", "w", encoding="utf-8") as f:
-    f.write("--- Lexical Analysis (tokens) ---\n\n")
-    while True:
-        tok = lexer.token()
-        if not tok:
-            break
-        f.write(f"{tok}\n")
-print("✅ Lexical analysis generated at output/lexical_analysis")
-
-lexer.lineno = 1           # reset line counter
-lexer.input(test_code)     # ξαναφόρτωσε το ίδιο source
-
-# 3) PARSE — αν αποτύχει, ΜΗΝ συνεχίσεις
-try:
-    result = parser.parse(test_code, lexer=lexer)
-except SyntaxError:
-    print("❌ Syntax errors — aborting.")
-    sys.exit(1)
-
-# 4) AST output
-with open("output/ast_output.txt", "w", encoding="utf-8") as f:
-    f.write("--- Abstract Syntax Tree ---\n\n")
-    pprint.pprint(result, stream=f)
-print("✅ Abstract Syntax Tree generated at output/ast_output")
-
-# 5) Symbol table
-symbol_table = build_symbol_table(result)
-with open("output/symbol_table.txt", "w", encoding="utf-8") as f:
-    f.write("--- Symbol Table ---\n\n")
-    pprint.pprint(symbol_table, stream=f)
-
-
-sem_buf = io.StringIO()
-# τρέξε όλους τους ελέγχους γράφοντας ΚΑΙ στο buffer
-check_undeclared_variables(result, symbol_table, stream=sem_buf)
-check_main_exists(symbol_table, stream=sem_buf)
-check_break_outside_while(result, symbol_table, stream=sem_buf)
-check_duplicate_declarations(symbol_table, stream=sem_buf)
-check_duplicate_functions(symbol_table, stream=sem_buf)
-check_division_by_zero(result, stream=sem_buf)
-
-# γράψε το περιεχόμενο του buffer στο αρχείο
-os.makedirs("output", exist_ok=True)
-with open("output/semantic_checks.txt", "w", encoding="utf-8") as f:
-    f.write("--- Semantic Checks ---\n\n")
-    f.write(sem_buf.getvalue())
-
-# αν υπάρχουν μηνύματα, σταμάτα εδώ
-if sem_buf.getvalue().strip():
-    print("❌ Semantic errors — aborting codegen.")
-    sys.exit(1)
-
-# 6) Codegen μόνο αν όλα ΟΚ
-gen = MixalGenerator(symbol_table=symbol_table, entry="main")
-mixal_text = gen.gen_program(result)
-with open("output/main.mixal", "w", encoding="utf-8") as f:
-    f.write(mixal_text)
-print("✅ MIXAL generated at output/main.mixal")
+# Καταστάσεις αποτελέσματος μιας μεταγλώττισης
+OK = "ok"
+SYNTAX_ERROR = "syntax error"
+SEMANTIC_ERROR = "semantic errors"
+
+
+def compile_source(source, out_dir="output", cache=None, options=None):
+    """
+    Τρέχει όλο το pipeline (lex -> parse -> symbol table -> semantic -> codegen) για ένα
+    πηγαίο κείμενο και γράφει τα αρχεία εξόδου στο out_dir.
+    cache: προαιρετικό CompileCache για επαναχρησιμοποίηση diagnostics/κώδικα ανά μέθοδο.
+    options: επιλογές βελτιστοποίησης, π.χ. {"fold": False, "peephole": False}
+             (το "fold" αφορά το AST pass, το "lex_dump": False παραλείπει το lexical_analysis.txt,
+             τα υπόλοιπα είναι keyword επιλογές του MixalGenerator).
+    Επιστρέφει OK / SYNTAX_ERROR / SEMANTIC_ERROR.
+    """
+    # 1)Δημιουργία φακέλου
+    os.makedirs(out_dir, exist_ok=True)
+
+    gen_options = dict(options or {})
+
+    # 2)Λεξική ανάλυση — μία φορά, σε buffer που τροφοδοτεί και το dump και τον parser
+    tokens = TokenBuffer(source)
+    if gen_options.pop("lex_dump", True):
+        with open(os.path.join(out_dir, "lexical_analysis.txt"), "w", encoding="utf-8") as f:
+            f.write("--- Lexical Analysis (tokens) ---\n\n")
+            tokens.dump(f)
+        print(f"✅ Lexical analysis generated at {out_dir}/lexical_analysis")
+
+    # 3) PARSE — αν αποτύχει, ΜΗΝ συνεχίσεις
+    try:
+        result = parser.parse(source, lexer=tokens)
+    except SyntaxError:
+        print("❌ Syntax errors — aborting.")
+        return SYNTAX_ERROR
+
+    # 4) AST output
+    with open(os.path.join(out_dir, "ast_output.txt"), "w", encoding="utf-8") as f:
+        f.write("--- Abstract Syntax Tree ---\n\n")
+        pprint.pprint(result, stream=f)
+    print(f"✅ Abstract Syntax Tree generated at {out_dir}/ast_output")
+
+    # 5) Symbol table
+    symbol_table = build_symbol_table(result)
+    with open(os.path.join(out_dir, "symbol_table.txt"), "w", encoding="utf-8") as f:
+        f.write("--- Symbol Table ---\n\n")
+        pprint.pprint(symbol_table.to_dict(), stream=f)
+
+    sem_buf = io.StringIO()
+    # τρέξε όλους τους ελέγχους γράφοντας ΚΑΙ στο buffer
+    run_semantic_checks(result, symbol_table, stream=sem_buf, cache=cache)
+
+    # γράψε το περιεχόμενο του buffer στο αρχείο
+    with open(os.path.join(out_dir, "semantic_checks.txt"), "w", encoding="utf-8") as f:
+        f.write("--- Semantic Checks ---\n\n")
+        f.write(sem_buf.getvalue())
+
+    # αν υπάρχουν μηνύματα, σταμάτα εδώ
+    if sem_buf.getvalue().strip():
+        print(sem_buf.getvalue().rstrip())
+        print("❌ Semantic errors — aborting codegen.")
+        return SEMANTIC_ERROR
+
+    # 6) Βελτιστοποιήσεις στο AST (μόνο σε σημασιολογικά σωστό πρόγραμμα)
+    report = []
+    if gen_options.pop("fold", True):
+        result, stats = fold_constants(result)
+        report.append(("constant folding / propagation", fold_stats(stats)))
+
+    # 7) Codegen μόνο αν όλα ΟΚ
+    gen = MixalGenerator(symbol_table=symbol_table, entry="main", cache=cache, **gen_options)
+    mixal_text = gen.gen_program(result)
+    with open(os.path.join(out_dir, "main.mixal"), "w", encoding="utf-8") as f:
+        f.write(mixal_text)
+    print(f"✅ MIXAL generated at {out_dir}/main.mixal")
+    if gen.ir:
+        with open(os.path.join(out_dir, "ir_output.txt"), "w", encoding="utf-8") as f:
+            f.write("--- Three-Address IR ---\n\n")
+            f.write(format_ir(gen.ir_stats["methods"]))
+        print(f"✅ IR generated at {out_dir}/ir_output")
+    if gen.inline:
+        report.append((measured(gen, "inlining", "cycles: MIX simulator, same program compiled without inlining"),
+                       inline_stats(gen.inline_stats)))
+    if gen.dce:
+        report.append((measured(gen, "dead code", "words: same program compiled without this pass"),
+                       dce_stats(gen.dce_stats)))
+    if gen.licm:
+        report.append((measured(gen, "loop-invariant code motion",
+                                "cycles: MIX simulator, same program compiled without this pass"),
+                       licm_stats(gen.licm_stats)))
+    if gen.cse:
+        report.append((measured(gen, "common subexpressions", "cycles: MIX simulator, same program compiled without this pass"),
+                       cse_stats(gen.cse_stats)))
+    if gen.order:
+        report.append((measured(gen, "operand order (Sethi-Ullman need = live temporaries)",
+                                "spills/cycles: same program compiled without this pass"),
+                       order_stats(gen.order_stats)))
+    if gen.tco:
+        report.append((measured(gen, "tail calls", "cycles: MIX simulator, same program compiled without this pass"),
+                       format_tail_calls(gen.tail_stats)))
+    if gen.layout:
+        report.append((measured(gen, "branch layout", "cycles: MIX simulator, same program compiled without this pass"),
+                       format_layout(gen.layout_stats)))
+    if gen.ir:
+        report.append((measured(gen, "intermediate representation", "cycles: MIX simulator, same program compiled from the AST"),
+                       ir_stats(gen.ir_stats)))
+        report.append(("dataflow (bitsets over the IR CFG: block visits of liveness + reaching defs + available exprs)",
+                       dataflow_stats(analyze_program(gen.ir_stats["methods"], gen.call_reach))))
+    if gen.immediate:
+        report.append((measured(gen, "immediate operands", "words/cycles: same program compiled with constant-pool loads"),
+                       format_immediates(gen.imm_stats)))
+    if gen.regmoves:
+        report.append((measured(gen, "register moves", "words/cycles: same program compiled with TMPX/TMPDIV round trips"),
+                       format_moves(gen.move_stats)))
+    if gen.regalloc and not gen.ir:
+        report.append(("index registers", format_plan(gen.reg_plan)))
+    report.append(("temporaries (data words per method: one per spill before pooling)", format_temps(gen.temp_stats)))
+    if gen.peephole:
+        report.append(("peephole (cycles = static MIX time units saved)", peephole_stats(gen.peephole_stats)))
+    write_report(report, out_dir)
+    if cache is not None:
+        print(f"   compile cache: {cache.hits} hits, {cache.misses} misses")
+    return OK
+
+
+def measured(gen, title: str, note: str) -> str:
+    # Τίτλος ενότητας: η σημείωση για το "πριν -> μετά" μόνο όταν μετρήθηκε (--report-cycles)
+    return f"{title} ({note})" if gen.measure else title
+
+
+def write_report(sections, out_dir):
+    # Στατιστικά των βελτιστοποιήσεων: λίστα από (τίτλος, κείμενο)
+    with open(os.path.join(out_dir, "optimization_report.txt"), "w", encoding="utf-8") as f:
+        f.write("--- Optimization Report ---\n\n")
+        if not sections:
+            f.write("all optimizations disabled\n")
+        for title, text in sections:
+            f.write(f"{title}:\n{text}\n\n")
+
+
+# ---------------- batch ----------------
+
+def collect_inputs(paths, pattern="*.txt"):
+    # Αρχεία όπως δόθηκαν + όσα ταιριάζουν με το pattern μέσα σε φακέλους (ταξινομημένα, ντετερμινιστικά)
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(sorted(f for f in glob.glob(os.path.join(p, pattern)) if os.path.isfile(f)))
+        else:
+            files.append(p)
+    return files
+
+
+def output_dirs(files, out_root):
+    # Ένας υποφάκελος ανά αρχείο (όνομα χωρίς κατάληξη). Σε σύγκρουση ονομάτων μπαίνει και ο γονικός φάκελος.
+    stems = [os.path.splitext(os.path.basename(f))[0] for f in files]
+    dirs, used = [], set()
+    for f, stem in zip(files, stems):
+        name = stem
+        if stems.count(stem) > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(f)))
+            name = f"{parent}_{stem}"
+        base, k = name, 2
+        while name in used:
+            name = f"{base}_{k}"
+            k += 1
+        used.add(name)
+        dirs.append(os.path.join(out_root, name))
+    return dirs
+
+
+def _compile_job(job):
+    # Εκτελείται σε worker process: μαζεύει ό,τι τυπώνεται (π.χ. lexer/parser errors) ανά αρχείο
+    path, out_dir, cache_dir, options = job
+    log = io.StringIO()
+    t0 = time.perf_counter()
+    try:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        cache = CompileCache(cache_dir) if cache_dir else None
+        with redirect_stdout(log):
+            status = compile_source(source, out_dir, cache, options)
+    except Exception as exc:  # π.χ. αρχείο που δεν διαβάζεται ή σφάλμα μέσα στον compiler
+        status = f"error: {exc}"
+    return {
+        "path": path,
+        "out_dir": out_dir,
+        "status": status,
+        "log": log.getvalue(),
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def compile_many(files, out_root="output", jobs=None, cache_dir=None, options=None):
+    """Μεταγλωττίζει πολλά αρχεία παράλληλα (process pool). Επιστρέφει λίστα αποτελεσμάτων με τη σειρά εισόδου."""
+    jobs_list = [(f, d, cache_dir, options) for f, d in zip(files, output_dirs(files, out_root))]
+    workers = jobs or os.cpu_count() or 1
+    if workers == 1 or len(jobs_list) <= 1:
+        return [_compile_job(j) for j in jobs_list]
+    # μικρά chunks ώστε τα workers να μοιράζονται ομοιόμορφα τα αρχεία
+    chunk = max(1, len(jobs_list) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_compile_job, jobs_list, chunksize=chunk))
+
+
+def print_summary(results, elapsed, verbose=False, stream=None):
+    stream = stream or sys.stdout
+    failed = [r for r in results if r["status"] != OK]
+    for r in results:
+        mark = "✅" if r["status"] == OK else "❌"
+        print(f"{mark} {r['path']} -> {r['out_dir']} ({r['status']}, {r['seconds'] * 1000:.1f} ms)", file=stream)
+        if verbose or r["status"] != OK:
+            for line in r["log"].splitlines():
+                if verbose or not line.startswith("✅"):
+                    print(f"    {line}", file=stream)
+    print(f"\n{len(results)} file(s): {len(results) - len(failed)} ok, {len(failed)} failed "
+          f"in {elapsed:.2f} s", file=stream)
+    return failed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compile C-like sources to MIXAL")
+    ap.add_argument("inputs", nargs="*", help="source files or directories (default: built-in test_code)")
+    ap.add_argument("-o", "--out-dir", default="output", help="output root (one sub-folder per input file)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--pattern", default="*.txt", help="file pattern used when an input is a directory")
+    ap.add_argument("-v", "--verbose", action="store_true", help="show the full log of every file")
+    ap.add_argument("--cache-dir", default=None, help="per-method compile cache directory (disabled by default)")
+    ap.add_argument("--no-fold", action="store_true", help="disable constant folding/propagation")
+    ap.add_argument("--no-regalloc", action="store_true", help="keep all locals in memory (no index registers)")
+    ap.add_argument("--no-peephole", action="store_true", help="disable the peephole optimizer")
+    ap.add_argument("--no-inline", action="store_true", help="do not inline small leaf functions")
+    ap.add_argument("--no-dce", action="store_true", help="keep unreachable statements and uncalled functions")
+    ap.add_argument("--no-licm", action="store_true", help="keep loop-invariant expressions inside the loops")
+    ap.add_argument("--no-cse", action="store_true", help="recompute repeated subexpressions")
+    ap.add_argument("--no-order", action="store_true", help="evaluate operands in source order (no Sethi-Ullman swaps)")
+    ap.add_argument("--no-tco", action="store_true", help="compile tail calls as ordinary calls")
+    ap.add_argument("--no-layout", action="store_true", help="test loops at the top and keep label NOPs")
+    ap.add_argument("--no-immediate", action="store_true", help="load every constant from the constant pool")
+    ap.add_argument("--no-regmoves", action="store_true",
+                    help="move MUL/DIV operands through TMPX/TMPDIV and always reload rA")
+    ap.add_argument("--ir", action="store_true", help="select MIX instructions from the three-address IR")
+    ap.add_argument("--report-cycles", action="store_true",
+                    help="recompile without each pass and run both versions in the MIX simulator (slow)")
+    ap.add_argument("--no-lex-dump", action="store_true", help="do not write lexical_analysis.txt")
+    args = ap.parse_args(argv)
+    options = {"fold": not args.no_fold, "regalloc": not args.no_regalloc, "peephole": not args.no_peephole,
+               "inline": not args.no_inline, "dce": not args.no_dce, "licm": not args.no_licm,
+               "cse": not args.no_cse, "order": not args.no_order, "tco": not args.no_tco,
+               "layout": not args.no_layout,
+               "immediate": not args.no_immediate, "regmoves": not args.no_regmoves, "ir": args.ir, "measure": args.report_cycles,
+               "lex_dump": not args.no_lex_dump}
+
+    # Χωρίς ορίσματα: όπως πριν, μεταγλώττιση του test_code στο output/
+    if not args.inputs:
+        cache = CompileCache(args.cache_dir) if args.cache_dir else None
+        return 0 if compile_source(test_code, args.out_dir, cache, options) == OK else 1
+
+    files = collect_inputs(args.inputs, args.pattern)
+    if not files:
+        print("❌ No input files found.")
+        return 1
+
+    t0 = time.perf_counter()
+    results = compile_many(files, args.out_dir, args.jobs, args.cache_dir, options)
+    failed = print_summary(results, time.perf_counter() - t0, args.verbose)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,758 @@
+"""
+Assembler MIXAL + προσομοιωτής μηχανής MIX (Knuth, TAOCP Vol.1 §1.3).
+
+Φορτώνει ακριβώς το κείμενο που παράγει το MixalGenerator._render(), το εκτελεί
+και μετράει χρόνο εκτέλεσης σε μονάδες u σύμφωνα με τους χρόνους του Knuth.
+Έτσι κάθε αλλαγή στο codegen μετριέται σε κύκλους χωρίς εξωτερικό mixvm.
+
+Χρήση:
+    python mix_simulator.py output/main.mixal
+"""
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# ---------------- σταθερές μηχανής ----------------
+BYTE_SIZE = 64                      # 6-bit bytes (όπως στο GNU MDK)
+WORD_MAX = BYTE_SIZE ** 5 - 1       # μέγιστο μέγεθος λέξης (5 bytes)
+ADDR_MAX = BYTE_SIZE ** 2 - 1       # μέγιστη τιμή πεδίου διεύθυνσης/index register (2 bytes)
+MEMORY_SIZE = 4000                  # λέξεις μνήμης
+
+# Εσωτερική αναπαράσταση λέξης: int με bit 30 = πρόσημο (1 -> αρνητικό), bits 0..29 = μέτρο.
+# Έτσι κρατάμε και το "-0" και τα πεδία (L:R) γίνονται απλές μάσκες.
+SIGN = 1 << 30
+MAG = SIGN - 1
+
+
+class MixError(Exception):
+    """Σφάλμα assembler ή εκτέλεσης (απροσδιόριστη συμπεριφορά MIX, όριο βημάτων κ.λπ.)."""
+
+
+# ---------------- πίνακας opcodes ----------------
+# mnemonic -> (C, default F)
+OPCODES: Dict[str, Tuple[int, int]] = {
+    "NOP": (0, 0), "ADD": (1, 5), "SUB": (2, 5), "MUL": (3, 5), "DIV": (4, 5),
+    "NUM": (5, 0), "CHAR": (5, 1), "HLT": (5, 2),
+    "SLA": (6, 0), "SRA": (6, 1), "SLAX": (6, 2), "SRAX": (6, 3), "SLC": (6, 4), "SRC": (6, 5),
+    "MOVE": (7, 1),
+    "STJ": (32, 2), "STZ": (33, 5),
+    "JBUS": (34, 0), "IOC": (35, 0), "IN": (36, 0), "OUT": (37, 0), "JRED": (38, 0),
+    "JMP": (39, 0), "JSJ": (39, 1), "JOV": (39, 2), "JNOV": (39, 3),
+    "JL": (39, 4), "JE": (39, 5), "JG": (39, 6), "JGE": (39, 7), "JNE": (39, 8), "JLE": (39, 9),
+}
+# Οικογένειες ανά καταχωρητή: A, I1..I6, X  (offset 0..7 πάνω στη βάση του C)
+REG_NAMES = ["A", "1", "2", "3", "4", "5", "6", "X"]
+for _k, _r in enumerate(REG_NAMES):
+    OPCODES[f"LD{_r}"] = (8 + _k, 5)
+    OPCODES[f"LD{_r}N"] = (16 + _k, 5)
+    OPCODES[f"ST{_r}"] = (24 + _k, 5)
+    for _f, _suf in enumerate(["N", "Z", "P", "NN", "NZ", "NP"]):
+        OPCODES[f"J{_r}{_suf}"] = (40 + _k, _f)
+    OPCODES[f"INC{_r}"] = (48 + _k, 0)
+    OPCODES[f"DEC{_r}"] = (48 + _k, 1)
+    OPCODES[f"ENT{_r}"] = (48 + _k, 2)
+    OPCODES[f"ENN{_r}"] = (48 + _k, 3)
+    OPCODES[f"CMP{_r}"] = (56 + _k, 5)
+OPCODES["JAE"], OPCODES["JAO"] = (40, 6), (40, 7)
+OPCODES["JXE"], OPCODES["JXO"] = (47, 6), (47, 7)
+
+PSEUDO_OPS = {"EQU", "ORIG", "CON", "ALF", "END"}
+
+# Σύνολο mnemonics που είναι άλματα (χρήσιμο για optimizers πάνω στο self.code)
+JUMP_OPS = {op for op, (c, _) in OPCODES.items() if c in (39,) or 40 <= c <= 47}
+
+# Χαρακτήρες MIX (για ALF/CHAR/NUM), κωδικοί 0..55
+MIX_CHARS = " ABCDEFGHI~JKLMNOPR[#STUVWXYZ0123456789.,()+-*/=$<>@;:'"
+
+
+def instruction_time(c: int, f: int = 0) -> int:
+    """Χρόνος εκτέλεσης σε u κατά Knuth για opcode C με πεδίο F (I/O θεωρείται T=0)."""
+    if c == 0:
+        return 1
+    if c in (1, 2):
+        return 2
+    if c == 3:
+        return 10
+    if c == 4:
+        return 12
+    if c == 5:
+        return 10
+    if c == 6:
+        return 2
+    if c == 7:
+        return 1 + 2 * f
+    if 8 <= c <= 33:
+        return 2
+    if 34 <= c <= 55:
+        return 1
+    return 2  # CMPA..CMPX
+
+
+def op_time(op: str, operand: str = "") -> int:
+    """
+    Χρόνος (u) μιας γραμμής (op, operand) όπως τη γράφει ο generator.
+    Ψευδοεντολές (ORIG/CON/END/EQU) δεν εκτελούνται -> 0.
+    """
+    if op not in OPCODES:
+        return 0
+    c, f = OPCODES[op]
+    if c == 7 and operand and operand.endswith(")"):
+        try:
+            f = int(operand[operand.rfind("(") + 1:-1])
+        except ValueError:
+            pass
+    return instruction_time(c, f)
+
+
+# ---------------- βοηθητικά λέξεων ----------------
+def word_to_int(w: int) -> int:
+    return -(w & MAG) if w & SIGN else w
+
+
+def int_to_word(v: int) -> int:
+    if v < 0:
+        if -v > WORD_MAX:
+            raise MixError(f"value {v} does not fit in a MIX word")
+        return SIGN | -v
+    if v > WORD_MAX:
+        raise MixError(f"value {v} does not fit in a MIX word")
+    return v
+
+
+def _field_get(w: int, l: int, r: int) -> int:
+    # Επιστρέφει το πεδίο (L:R) μιας λέξης, δεξιά στοιχισμένο, ως λέξη (με πρόσημο μόνο αν L == 0)
+    sign = 0
+    if l == 0:
+        sign = w & SIGN
+        l = 1
+    if r < l:
+        return sign
+    nbytes = r - l + 1
+    return sign | (((w & MAG) >> (6 * (5 - r))) & ((1 << (6 * nbytes)) - 1))
+
+
+def _field_put(dst: int, src: int, l: int, r: int) -> int:
+    # Γράφει τα δεξιότερα bytes του src στο πεδίο (L:R) του dst
+    if l == 0:
+        dst = (dst & MAG) | (src & SIGN)
+        l = 1
+    if r < l:
+        return dst
+    nbytes = r - l + 1
+    shift = 6 * (5 - r)
+    mask = ((1 << (6 * nbytes)) - 1) << shift
+    return (dst & ~mask) | ((src & ((1 << (6 * nbytes)) - 1)) << shift)
+
+
+def _split_field(f: int) -> Tuple[int, int]:
+    l, r = divmod(f, 8)
+    if l > r or r > 5:
+        raise MixError(f"invalid field specification ({l}:{r})")
+    return l, r
+
+
+def encode_instruction(a: int, i: int, f: int, c: int) -> int:
+    if abs(a) > ADDR_MAX:
+        raise MixError(f"address {a} does not fit in two bytes")
+    if not 0 <= i <= 6:
+        raise MixError(f"invalid index register {i}")
+    if not 0 <= f < BYTE_SIZE:
+        raise MixError(f"invalid field {f}")
+    w = (abs(a) << 18) | (i << 12) | (f << 6) | c
+    return w | SIGN if a < 0 else w
+
+
+# ---------------- assembler ----------------
+_SYMBOL_RE = re.compile(r"[A-Z0-9]*[A-Z][A-Z0-9]*$")
+_LOCAL_RE = re.compile(r"([0-9])([HBF])$")
+_TOKEN_RE = re.compile(r"\s*(//|[0-9A-Z]+|[-+*/:])")
+
+
+class _Assembler:
+    """Δύο περάσματα: (1) διευθύνσεις labels, (2) κωδικοποίηση λέξεων."""
+
+    def __init__(self, text: str):
+        self.lines = text.splitlines()
+        self.symbols: Dict[str, int] = {}
+        self.memory = [0] * MEMORY_SIZE
+        self.line_of: Dict[int, int] = {}       # διεύθυνση -> αριθμός γραμμής πηγής (1-based)
+        self.start: Optional[int] = None
+        self.literals: Dict[str, str] = {}      # κείμενο literal -> όνομα συμβόλου
+        self.local_defs: Dict[str, List[Tuple[int, str]]] = {}  # "1" -> [(γραμμή, μοναδικό όνομα)]
+
+    # -- parsing μιας γραμμής σε (label, op, address)
+    @staticmethod
+    def _split(line: str) -> Optional[Tuple[str, str, str]]:
+        if not line.strip() or line[0] == "*":
+            return None
+        label = ""
+        rest = line
+        if not line[0].isspace():
+            parts = line.split(None, 1)
+            label = parts[0]
+            rest = parts[1] if len(parts) > 1 else ""
+        parts = rest.split(None, 1)
+        if not parts:
+            return (label, "", "")
+        op = parts[0].upper()
+        tail = parts[1] if len(parts) > 1 else ""
+        if op == "ALF":
+            # ALF: 5 χαρακτήρες, είτε μέσα σε "..." είτε ως έχουν
+            m = re.match(r'\s*"([^"]*)"', tail)
+            return (label, op, m.group(1) if m else tail[:5])
+        address = tail.split(None, 1)[0] if tail.strip() else ""
+        return (label, op, address.upper())
+
+    # -- local symbols (dH / dB / dF)
+    def _resolve_local(self, name: str, lineno: int) -> str:
+        m = _LOCAL_RE.match(name)
+        if not m:
+            return name
+        digit, kind = m.groups()
+        defs = self.local_defs.get(digit, [])
+        if kind == "B":
+            cands = [uniq for (ln, uniq) in defs if ln < lineno]
+            if cands:
+                return cands[-1]
+        elif kind == "F":
+            for ln, uniq in defs:
+                if ln > lineno:
+                    return uniq
+        raise MixError(f"line {lineno}: unresolved local symbol {name}")
+
+    # -- εκφράσεις MIXAL (αριστερά-προς-δεξιά, χωρίς προτεραιότητες)
+    def _atom(self, tok: str, loc: int, lineno: int, strict: bool) -> int:
+        if tok == "*":
+            return loc
+        if tok.isdigit():
+            return int(tok)
+        name = self._resolve_local(tok, lineno)
+        if name in self.symbols:
+            return self.symbols[name]
+        if strict:
+            raise MixError(f"line {lineno}: undefined symbol {tok}")
+        return 0
+
+    def _expr(self, s: str, loc: int, lineno: int, strict: bool = True) -> int:
+        toks = []
+        pos = 0
+        while pos < len(s):
+            m = _TOKEN_RE.match(s, pos)
+            if not m:
+                raise MixError(f"line {lineno}: bad expression '{s}'")
+            toks.append(m.group(1))
+            pos = m.end()
+        if not toks:
+            return 0
+        k = 0
+        sign = 1
+        if toks[0] in ("+", "-"):
+            sign = -1 if toks[0] == "-" else 1
+            k = 1
+        if k >= len(toks):
+            raise MixError(f"line {lineno}: bad expression '{s}'")
+        val = sign * self._atom(toks[k], loc, lineno, strict)
+        k += 1
+        while k < len(toks):
+            op = toks[k]
+            if k + 1 >= len(toks):
+                raise MixError(f"line {lineno}: bad expression '{s}'")
+            rhs = self._atom(toks[k + 1], loc, lineno, strict)
+            if op == "+":
+                val = val + rhs
+            elif op == "-":
+                val = val - rhs
+            elif op == "*":
+                val = val * rhs
+            elif op == "/":
+                val = int(val / rhs) if rhs else 0
+            elif op == "//":
+                val = int(val * (WORD_MAX + 1) / rhs) if rhs else 0
+            elif op == ":":
+                val = 8 * val + rhs
+            else:
+                raise MixError(f"line {lineno}: bad operator '{op}'")
+            k += 2
+        return val
+
+    def _wvalue(self, s: str, loc: int, lineno: int) -> int:
+        # W-value: E1(F1),E2(F2),... -> μία λέξη
+        w = 0
+        for part in s.split(","):
+            f = 5
+            if part.endswith(")") and "(" in part:
+                cut = part.rfind("(")
+                f = self._expr(part[cut + 1:-1], loc, lineno)
+                part = part[:cut]
+            l, r = _split_field(f)
+            w = _field_put(w, int_to_word(self._expr(part, loc, lineno)), l, r)
+        return w
+
+    def _define(self, label: str, value: int, lineno: int):
+        m = _LOCAL_RE.match(label)
+        if m and m.group(2) == "H":
+            uniq = f"{label}#{lineno}"
+            self.local_defs.setdefault(m.group(1), []).append((lineno, uniq))
+            self.symbols[uniq] = value
+            return
+        if not _SYMBOL_RE.match(label) or len(label) > 10:
+            raise MixError(f"line {lineno}: invalid label '{label}'")
+        if label in self.symbols:
+            raise MixError(f"line {lineno}: duplicate label '{label}'")
+        self.symbols[label] = value
+
+    def assemble(self):
+        parsed = []
+        loc = 0
+        end_seen = False
+        # --- pass 1
+        for lineno, raw in enumerate(self.lines, start=1):
+            item = self._split(raw.rstrip("\n"))
+            if item is None:
+                continue
+            label, op, addr = item
+            if not op:
+                if label:
+                    raise MixError(f"line {lineno}: label without operator")
+                continue
+            if op not in OPCODES and op not in PSEUDO_OPS:
+                raise MixError(f"line {lineno}: unknown operator '{op}'")
+            if op == "EQU":
+                if label:
+                    self._define(label, self._expr(addr, loc, lineno), lineno)
+                continue
+            if op == "ORIG":
+                if label:
+                    self._define(label, loc, lineno)
+                loc = self._expr(addr, loc, lineno)
+                continue
+            if op == "END":
+                if label:
+                    self._define(label, loc, lineno)
+                parsed.append((lineno, loc, op, addr))
+                end_seen = True
+                break
+            if label:
+                self._define(label, loc, lineno)
+            if op not in ("CON", "ALF"):
+                lit = self._literal_of(addr)
+                if lit is not None and lit not in self.literals:
+                    self.literals[lit] = f"={len(self.literals)}="
+            parsed.append((lineno, loc, op, addr))
+            loc += 1
+        if not end_seen:
+            raise MixError("missing END")
+
+        # Literals μπαίνουν αμέσως μετά την τελευταία θέση (πριν το END), όπως στο MIXAL
+        lit_words = []
+        for text, sym in self.literals.items():
+            self.symbols[sym] = loc
+            lit_words.append((loc, text))
+            loc += 1
+
+        # --- pass 2
+        for lineno, at, op, addr in parsed:
+            if op == "END":
+                self.start = self._expr(addr, at, lineno) if addr else 0
+                continue
+            if not 0 <= at < MEMORY_SIZE:
+                raise MixError(f"line {lineno}: location {at} outside memory")
+            if op == "CON":
+                self.memory[at] = self._wvalue(addr, at, lineno)
+            elif op == "ALF":
+                self.memory[at] = self._alf(addr, lineno)
+            else:
+                self.memory[at] = self._instruction(op, addr, at, lineno)
+            self.line_of[at] = lineno
+        for at, text in lit_words:
+            self.memory[at] = self._wvalue(text, at, 0)
+        return self
+
+    @staticmethod
+    def _literal_of(addr: str) -> Optional[str]:
+        m = re.match(r"=([^=]*)=", addr)
+        return m.group(1) if m else None
+
+    def _alf(self, s: str, lineno: int) -> int:
+        s = (s + "     ")[:5]
+        w = 0
+        for ch in s:
+            if ch.upper() not in MIX_CHARS:
+                raise MixError(f"line {lineno}: character '{ch}' not in MIX charset")
+            w = (w << 6) | MIX_CHARS.index(ch.upper())
+        return w
+
+    def _instruction(self, op: str, addr: str, at: int, lineno: int) -> int:
+        c, f = OPCODES[op]
+        a_part, i = addr, 0
+        if a_part.endswith(")") and "(" in a_part:
+            cut = a_part.rfind("(")
+            f = self._expr(a_part[cut + 1:-1], at, lineno)
+            a_part = a_part[:cut]
+        lit = self._literal_of(a_part)
+        if lit is not None:
+            a = self.symbols[self.literals[lit]]
+            a_part = a_part[len(lit) + 2:]
+            if a_part.startswith(","):
+                i = self._expr(a_part[1:], at, lineno)
+        else:
+            if "," in a_part:
+                a_part, idx = a_part.rsplit(",", 1)
+                i = self._expr(idx, at, lineno)
+            a = self._expr(a_part, at, lineno)
+        try:
+            return encode_instruction(a, i, f, c)
+        except MixError as exc:
+            raise MixError(f"line {lineno}: {exc}") from None
+
+
+def assemble(text: str) -> _Assembler:
+    """Συμβολομεταφράζει κείμενο MIXAL. Επιστρέφει αντικείμενο με memory/symbols/start/line_of."""
+    return _Assembler(text).assemble()
+
+
+# ---------------- μηχανή ----------------
+class MixMachine:
+    """
+    Προσομοιωτής MIX. Οι καταχωρητές/μνήμη κρατιούνται στην εσωτερική μορφή λέξης,
+    ενώ τα rA, rX, rI(i), read(addr) επιστρέφουν απλούς ακέραιους.
+    """
+
+    def __init__(self, memory: Optional[List[int]] = None, start: int = 0,
+                 symbols: Optional[Dict[str, int]] = None, line_of: Optional[Dict[int, int]] = None):
+        self.mem = list(memory) if memory is not None else [0] * MEMORY_SIZE
+        self.symbols = symbols or {}
+        self.line_of = line_of or {}
+        self.pc = start
+        self.a = 0
+        self.x = 0
+        self.i = [0] * 7                    # index registers rI1..rI6 (θέση 0 αχρησιμοποίητη)
+        self.j = 0
+        self.overflow = False
+        self.comparison = 0                 # -1 LESS, 0 EQUAL, 1 GREATER
+        self.cycles = 0
+        self.steps = 0
+        self.halted = False
+        self.counts = [0] * MEMORY_SIZE     # πόσες φορές εκτελέστηκε κάθε διεύθυνση (profiling)
+
+    @classmethod
+    def from_mixal(cls, text: str) -> "MixMachine":
+        asm = assemble(text)
+        return cls(asm.memory, asm.start or 0, asm.symbols, asm.line_of)
+
+    # -- προβολές για τον χρήστη
+    @property
+    def rA(self) -> int:
+        return word_to_int(self.a)
+
+    @property
+    def rX(self) -> int:
+        return word_to_int(self.x)
+
+    @property
+    def rJ(self) -> int:
+        return self.j
+
+    def rI(self, n: int) -> int:
+        return word_to_int(self.i[n])
+
+    def read(self, addr: int) -> int:
+        return word_to_int(self.mem[addr])
+
+    def read_symbol(self, name: str) -> int:
+        return self.read(self.symbols[name])
+
+    def memory(self) -> List[int]:
+        return [word_to_int(w) for w in self.mem]
+
+    def profile_by_line(self) -> Dict[int, int]:
+        # γραμμή πηγής -> πλήθος εκτελέσεων
+        return {self.line_of[addr]: n for addr, n in enumerate(self.counts) if n and addr in self.line_of}
+
+    # -- βοηθητικά καταχωρητών
+    def _get_reg(self, k: int) -> int:
+        if k == 0:
+            return self.a
+        if k == 7:
+            return self.x
+        return self.i[k]
+
+    def _set_reg(self, k: int, w: int):
+        if k == 0:
+            self.a = w
+        elif k == 7:
+            self.x = w
+        else:
+            if w & MAG > ADDR_MAX:
+                raise MixError(f"rI{k} overflow at {self.pc}: {word_to_int(w)}")
+            self.i[k] = w
+
+    def _addr(self, m: int) -> int:
+        if not 0 <= m < MEMORY_SIZE:
+            raise MixError(f"memory reference {m} out of range at {self.pc}")
+        return m
+
+    # -- εκτέλεση
+    def run(self, max_steps: int = 10_000_000) -> "MixMachine":
+        mem = self.mem
+        counts = self.counts
+        while not self.halted:
+            if self.steps >= max_steps:
+                raise MixError(f"step limit {max_steps} exceeded")
+            pc = self.pc
+            if not 0 <= pc < MEMORY_SIZE:
+                raise MixError(f"program counter {pc} out of range")
+            w = mem[pc]
+            c = w & 63
+            f = (w >> 6) & 63
+            idx = (w >> 12) & 63
+            m = (w >> 18) & 0xFFF
+            if w & SIGN:
+                m = -m
+            if idx:
+                if idx > 6:
+                    raise MixError(f"invalid index {idx} at {pc}")
+                m += word_to_int(self.i[idx])
+            self.steps += 1
+            counts[pc] += 1
+            self.cycles += instruction_time(c, f)
+            self.pc = pc + 1
+            self._execute(c, f, m, w, pc)
+        return self
+
+    def _execute(self, c: int, f: int, m: int, w: int, pc: int):
+        if c == 0:
+            return
+        if 8 <= c <= 23:                                    # LDr / LDrN
+            l, r = _split_field(f)
+            v = _field_get(self.mem[self._addr(m)], l, r)
+            if c >= 16:
+                v ^= SIGN
+            self._set_reg((c - 8) % 8, v)
+            return
+        if 24 <= c <= 33:                                   # STr / STJ / STZ
+            l, r = _split_field(f)
+            at = self._addr(m)
+            if c <= 31:
+                src = self._get_reg(c - 24)
+            elif c == 32:
+                src = self.j
+            else:
+                src = 0
+            self.mem[at] = _field_put(self.mem[at], src, l, r)
+            return
+        if c in (1, 2):                                     # ADD / SUB
+            l, r = _split_field(f)
+            v = word_to_int(_field_get(self.mem[self._addr(m)], l, r))
+            self._add_to_a(-v if c == 2 else v)
+            return
+        if c == 3:                                          # MUL
+            l, r = _split_field(f)
+            vw = _field_get(self.mem[self._addr(m)], l, r)
+            prod = (self.a & MAG) * (vw & MAG)
+            sign = (self.a ^ vw) & SIGN
+            self.a = sign | (prod >> 30)
+            self.x = sign | (prod & MAG)
+            return
+        if c == 4:                                          # DIV
+            l, r = _split_field(f)
+            vw = _field_get(self.mem[self._addr(m)], l, r)
+            v = vw & MAG
+            if v == 0 or (self.a & MAG) >= v:
+                self.overflow = True                        # αποτέλεσμα απροσδιόριστο: κρατάμε τους καταχωρητές
+                return
+            dividend = ((self.a & MAG) << 30) | (self.x & MAG)
+            q, rem = divmod(dividend, v)
+            sign_a = self.a & SIGN
+            self.a = ((self.a ^ vw) & SIGN) | q
+            self.x = sign_a | rem
+            return
+        if c == 5:                                          # NUM / CHAR / HLT
+            if f == 2:
+                self.halted = True
+            elif f == 0:
+                self._num()
+            elif f == 1:
+                self._char()
+            return
+        if c == 6:                                          # shifts
+            self._shift(f, m)
+            return
+        if c == 7:                                          # MOVE
+            for _ in range(f):
+                dst = word_to_int(self.i[1])
+                self.mem[self._addr(dst)] = self.mem[self._addr(m)]
+                m += 1
+                self._set_reg(1, int_to_word(dst + 1))
+            return
+        if 34 <= c <= 38:                                   # I/O: δεν υπάρχουν συσκευές
+            if c == 38:                                     # JRED: η συσκευή είναι πάντα "έτοιμη"
+                self._jump(m, pc)
+            elif c != 34:
+                raise MixError(f"I/O instruction at {pc} not supported")
+            return
+        if c == 39:                                         # JMP family
+            cmp = self.comparison
+            take = (
+                f == 0 or f == 1
+                or (f == 2 and self.overflow) or (f == 3 and not self.overflow)
+                or (f == 4 and cmp < 0) or (f == 5 and cmp == 0) or (f == 6 and cmp > 0)
+                or (f == 7 and cmp >= 0) or (f == 8 and cmp != 0) or (f == 9 and cmp <= 0)
+            )
+            if f in (2, 3):
+                self.overflow = False
+            if take:
+                if f == 1:
+                    self.pc = self._addr(m)                 # JSJ: χωρίς αλλαγή του rJ
+                else:
+                    self._jump(m, pc)
+            return
+        if 40 <= c <= 47:                                   # JrN / JrZ / ...
+            v = word_to_int(self._get_reg(c - 40))
+            take = (
+                (f == 0 and v < 0) or (f == 1 and v == 0) or (f == 2 and v > 0)
+                or (f == 3 and v >= 0) or (f == 4 and v != 0) or (f == 5 and v <= 0)
+                or (f == 6 and v % 2 == 0) or (f == 7 and v % 2 == 1)
+            )
+            if f > 7 or (f > 5 and c not in (40, 47)):
+                raise MixError(f"invalid jump field {f} at {pc}")
+            if take:
+                self._jump(m, pc)
+            return
+        if 48 <= c <= 55:                                   # INC / DEC / ENT / ENN
+            k = c - 48
+            if f in (2, 3):
+                if m == 0:
+                    val = SIGN if (w & SIGN) else 0         # ENTA -0 κρατά το πρόσημο της εντολής
+                    if f == 3:
+                        val ^= SIGN
+                else:
+                    val = int_to_word(m if f == 2 else -m)
+                self._set_reg(k, val)
+            elif f in (0, 1):
+                delta = m if f == 0 else -m
+                if k in (0, 7):
+                    cur = self.a if k == 0 else self.x
+                    res = word_to_int(cur) + delta
+                    self._set_reg(k, self._wrap(res, cur))
+                else:
+                    self._set_reg(k, int_to_word(word_to_int(self.i[k]) + delta))
+            else:
+                raise MixError(f"invalid field {f} for opcode {c} at {pc}")
+            return
+        if 56 <= c <= 63:                                   # CMPr
+            l, r = _split_field(f)
+            lhs = word_to_int(_field_get(self._get_reg(c - 56), l, r))
+            rhs = word_to_int(_field_get(self.mem[self._addr(m)], l, r))
+            self.comparison = (lhs > rhs) - (lhs < rhs)
+            return
+        raise MixError(f"unknown opcode {c} at {pc}")
+
+    def _jump(self, m: int, pc: int):
+        self.j = pc + 1
+        self.pc = self._addr(m)
+
+    def _wrap(self, res: int, old: int) -> int:
+        # Αποτέλεσμα ADD/SUB/INC: υπερχείλιση -> overflow toggle και κράτημα των 5 bytes
+        neg = res < 0
+        mag = abs(res)
+        if mag > WORD_MAX:
+            self.overflow = True
+            mag &= MAG
+        elif mag == 0:
+            return old & SIGN                               # μηδέν: κρατά το πρόσημο του rA
+        return (SIGN | mag) if neg else mag
+
+    def _add_to_a(self, v: int):
+        self.a = self._wrap(word_to_int(self.a) + v, self.a)
+
+    def _shift(self, f: int, m: int):
+        if m < 0:
+            raise MixError(f"negative shift count at {self.pc - 1}")
+        a_mag, x_mag = self.a & MAG, self.x & MAG
+        if f == 0:
+            a_mag = (a_mag << (6 * m)) & MAG if m < 5 else 0
+        elif f == 1:
+            a_mag = a_mag >> (6 * m) if m < 5 else 0
+        elif f in (2, 3, 4, 5):
+            both = (a_mag << 30) | x_mag
+            full = (1 << 60) - 1
+            if f == 2:
+                both = (both << (6 * m)) & full if m < 10 else 0
+            elif f == 3:
+                both = both >> (6 * m) if m < 10 else 0
+            else:
+                k = m % 10
+                if f == 5:
+                    k = (10 - k) % 10
+                both = ((both << (6 * k)) | (both >> (60 - 6 * k))) & full
+            a_mag, x_mag = both >> 30, both & MAG
+        else:
+            raise MixError(f"invalid shift field {f}")
+        self.a = (self.a & SIGN) | a_mag
+        self.x = (self.x & SIGN) | x_mag
+
+    def _num(self):
+        digits = ""
+        for w in (self.a, self.x):
+            for k in range(5):
+                digits += str(((w >> (6 * (4 - k))) & 63) % 10)
+        self.a = (self.a & SIGN) | (int(digits) % (WORD_MAX + 1))
+
+    def _char(self):
+        s = f"{self.a & MAG:010d}"
+        a = x = 0
+        for ch in s[:5]:
+            a = (a << 6) | (30 + int(ch))
+        for ch in s[5:]:
+            x = (x << 6) | (30 + int(ch))
+        self.a = (self.a & SIGN) | a
+        self.x = (self.x & SIGN) | x
+
+
+def run_mixal(text: str, max_steps: int = 10_000_000) -> MixMachine:
+    """Συμβολομετάφραση + εκτέλεση μέχρι HLT. Επιστρέφει τη μηχανή (rA, rX, μνήμη, cycles)."""
+    return MixMachine.from_mixal(text).run(max_steps=max_steps)
+
+
+def format_cycles(stats: Dict) -> List[str]:
+    """Η γραμμή "simulated cycles" των αναφορών των περασμάτων (cycles_before/after ή simulation)."""
+    if stats.get("cycles_before") is not None:
+        return [f"{'simulated cycles':<18}{stats['cycles_before']} -> {stats['cycles_after']} "
+                f"({stats['cycles_before'] - stats['cycles_after']} saved)"]
+    if stats.get("simulation"):
+        return [f"{'simulated cycles':<18}not measured ({stats['simulation']})"]
+    return []
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Run a MIXAL program on the built-in MIX simulator")
+    ap.add_argument("file", help="MIXAL source (e.g. output/main.mixal)")
+    ap.add_argument("--max-steps", type=int, default=10_000_000)
+    ap.add_argument("--profile", action="store_true", help="print per-line execution counts")
+    args = ap.parse_args(argv)
+
+    with open(args.file, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        vm = run_mixal(text, max_steps=args.max_steps)
+    except MixError as exc:
+        print(f"MIX error: {exc}", file=sys.stderr)
+        return 1
+    print(f"rA = {vm.rA}")
+    print(f"rX = {vm.rX}")
+    print(f"rI = {[vm.rI(k) for k in range(1, 7)]}")
+    print(f"overflow = {vm.overflow}")
+    print(f"steps = {vm.steps}")
+    print(f"time = {vm.cycles}u")
+    if args.profile:
+        lines = text.splitlines()
+        for ln, n in sorted(vm.profile_by_line().items()):
+            print(f"{n:10d}  {lines[ln - 1].rstrip()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,322 @@
-from typing import Any, Dict, List, Tuple, Optional
-import hashlib
+from typing import Any, Dict, List, Set, Tuple, Optional
+import re
+from peephole import optimize as peephole_optimize
+from regalloc import plan_registers, update_delta
+from dead_code import eliminate_dead_code
+from licm import hoist_invariants
+from cse import eliminate_common_subexpressions
+from ordering import order_operands
+from ir import NEGATE, is_vreg, lower_program
+from inline import expr_size, inline_calls
+from ast_utils import always_exits, call_reach, const_value, guards_loop, names_read
+from mix_simulator import ADDR_MAX, MixError, format_cycles, run_mixal
+from ast_nodes import Node, to_tuple
+from symbol_table import SymbolTable, as_symbol_table
+
+
+# Λέξεις που δεν επιτρέπεται να γίνουν labels (opcodes / ψευδοεντολές του MIXAL)
+RESERVED_LABELS = frozenset({
+    "ADD","SUB","MUL","DIV","LDA","STA","LDX","STX","STJ","TXA","TAX",
+    "CMPA","CMPX","JE","JNE","JL","JG","JLE","JGE","JMP","JSJ","HLT","NOP",
+    "ORIG","CON","END"
+})
+
+# Εντολές που αλλάζουν τον A (για την παρακολούθηση του _track_A)
+_WRITES_A = frozenset({"LDA", "LDAN", "ENTA", "ENNA", "INCA", "DECA", "ADD", "SUB", "MUL", "DIV",
+                       "SLA", "SRA", "SLAX", "SRAX", "SLC", "SRC", "NUM", "CHAR"})
+
+LABEL_LIMIT = 10   # μέγιστο μήκος συμβόλου στο MIXAL
+GUARD_LIMIT = 8    # συνθήκη βρόχου ως τόσες εντολές: αντιγράφεται και πάνω από τον rotated βρόχο
+_B36 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def base36(n: int) -> str:
+    out = ""
+    while True:
+        n, r = divmod(n, 36)
+        out = _B36[r] + out
+        if not n:
+            return out
+
+
+def sanitize_label(s: str) -> str:
+    # Όλα κεφαλαία, μόνο γράμματα/ψηφία· αν ξεκινάει με ψηφίο (ή είναι κενό) μπαίνει μπροστά L
+    s = "".join(ch for ch in str(s).upper() if ch.isalnum())
+    if not s or s[0].isdigit():
+        s = "L" + s
+    return s
+
+
+class LabelAllocator:
+    """
+    Μοναδικά labels MIXAL (<= 10 χαρακτήρες, όχι RESERVED_LABELS).
+    claim(name):      το ίδιο το όνομα (sanitized, κομμένο στα 10) αν είναι ελεύθερο, αλλιώς numbered()
+    numbered(prefix): πρόθεμα + αύξων αριθμός σε base-36, με ΔΙΚΟ του μετρητή ανά πρόθεμα· το πρόθεμα
+                      κόβεται ώστε όλο το label να χωράει στα 10 (π.χ. MAINCOUNTE -> MAINCOUNT1 ... MAINCOUNZZ).
+    Ο μετρητής ενός προθέματος μόνο ανεβαίνει, άρα κάθε αριθμός δοκιμάζεται το πολύ μία φορά και η
+    δέσμευση είναι O(1) (amortized): ξαναδοκιμάζουμε μόνο αν το υποψήφιο ζητήθηκε ήδη αυτούσιο από
+    άλλο όνομα. Το αποτέλεσμα εξαρτάται μόνο από τη σειρά των κλήσεων (ντετερμινιστικό).
+    """
+
+    def __init__(self, reserved=RESERVED_LABELS):
+        self.reserved = reserved
+        self.used: Set[str] = set()
+        self.counters: Dict[str, int] = {}   # πρόθεμα -> επόμενος αριθμός
+        self.probes = 0                      # υποψήφια που βρέθηκαν πιασμένα
+
+    def _free(self, cand: str) -> bool:
+        return cand not in self.used and cand not in self.reserved
+
+    def claim(self, name: str) -> str:
+        base = sanitize_label(name)[:LABEL_LIMIT]
+        if self._free(base):
+            self.used.add(base)
+            return base
+        return self.numbered(base)
+
+    def numbered(self, prefix: str) -> str:
+        prefix = sanitize_label(prefix)[:LABEL_LIMIT]
+        n = self.counters.get(prefix, 1)
+        while True:
+            suffix = base36(n)
+            n += 1
+            cand = prefix[:LABEL_LIMIT - len(suffix)] + suffix
+            if self._free(cand):
+                break
+            self.probes += 1
+        self.counters[prefix] = n
+        self.used.add(cand)
+        return cand
+
+
+class TempPool:
+    """
+    Προσωρινές λέξεις (spill slots) μιας μεθόδου.
+    Κάθε slot δεσμεύεται με acquire() και επιστρέφει στο pool με release() μόλις εκδοθεί η εντολή
+    που το διαβάζει, οπότε το data section μεγαλώνει κατά το μέγιστο πλήθος ταυτόχρονα ζωντανών
+    προσωρινών και όχι κατά το πλήθος των spills. Τα slots ξαναχρησιμοποιούνται μόνο μέσα στην
+    ίδια κατηγορία ("TMP", "TMPX", "TMPDIV"), ώστε ο peephole να αναγνωρίζει ακόμη τα ζεύγη
+    STX TMPX ; LDA TMPX (κανόνας mul_low).
+    """
+
+    def __init__(self):
+        self.free: Dict[str, List[int]] = {}   # κατηγορία -> ελεύθερα slots (stack: πρώτα το μικρότερο)
+        self.size: Dict[str, int] = {}         # κατηγορία -> πόσα slots έχουν δημιουργηθεί
+        self.live = 0
+        self.requests: Dict[str, int] = {}     # κατηγορία -> πόσες φορές ζητήθηκε προσωρινή
+        self.peak: Dict[str, int] = {}         # κατηγορία -> μέγιστο πλήθος ζωντανών slots
+
+    def acquire(self, kind: str) -> int:
+        self.requests[kind] = self.requests.get(kind, 0) + 1
+        free = self.free.setdefault(kind, [])
+        if free:
+            slot = free.pop()
+        else:
+            slot = self.size[kind] = self.size.get(kind, 0) + 1
+        live = self.size[kind] - len(free)
+        self.peak[kind] = max(self.peak.get(kind, 0), live)
+        return slot
+
+    def release(self, kind: str, slot: int):
+        free = self.free[kind]
+        free.append(slot)
+        free.sort(reverse=True)
+
+    def stats(self) -> Dict[str, int]:
+        spills = self.requests.get("TMP", 0)
+        scratch = sum(1 for k in self.requests if k != "TMP")   # TMPX / TMPDIV: μία λέξη η καθεμία και πριν
+        return {"spills": spills, "legacy": spills + scratch, "pooled": self.size.get("TMP", 0) + scratch,
+                "peak": self.peak.get("TMP", 0)}
+
+
+def format_temps(stats: Dict[str, Dict[str, int]]) -> str:
+    # Πίνακας ανά μέθοδο: spills, λέξεις προσωρινών πριν (μία ανά spill) και μετά το pooling
+    rows = [f"{'method':<14}{'spills':>7}{'legacy':>8}{'pooled':>8}{'peak':>6}"]
+    tot = {"spills": 0, "legacy": 0, "pooled": 0}
+    for name, st in stats.items():
+        rows.append(f"{name:<14}{st['spills']:>7}{st['legacy']:>8}{st['pooled']:>8}{st['peak']:>6}")
+        for k in tot:
+            tot[k] += st[k]
+    rows.append(f"{'total':<14}{tot['spills']:>7}{tot['legacy']:>8}{tot['pooled']:>8}")
+    return "\n".join(rows)
+
+
+def find_tail_calls(methods, entry: str, reg_plan: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]:
+    """
+    Πριν από την παραγωγή κώδικα: ποια `return f(...);` γίνονται tail calls.
+      - "self":  αναδρομική κλήση της ίδιας μεθόδου -> βρόχος,
+      - "other": κλήση μεθόδου από την οποία ξαναφτάνουμε στον καλούντα (αμοιβαία αναδρομή): το κανονικό
+                 STJ θα έγραφε πάνω στο RET που είναι ακόμη σε χρήση,
+      - "plain": κλήση σε μη αναδρομικό callee, μόνο όταν ο καλών σώζει index registers γύρω της
+                 (reg_plan[μέθοδος]["saves"][callee], 4u ανά register). Χωρίς saves δεν κερδίζει: LDA/STA της
+                 διεύθυνσης επιστροφής + JMP (5u) αντί για JMP + STJ + το JMP 0 του callee πίσω σε εμάς (4u),
+                 συν ένα JMP RET (1u) που ο peephole σβήνει όταν το return είναι το τελευταίο statement.
+    Η entry δεν συμμετέχει: δεν έχει RET καλούντα να δώσει, ούτε καλείται.
+    sites: {(μέθοδος, callee)}, targets: μέθοδοι που χρειάζονται label μετά το prologue.
+    """
+    reach = call_reach(methods)
+    stats: Dict[str, Any] = {"self": 0, "other": 0, "plain": 0, "functions": [], "sites": set(), "targets": set()}
+
+    def walk(name, s):
+        if not s:
+            return
+        tag = s[0]
+        if tag == 'return_stmt':
+            e = s[1]
+            if not (isinstance(e, tuple) and e and e[0] == 'call'):
+                return
+            callee = e[1]
+            if callee == name:
+                kind = "self"
+            elif name == entry or callee == entry:
+                return
+            elif name in reach.get(callee, ()):
+                kind = "other"
+            elif (reg_plan or {}).get(name, {}).get("saves", {}).get(callee):
+                kind = "plain"
+            else:
+                return
+            stats[kind] += 1
+            stats["sites"].add((name, callee))
+            stats["targets"].add(callee)
+            if name not in stats["functions"]:
+                stats["functions"].append(name)
+        elif tag == 'if_stmt':
+            walk(name, s[2])
+            walk(name, s[3])
+        elif tag == 'while_stmt':
+            walk(name, s[2])
+        elif tag == 'block':
+            for x in s[1]:
+                walk(name, x)
+
+    for m in methods:
+        if m and m[0] == 'method':
+            for s in m[4][2]:
+                walk(m[2], s)
+    return stats
+
+
+def format_tail_calls(stats: Dict[str, Any]) -> str:
+    rows = [
+        f"{'self (-> loop)':<18}{stats['self']}",
+        f"{'mutual recursion':<18}{stats['other']}",
+        f"{'other callees':<18}{stats['plain']}",
+        f"{'in functions':<18}{', '.join(stats['functions']) or '-'}",
+    ]
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
+
+
+def _is_empty(s) -> bool:
+    # statement χωρίς κώδικα: λείπει, `;` ή block μόνο με τέτοια
+    return not s or s[0] == 'empty_stmt' or (s[0] == 'block' and all(_is_empty(x) for x in s[1]))
+
+
+def _is_break(s) -> bool:
+    # `break;` ή block που περιέχει μόνο αυτό
+    if s and s[0] == 'block':
+        return len(s[1]) == 1 and _is_break(s[1][0])
+    return bool(s) and s[0] == 'break_stmt'
+
+
+def format_immediates(stats: Dict[str, Any]) -> str:
+    ops: Dict[str, int] = {}
+    values: Set[int] = set()
+    for st in stats.get("methods", {}).values():
+        for op, n in st["ops"].items():
+            ops[op] = ops.get(op, 0) + n
+        values.update(st["values"])
+    rows = [
+        f"{'immediate ops':<18}" + (", ".join(f"{op} {n}" for op, n in sorted(ops.items())) or "-"),
+        f"{'constants':<18}{len(values)} distinct values in the address field",
+    ]
+    if stats.get("data_before") is not None:
+        rows.append(f"{'data words':<18}{stats['data_before']} -> {stats['data_after']} "
+                    f"({stats['data_before'] - stats['data_after']} saved)")
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
+
+
+def format_moves(stats: Dict[str, Any]) -> str:
+    tot = {"mul": 0, "div": 0, "loads": 0}
+    for st in stats.get("methods", {}).values():
+        for k in tot:
+            tot[k] += st.get(k, 0)
+    rows = [
+        f"{'MUL low (SLAX)':<18}{tot['mul']}",
+        f"{'DIV setup':<18}{tot['div']} (SRAX / ENTA 0 ; ENTX)",
+        f"{'loads skipped':<18}{tot['loads']} (rA already held the word)",
+    ]
+    if stats.get("data_before") is not None:
+        rows.append(f"{'code words':<18}{stats['code_before']} -> {stats['code_after']}")
+        rows.append(f"{'data words':<18}{stats['data_before']} -> {stats['data_after']}")
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
+
+
+def format_layout(stats: Dict[str, Dict[str, int]]) -> str:
+    tot = {"loops": 0, "jumps": 0, "labels": 0}
+    for st in stats.get("methods", {}).values():
+        for k in tot:
+            tot[k] += st.get(k, 0)
+    rows = [
+        f"{'rotated loops':<18}{tot['loops']}",
+        f"{'jumps not emitted':<18}{tot['jumps']}",
+        f"{'labels w/o NOP':<18}{tot['labels']}",
+    ]
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
+
 
 class MixalGenerator:
-    def __init__(self, symbol_table: Optional[Dict]=None, entry: str="main"):
-        self.symbol_table = symbol_table or {} #Φορτώση πίνακα συμβόλων. Αν δεν δοθεί, βάλε κενό dict.
+    def __init__(self, symbol_table: Optional[SymbolTable]=None, entry: str="main", cache=None, peephole: bool=True,
+                 regalloc: bool=True, dce: bool=True, inline: bool=True, tco: bool=True, layout: bool=True,
+                 licm: bool=True, cse: bool=True, ir: bool=False, immediate: bool=True, regmoves: bool=True,
+                 order: bool=True, measure: bool=False):
+        self.symbol_table = as_symbol_table(symbol_table) #Φορτώση πίνακα συμβόλων (SymbolTable, ή dict της παλιάς μορφής). Αν δεν δοθεί, κενός.
         self.entry = entry #σημείο εκκίνησης προγραμματος
+        self.cache = cache #προαιρετικό CompileCache (compile_cache.py): επαναχρησιμοποίηση κώδικα ανά μέθοδο
+        self._recording: Optional[Dict] = None # καταγραφή allocations της μεθόδου που παράγεται (για το cache)
+        self.peephole = peephole #peephole optimizer (peephole.py) πάνω στο self.code πριν το render
+        self.peephole_stats: Dict[str, Dict[str, int]] = {} # ανά κανόνα: hits / removed / cycles
+        self.regalloc = regalloc #τοπικές μεταβλητές σε index registers rI1..rI6 (regalloc.py)
+        self.reg_plan: Dict[str, Dict] = {} # μέθοδος -> {"regs": {var: i}, "saves": {callee: [i, ...]}}
+        self.call_reach: Dict[str, Set[str]] = {} # μέθοδος -> ό,τι μπορεί να καλέσει (μεταβατικά)
+        self.dce = dce #απαλοιφή νεκρού κώδικα / μεθόδων που δεν καλούνται από την entry (dead_code.py)
+        self.dce_stats: Dict[str, Any] = {} # statements / μέθοδοι που αφαιρέθηκαν, λέξεις code/data πριν -> μετά
+        self.inline = inline #inlining μικρών φύλλων στα σημεία κλήσης (inline.py)
+        self.inline_stats: Dict[str, Any] = {} # κλήσεις που έγιναν inline, εκτίμηση και προσομοίωση κύκλων
+        self.licm = licm #μετακίνηση αμετάβλητων εκφράσεων πριν από τους βρόχους (licm.py)
+        self.licm_stats: Dict[str, Any] = {} # ανά βρόχο: εκφράσεις/πράξεις που μετακινήθηκαν (+ προσομοίωση κύκλων)
+        self.cse = cse #επαναχρησιμοποίηση κοινών υπο-εκφράσεων σε ευθύγραμμο κώδικα (cse.py)
+        self.cse_stats: Dict[str, Any] = {} # εκφράσεις που αντικαταστάθηκαν, πράξεις που γλιτώσαμε ανά μέθοδο
+        self.order = order #βαρύτερος τελεστέος πρώτα, αντιμεταθέσεις / κατοπτρικές συγκρίσεις (ordering.py)
+        self.order_stats: Dict[str, Any] = {} # αντιμεταθέσεις, need και spills ανά μέθοδο
+        self.ir = ir #επιλογή εντολών από το IR τριών διευθύνσεων (ir.py) αντί για απευθείας από το AST
+        self.ir_stats: Dict[str, Any] = {"methods": {}} # μέθοδος -> MethodIR (+ προσομοίωση κύκλων)
+        self.ir_acc: Optional[str] = None   # vreg που έχει τώρα ο A (επιλογή από IR)
+        self.ir_home: Dict[str, str] = {}   # vreg -> προσωρινή λέξη όπου γράφτηκε (spill)
+        self.ir_uses: Dict[str, int] = {}   # vreg -> αναγνώσεις που απομένουν
+        self.ir_labels: Dict[int, str] = {} # block -> label (μόνο για blocks που είναι στόχοι αλμάτων)
+        self.immediate = immediate #σταθερές στο πεδίο διεύθυνσης (ENTA/INCA/DECA, JAZ...) αντί για λέξεις K του pool
+        self.imm_stats: Dict[str, Any] = {"methods": {}} # μέθοδος -> {"ops": {op: n}, "values": [...]} (+ λέξεις data, κύκλοι)
+        self.regmoves = regmoves #SLAX/SRAX αντί για TMPX/TMPDIV και καμία LDA λέξης που ο A έχει ήδη (βλ. _track_A)
+        self.move_stats: Dict[str, Any] = {"methods": {}} # μέθοδος -> {"mul", "div", "loads"} (+ λέξεις, κύκλοι)
+        self.a_holds: Optional[str] = None # λέξη μνήμης με την ίδια τιμή που έχει τώρα ο A
+        self.tco = tco #tail calls χωρίς νέο STJ: αναδρομή σε βρόχο, κλήση άλλης μεθόδου με το RET του καλούντα
+        self.tail_stats: Dict[str, Any] = {"self": 0, "other": 0, "plain": 0, "functions": [], "sites": set(),
+                                           "targets": set()}
+        self.layout = layout #διάταξη ροής: βρόχοι με έλεγχο στο τέλος, χωρίς JMP πριν από κενό else, labels πάνω σε εντολές
+        self.layout_stats: Dict[str, Any] = {"methods": {}} # μέθοδος -> {"loops", "jumps", "labels"} (+ προσομοίωση κύκλων)
+        self.pending_labels: List[str] = []   # labels που περιμένουν την επόμενη εντολή (layout)
+        self.label_alias: Dict[str, str] = {} # label χωρίς δική του εντολή -> label της εντολής όπου κατέληξε
+        self._final_run: Any = None # MixMachine (ή MixError) της προσομοίωσης του τελικού κώδικα
+        self.measure = measure # --report-cycles: ξαναμεταγλώττιση χωρίς κάθε pass και προσομοίωση και των δύο (αργό, μόνο αν ζητηθεί)
+        self.regs: Dict[str, int] = {}      # var -> index register στην τρέχουσα μέθοδο
+        self.temps = TempPool()             # προσωρινές λέξεις της τρέχουσας μεθόδου
+        self.temp_label: Dict[str, Tuple[str, int]] = {} # label προσωρινής -> (κατηγορία, slot)
+        self.temp_stats: Dict[str, Dict[str, int]] = {}  # μέθοδος -> TempPool.stats()
         self.code: List[Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]] = [] #λίστα με tuples με (label, opcode, operand, comment) είτε sting είτε None
         self.data: List[Tuple[str, str, str, str]] = [] # λίστα με Tuple με (label, opcode, value, comment) 
 
@@ -13,51 +325,27 @@ class MixalGenerator:
         self.var_addr: Dict[str, str] = {}          # fully-qualified όνομα var (π.χ. "main_x" και add2_x) -> μοναδικό label στη data για να ξεχωριζω 
         self.func_label: Dict[str, str] = {}        # όνομα συνάρτησης -> μοναδικό label εισόδου (για κλήση με JMP) π.χ "main" -> "MAIN"
         self.ret_label: Dict[str, str] = {}         # όνομα συνάρτησης -> μοναδικό label επιστροφής (STJ ... / JMP 0)
+        self.body_label: Dict[str, str] = {}        # όνομα συνάρτησης -> label μετά το STJ (στόχος των tail calls)
 
-        self.labels = 0 #μετρητής label για να αυξανω value 
         self.current_method: Optional[str] = None # ποια μεθδοδο παραγω τωρα χρειαζεται για να ξερω σε ποιο scope γραφω
         self.loop_end_stack: List[str] = []   # Στοίβα με labels "τέλους while" ώστε το 'break' να κάνει JMP στο σωστό τέλος, σε εμφωλευμένα loops (push στο enter, pop στο exit του while).
 
-        # κραταω τα labels που εχουν ψρησιμοποιηθει και επισης μηκος <=10 και αν χρειαστει χρησιμοποιω τη uniquify να προσθετει suffix αν βρει δεσμευμενη λεξη
-        self.used_labels: set[str] = set()
-
-        #Ωστε να μην χρησιμοποιηθουν αυτες οι δευσμενευμενς λεξεις για labels(χρησιμοποιειται στη μεθοδο _uniquify)
-        self.RESERVED = {
-            "ADD","SUB","MUL","DIV","LDA","STA","LDX","STX","STJ","TXA","TAX",
-            "CMPA","CMPX","JE","JNE","JL","JG","JLE","JGE","JMP","JSJ","HLT","NOP",
-            "ORIG","CON","END"
-        }
+        # Όλα τα labels περνούν από τον LabelAllocator: μήκος <=10, όχι δεσμευμένες λέξεις (RESERVED_LABELS), όχι διπλά
+        self.label_alloc = LabelAllocator()
+        self.used_labels: Set[str] = self.label_alloc.used
+        self.start_label: Optional[str] = None  # label εκκίνησης για την END
 
     # --------------- label helpers ---------------
-    '''
-    Καθορίζει ένα προτεινόμενο όνομα Label οπου θα ειναι ολα κεφαλαια(ρίχνει οτι δεν εινια γραμμα ή ψηφιο)
-    Αν ξεκιναει με ψηφιο πρόσθεσε μπροστα το γραμμα L.
-    Δεν εγκυαται μοναδικοτητα (αυτο γινεται στη _uniquify)
-    '''
     def _sanitize_label(self, s: str) -> str:
-        s = "".join(ch for ch in str(s).upper() if ch.isalnum())
-        if not s or s[0].isdigit():
-            s = "L" + s
-        return s
+        # Προτεινόμενο όνομα label (βλ. sanitize_label)· δεν εγγυάται μοναδικότητα (αυτο γινεται στη _uniquify)
+        return sanitize_label(s)
 
     def _uniquify(self, base: str) -> str:
         """
         Κάνει το label μοναδικό, με όριο 10 χαρακτήρων του MIXAL.
-        Αν υπάρχει σύγκρουση (ή RESERVED), προσθέτει μικρό hex suffix ('1', '2', ..., 'A', ...) κρατοντας το <=10.
+        Αν υπάρχει σύγκρουση (ή RESERVED), δίνει base-36 αριθμό από τον μετρητή του προθέματος (LabelAllocator).
         """
-        base = self._sanitize_label(base)
-        base = base[:10]  # αρχικό κόψιμο πρωρα 10 chars
-
-        cand = base
-        i = 1
-        while cand in self.used_labels or cand in self.RESERVED or not cand:
-            # Μικρό hex suffix 
-            suf = f"{i:X}"[-2:]  # 1–2 hex chars
-            keep = max(1, 10 - len(suf))
-            cand = (base[:keep] + suf)[:10]
-            i += 1
-        self.used_labels.add(cand)
-        return cand
+        return self.label_alloc.claim(base)
 
     def _get_func_label(self, name: str) -> str:
         '''
@@ -66,7 +354,7 @@ class MixalGenerator:
         '''
         if name not in self.func_label:
             self.func_label[name] = self._uniquify(name)
-        return self.func_label[name]
+        return self._record("func", name, self.func_label[name])
 
     def _get_ret_label(self, func_name: str) -> str:
         '''
@@ -77,18 +365,23 @@ class MixalGenerator:
         '''
         if func_name not in self.ret_label:
             self.ret_label[func_name] = self._uniquify(f"RET_{func_name}")
-        return self.ret_label[func_name]
+        return self._record("ret", func_name, self.ret_label[func_name])
+
+    def _get_body_label(self, func_name: str) -> str:
+        # Label ακριβώς μετά το prologue της func_name: ένα tail call πηδάει εδώ και το RET μένει όπως είναι
+        if func_name not in self.body_label:
+            self.body_label[func_name] = self._uniquify(f"TOP_{func_name}")
+        return self._record("body", func_name, self.body_label[func_name])
 
     # ---------------- low-level emit ----------------
     def _new_label(self, prefix="L"):
         '''
         Δημιουργεί νέο μοναδικό label με μετρητή.
         prefix: προθεματικό (π.χ. 'L', 'IF', 'ELSE', 'WH' κ.λπ.)
-        self.labels: αυξάνεται για κάθε νέο label (L0001, L0002, ...)
-        _uniquify: διασφαλίζει τους κανόνες MIXAL (<=10 chars, όχι reserved, όχι διπλό)
+        Ο αριθμός είναι ανά prefix, σε base-36 (WH1, WH2, ..., WHZ, WH10, ...)
+        LabelAllocator.numbered: διασφαλίζει τους κανόνες MIXAL (<=10 chars, όχι reserved, όχι διπλό)
         '''
-        self.labels += 1
-        return self._uniquify(f"{prefix}{self.labels:04d}")
+        return self._record("new", prefix, self.label_alloc.numbered(prefix))
 
     def _emit(self, lab, op, operand="", comment=""):
         '''
@@ -97,13 +390,74 @@ class MixalGenerator:
         Αποθηκεύει την τετράδα (lab, op, operand, comment) στον ενδιάμεσο buffer self.code
         χωρίς να κάνει formatting(γινεται στο render).
         '''
+        if self.pending_labels:
+            lab = self._attach_labels(lab)
+        if self.regmoves and self._track_A(lab, op or "", operand or ""):
+            return                                # LDA λέξης που ο A έχει ήδη
         self.code.append((lab, op or "", operand or "", comment or ""))
 
+    def _track_A(self, lab, op: str, operand: str) -> bool:
+        '''
+        Ενημερώνει το self.a_holds (ποια λέξη έχει την τιμή του A) για την εντολή που εκδίδεται.
+        Επιστρέφει True για LDA που δεν χρειάζεται (π.χ. "STA X ; ... ; LDA X" χωρίς αλλαγή του A ή του X).
+        Label (στόχος άλματος) ή κλήση / JMP: ο A μπορεί να έρχεται από αλλού -> άγνωστο.
+        '''
+        if lab:
+            self.a_holds = None
+        base = operand.split("(")[0]
+        if op == "LDA" and operand == self.a_holds and not lab:
+            self._count_move("loads")
+            return True
+        if op in ("LDA", "STA") and "(" not in operand and "," not in operand:
+            self.a_holds = operand                # μετά από LDA / STA ο A και η λέξη έχουν την ίδια τιμή
+        elif op.startswith("ST"):
+            if base == self.a_holds:              # η λέξη άλλαξε από άλλον καταχωρητή (ή μόνο μέρος της)
+                self.a_holds = None
+        elif op in _WRITES_A or op == "JMP":
+            self.a_holds = None
+        return False
+
     def _label(self, lab):
-        # Ποτέ «γυμνό» label: βάλε NOP ώστε να υπάρχει operator
+        # Ποτέ «γυμνό» label: χωρίς layout βάλε NOP ώστε να υπάρχει operator,
+        # με layout το label περιμένει και μπαίνει στην επόμενη εντολή (_attach_labels)
         # lab εδώ θεωρείται ΗΔΗ μοναδικό (φροντίδα από _uniquify / δημιουργούς του lab)
+        if self.layout:
+            self.pending_labels.append(lab)
+            return
         self._emit(lab, "NOP", "", "label")
 
+    def _attach_labels(self, lab: Optional[str]) -> str:
+        # Τα labels σε αναμονή πάνε στην εντολή που εκδίδεται: το πρώτο γίνεται label της (αν δεν έχει
+        # δικό της) και τα υπόλοιπα aliases του, που αντικαθίστανται στις αναφορές στο τέλος της μεθόδου.
+        # Labels που αναφέρονται από άλλες μεθόδους (είσοδος, TOP_) δεν γίνονται aliases: κρατούν NOP.
+        pending, self.pending_labels = self.pending_labels, []
+        if lab is None:
+            lab = pending.pop(0)
+            self._count_layout("labels")
+        for p in pending:
+            if p in self.func_label.values() or p in self.body_label.values():
+                self.code.append((p, "NOP", "", "label"))
+            else:
+                self.label_alias[p] = lab
+                self._count_layout("labels")
+        return lab
+
+    def _resolve_aliases(self, start: int):
+        # Αναφορές σε aliases (μέσα στη μέθοδο που μόλις παράχθηκε, από self.code[start]) -> τελικό label
+        if not self.label_alias:
+            return
+        for k in range(start, len(self.code)):
+            lab, op, operand, cmt = self.code[k]
+            mt = re.match(r"[A-Z][A-Z0-9]*", operand)
+            if mt and mt.group(0) in self.label_alias:
+                self.code[k] = (lab, op, self.label_alias[mt.group(0)] + operand[mt.end():], cmt)
+        self.label_alias.clear()
+
+    def _count_layout(self, what: str):
+        counts = self.layout_stats["methods"].get(self.current_method)
+        if counts is not None:
+            counts[what] += 1
+
     def _render(self):
         #Μετατρέπει το self.code σε τελικό MIXAL κείμενο με στοίχιση στηλών.
         lines = []
@@ -130,7 +484,7 @@ class MixalGenerator:
             lab = self._uniquify(fq_name)
             self.var_addr[fq_name] = lab
             self.data.append((lab, "CON", "0", ""))  # 1 λέξη/μεταβλητή
-        return self.var_addr[fq_name]
+        return self._record("var", fq_name, self.var_addr[fq_name])
 
     def _reserve_var_for(self, varname: str):
         '''
@@ -147,10 +501,26 @@ class MixalGenerator:
         '''
         v = int(value)
         if v not in self.const_pool:
-            lab = self._uniquify(f"K{len(self.const_pool)+1:04d}")
+            lab = self.label_alloc.numbered("K")
             self.const_pool[v] = lab
             self.data.append((lab, "CON", str(v), ""))
-        return self.const_pool[v]
+        return self._record("const", v, self.const_pool[v])
+
+    def _immediate(self, op: str, value: int, comment: str = "") -> bool:
+        # op με τη σταθερά στο πεδίο διεύθυνσης (ENTA 5, INCA 5, DECA 5) αντί για λέξη του pool,
+        # όταν χωράει στα δύο bytes (|value| <= ADDR_MAX). False: ο καλών χρησιμοποιεί το _const.
+        v = int(value)
+        if not self.immediate or abs(v) > ADDR_MAX:
+            return False
+        self._emit(None, op, str(v), comment)
+        self._count_immediate(op, v)
+        return True
+
+    def _count_immediate(self, op: str, v: int):
+        per = self.imm_stats["methods"].setdefault(self.current_method, {"ops": {}, "values": []})
+        per["ops"][op] = per["ops"].get(op, 0) + 1
+        if v not in per["values"]:
+            per["values"].append(v)
 
     def _ensure_in_mem(self, expr) -> str:
         # Επέστρεψε label μνήμης που περιέχει την τιμή του expr
@@ -158,34 +528,252 @@ class MixalGenerator:
             return self._const(expr)
         if isinstance(expr, str):                       #str (ID)-> επιστρέφει label μεταβλητής τρέχοντος scope (μέσω _reserve_var_for).
             # αναγνώστης αναγνωριστικού: τρέχουσα μέθοδος
-            return self._reserve_var_for(expr)         
+            lab = self._reserve_var_for(expr)
+            r = self._reg(expr)
+            if r:                                       # μεταβλητή σε register: ενημέρωσε πρώτα τη λέξη της
+                self._emit(None, f"ST{r}", lab, f"{expr} (rI{r}) -> mem")
+            return lab
         if isinstance(expr, tuple) and expr and expr[0] == 'bool':  #('bool', v)-> όπως οι σταθερές: _const(0 ή 1).
             return self._const(int(expr[1]))
         # Αλλιώς: υπολόγισε στο A και κάνε spill σε προσωρινή
-        tmp = self._reserve_var(self._fq(f"TMP{self.labels+1}"))  # προσωρινό label, μοναδικό
+        tmp = self._temp("TMP")                                   # slot από το pool (ο καλών κάνει _release)
         self._expr_into_A(expr)                                   # A <- value(expr)
         self._emit(None, "STA", tmp, "spill")                     # [tmp] <- A
         return tmp
 
+    def _temp(self, kind: str) -> str:
+        # Προσωρινή λέξη από το pool της μεθόδου: TMP1, TMP2, ... / TMPX / TMPDIV
+        slot = self.temps.acquire(kind)
+        lab = self._reserve_var(self._fq(kind if kind != "TMP" else f"TMP{slot}"))
+        self.temp_label[lab] = (kind, slot)
+        return lab
+
+    def _release(self, lab: str):
+        # Η εντολή που διαβάζει την προσωρινή εκδόθηκε: το slot ξαναδίνεται (no-op για μη προσωρινές)
+        if lab in self.temp_label:
+            self.temps.release(*self.temp_label[lab])
+
     def _label_for(self, method: str, varname: str) -> str:
         # Επέστρεψε το ΠΡΑΓΜΑΤΙΚΟ (unique) label για var/param άλλης μεθόδου
         fq = f"{method}_{varname}"
         return self._reserve_var(fq)
 
+    # ---------------- index registers ----------------
+    def _reg(self, e) -> Optional[int]:
+        # Αριθμός index register (1..6) αν το e είναι μεταβλητή της τρέχουσας μεθόδου σε register
+        return self.regs.get(e) if isinstance(e, str) else None
+
+    def _assign_reg(self, r: int, varname: str, expr):
+        # rIr <- expr. Το regalloc εγγυάται ότι expr είναι σταθερά ή varname ± c (τιμή μέσα στο ±4095)
+        delta = update_delta(varname, expr)
+        if delta is not None:
+            self._emit(None, f"INC{r}" if delta > 0 else f"DEC{r}", str(abs(delta)), f"{varname} += {delta}")
+        else:
+            value = int(expr[1]) if isinstance(expr, tuple) else int(expr)
+            self._emit(None, f"ENT{r}", str(value), f"{varname} = {value}")
+
+    def _call_saves(self, callee: str):
+        # Registers της τρέχουσας μεθόδου που χαλάει ο callee: σώζονται στη λέξη της μεταβλητής τους
+        saves = self.reg_plan.get(self.current_method, {}).get("saves", {}).get(callee, [])
+        owner = {r: v for v, r in self.regs.items()}
+        return [(r, self._reserve_var_for(owner[r])) for r in saves]
+
+    def _pass_args(self, callee: str, actuals):
+        # Πάρε από το symbol table τα ονόματα των ΠΑΡΑΜΕΤΡΩΝ του callee, με τη σειρά τους
+        # (έτοιμος πίνακας του scope, χτίζεται μία φορά στο build_symbol_table).
+        # (Οι σημασιολογικοί έλεγχοι έχουν ήδη επιβάλει ίδιο πλήθος actuals/params.)
+        param_names = self.symbol_table.params(callee)
+
+        # Πέρασμα ορισμάτων "by name": για κάθε actual υπολόγισε την τιμή (στο A)
+        # και κάνε STA στο label της αντίστοιχης παραμέτρου του callee.
+        for i, arg in enumerate(actuals):
+            if i >= len(param_names):
+                break  # ασφαλιστική δικλείδα· κανονικά δεν συμβαίνει λόγω semantic check
+            p = param_names[i]
+            dst = self._label_for(callee, p)          # πραγματική θέση μνήμης της παραμέτρου callee.p
+            if self._reg(arg):                        # όρισμα σε index register: STi κατευθείαν
+                self._emit(None, f"ST{self._reg(arg)}", dst, f"arg -> {callee}.{p}")
+                continue
+            self._expr_into_A(arg)                    # υπολόγισε το actual_i -> A (αριστερά-πριν-δεξιά, σειριακά)
+            self._emit(None, "STA", dst, f"arg -> {callee}.{p}")  # αποθήκευσέ το στην παράμετρο
+
+    def _gen_tail_call(self, callee: str, actuals):
+        # `return callee(actuals);` χωρίς νέο STJ (δεν ξαναγυρίζουμε εδώ, άρα ούτε saves registers):
+        #   ίδια μέθοδος: τα ορίσματα γίνονται οι νέες τιμές των παραμέτρων μας και JMP μετά το prologue (βρόχος)
+        #   άλλη μέθοδος: ορίσματα στις παραμέτρους του callee, η διεύθυνση επιστροφής ΜΑΣ γράφεται στο RET
+        #   του callee και JMP μετά το STJ του· το JMP RET_callee γυρίζει κατευθείαν στον δικό μας καλούντα.
+        if callee == self.current_method:
+            self._reassign_params(callee, actuals)
+        else:
+            self._pass_args(callee, actuals)
+            self._emit(None, "LDA", f"{self._get_ret_label(self.current_method)}(0:2)", "our return addr")
+            self._emit(None, "STA", f"{self._get_ret_label(callee)}(0:2)", f"{callee} returns to our caller")
+        self._emit(None, "JMP", self._get_body_label(callee), f"tail call {callee}")
+
+    def _reassign_params(self, name: str, actuals):
+        # Ορίσματα -> παράμετροι της ΙΔΙΑΣ μεθόδου. Όπως σε κλήση, όλα τα ορίσματα πρέπει να δουν τις
+        # παλιές τιμές: όποιο γράφει παράμετρο που διαβάζει επόμενο όρισμα περνά πρώτα από προσωρινή.
+        params = self.symbol_table.params(name)
+        pending = []
+        for i, (p, arg) in enumerate(zip(params, actuals)):
+            if arg == p:
+                continue                              # f(n, ...): η παράμετρος μένει ως έχει
+            later: Set[str] = set()
+            for a in actuals[i + 1:]:
+                names_read(a, later)
+            dst = self._label_for(name, p)
+            if p in later:
+                tmp = self._temp("TMP")
+                self._expr_into_A(arg)
+                self._emit(None, "STA", tmp, f"new {name}.{p}")
+                pending.append((tmp, dst, p))
+            elif self._reg(arg):
+                self._emit(None, f"ST{self._reg(arg)}", dst, f"arg -> {name}.{p}")
+            else:
+                self._expr_into_A(arg)
+                self._emit(None, "STA", dst, f"arg -> {name}.{p}")
+        for tmp, dst, p in pending:
+            self._emit(None, "LDA", tmp, "")
+            self._release(tmp)
+            self._emit(None, "STA", dst, f"arg -> {name}.{p}")
+
+    # ---------------- compile cache (relocatable κώδικας μεθόδου) ----------------
+    def _record(self, kind: str, arg, label: str) -> str:
+        # Όσο παράγεται μέθοδος για το cache, κάθε allocation label καταγράφεται ως (kind, arg)
+        # ώστε ο κώδικας να αποθηκευτεί με αναφορές σε allocations αντί για τελικά labels.
+        rec = self._recording
+        if rec is not None:
+            key = (kind, arg)
+            if kind == "new" or key not in rec["index"]:
+                rec["index"][key] = len(rec["events"])
+                rec["events"].append([kind, arg])
+            rec["labels"].setdefault(label, rec["index"][key])
+        return label
+
+    def _cache_options(self, name: Optional[str]=None) -> Dict:
+        # Επιλογές του generator που επηρεάζουν τον κώδικα της μεθόδου (μέρος του κλειδιού του cache)
+        opts = {}
+        if self.regalloc:
+            opts["regalloc"] = self.reg_plan.get(name)  # εξαρτάται και από τους registers των callees
+        if not self.layout:
+            opts["layout"] = False
+        if not self.immediate:
+            opts["immediate"] = False
+        if not self.regmoves:
+            opts["regmoves"] = False
+        if not self.order:
+            opts["order"] = False
+        if self.tco:
+            sites = sorted(c for f, c in self.tail_stats["sites"] if f == name)
+            opts["tco"] = [name in self.tail_stats["targets"], sites]   # label μετά το prologue / tail calls
+        if self.layout or self.ir:
+            opts["recursive"] = sorted(self._recursive_callees(name))  # βλ. guards_loop
+        if self.ir:
+            opts["ir"] = True
+        return opts
+
+    def _recursive_callees(self, name: Optional[str]) -> Set[str]:
+        # callees από τους οποίους ξαναφτάνουμε στη μέθοδο (μπορούν να γράψουν τις στατικές λέξεις της)
+        return {f for f in self.call_reach.get(name, ()) if name in self.call_reach.get(f, ())}
+
+    def _gen_method_cached(self, m):
+        key = self.cache.method_key(m, self.symbol_table, self.entry, self._cache_options(m[2]))
+        hit = self.cache.get("gen", key)
+        if hit is not None:
+            self._replay_method(m, hit)
+            return
+        start = len(self.code)
+        self._recording = {"events": [], "index": {}, "labels": {}}
+        try:
+            self._gen_method(m)
+            rec = self._recording
+        finally:
+            self._recording = None
+
+        def reloc(text):
+            # "RETMAIN(0:2)" -> ["@", <allocation>, "(0:2)"]· ό,τι δεν είναι label μεθόδου μένει ως έχει (π.χ. EXIT, 0)
+            mt = re.match(r"[A-Z][A-Z0-9]*", text or "")
+            if mt and mt.group(0) in rec["labels"]:
+                return ["@", rec["labels"][mt.group(0)], text[mt.end():]]
+            return text
+
+        code = [[reloc(lab), op, reloc(operand), cmt] for lab, op, operand, cmt in self.code[start:]]
+        self.cache.put("gen", key, {"events": rec["events"], "code": code, "temps": self.temp_stats[m[2]],
+                                    "layout": self.layout_stats["methods"].get(m[2]),
+                                    "immediates": self.imm_stats["methods"].get(m[2]),
+                                    "moves": self.move_stats["methods"].get(m[2])})
+
+    def _replay_method(self, m, entry):
+        # Ξαναπαίζει τα allocations με την ίδια σειρά (ίδιο layout data/labels) και αντικαθιστά τις αναφορές
+        self.current_method = m[2]
+        alloc = {
+            "func": self._get_func_label,
+            "ret": self._get_ret_label,
+            "body": self._get_body_label,
+            "new": self._new_label,
+            "var": self._reserve_var,
+            "const": self._const,
+        }
+        labels = [alloc[kind](arg) for kind, arg in entry["events"]]
+
+        def unreloc(x):
+            return labels[x[1]] + x[2] if isinstance(x, list) else x
+
+        for lab, op, operand, cmt in entry["code"]:
+            self.code.append((unreloc(lab) or None, op, unreloc(operand), cmt))
+        self.temp_stats[m[2]] = entry["temps"]
+        if entry.get("layout") is not None:
+            self.layout_stats["methods"][m[2]] = entry["layout"]
+        if entry.get("immediates") is not None:
+            self.imm_stats["methods"][m[2]] = entry["immediates"]
+        if entry.get("moves") is not None:
+            self.move_stats["methods"][m[2]] = entry["moves"]
+        self.a_holds = None
+
     # ---------------- public ----------------
     def gen_program(self, ast_program) -> str:
+        if isinstance(ast_program, Node):
+            ast_program = to_tuple(ast_program) # AST από ast_nodes: ο generator δουλεύει ακόμη με την κλασική μορφή
         # Header (κομματι του code)
         self._emit(None, "ORIG", "2000", "code")  # Θέτουμε την αρχική διεύθυνση του ΚΩΔΙΚΑ. Συμβατικά 2000 (θα μπορούσε να είναι άλλη),
-        self._label(self._uniquify("START"))      # Δημιουργούμε ένα σταθερό entry anchor.
+        self.start_label = self._uniquify("START")
+        self._label(self.start_label)             # Δημιουργούμε ένα σταθερό entry anchor.
         self._emit(None, "JMP", self._get_func_label(self.entry), "jump to entry")   #Jump στην είσοδο της συνάρτησης entry ('main').
 
+        # Νεκρός κώδικας: κλάδεμα statements και μεθόδων πριν από το regalloc (ο γράφος κλήσεων ξεκινά από την entry)
+        original = ast_program
+        if self.inline:
+            ast_program, self.inline_stats = inline_calls(ast_program, self.entry) # πριν το dce: φύλλα που δεν καλούνται πια φεύγουν
+        inlined = ast_program
+        if self.dce:
+            ast_program, self.dce_stats = eliminate_dead_code(ast_program, self.entry)
+        if self.licm:
+            ast_program, self.licm_stats = hoist_invariants(ast_program, self.symbol_table, self.entry)
+        if self.cse:
+            ast_program, self.cse_stats = eliminate_common_subexpressions(ast_program, self.symbol_table, self.entry)
+
         # Methods
         methods = ast_program[1] if (ast_program and ast_program[0] == 'program') else [] # Παίρνουμε από το AST τη λίστα μεθόδων: ('program', [method, method, ...])
+        self.call_reach = call_reach(methods)
+        if self.order:                      # μετά το call_reach: μια κλήση που ξαναφτάνει στη μέθοδο κρατά τη σειρά
+            ast_program, self.order_stats = order_operands(ast_program, self.symbol_table, self.call_reach, self.entry)
+            methods = ast_program[1]
+        if self.regalloc and not self.ir:   # το IR δεν έχει ακόμη index registers
+            self.reg_plan = plan_registers(ast_program, self.symbol_table) # πριν από τις μεθόδους: οι callers χρειάζονται τους registers των callees
+        if self.tco:                        # μετά το regalloc: τα saves γύρω από μια κλήση κρίνουν τα "plain" tail calls
+            self.tail_stats = find_tail_calls(methods, self.entry, self.reg_plan)
+        if self.ir:
+            self.ir_stats["methods"] = lower_program(ast_program, self.symbol_table, self.entry,
+                                                     self.tail_stats["sites"], self.call_reach)
         for m in methods:
             if m and m[0] == 'method':
-                self._gen_method(m)
+                if self.cache is not None:
+                    self._gen_method_cached(m)
+                else:
+                    self._gen_method(m)
 
         # Exit
+        self.current_method = None
         self._label(self._uniquify("EXIT")) # Σημείο τερματισμού προγράμματος
         self._emit(None, "HLT", "", "program end")
 
@@ -194,14 +782,110 @@ class MixalGenerator:
         self.code.extend(self.data)
 
         # Footer
-        self._emit(None, "END", list(self.used_labels)[0] if "START" not in self.used_labels else "START", "") # Η END ζητά label εκκίνησης για τον assembler (entry point).
-        return self._render() # Τελικό render σε string για στοίχιση στηλών.
+        self._emit(None, "END", self.start_label, "") # Η END ζητά label εκκίνησης για τον assembler (entry point).
+
+        # Peephole πάνω σε ολόκληρο το πρόγραμμα (μετά το linking των μεθόδων, ώστε να βλέπει και το data section)
+        if self.peephole:
+            self.code, self.peephole_stats = peephole_optimize(self.code)
+        text = self._render() # Τελικό render σε string για στοίχιση στηλών.
+        if self.measure and self.dce:
+            self._measure_dce(inlined)
+        if self.measure and self.inline and self.inline_stats["sites"]:
+            self._measure_cycles(self.inline_stats, original, text, inline=False)
+        if self.measure and self.licm and self.licm_stats["per_loop"]:
+            self._measure_cycles(self.licm_stats, original, text, licm=False)
+        if self.measure and self.cse and self.cse_stats["exprs"]:
+            self._measure_cycles(self.cse_stats, original, text, cse=False)
+        if self.measure and self.order and self.order_stats["methods"]:
+            self._measure_order(original, text)
+        if self.measure and self.tco and self.tail_stats["sites"]:
+            self._measure_cycles(self.tail_stats, original, text, tco=False)
+        if self.measure and self.layout and any(sum(c.values()) for c in self.layout_stats["methods"].values()):
+            self._measure_cycles(self.layout_stats, original, text, layout=False)
+        if self.measure and self.ir:
+            self._measure_cycles(self.ir_stats, original, text, ir=False)
+        if self.measure and self.immediate and self.imm_stats["methods"]:
+            self._measure_cycles(self.imm_stats, original, text, words=True, immediate=False)
+        if self.measure and self.regmoves and self.move_stats["methods"]:
+            self._measure_cycles(self.move_stats, original, text, words=True, regmoves=False)
+        return text
+
+    def words(self) -> Tuple[int, int]:
+        # (λέξεις κώδικα, λέξεις δεδομένων) του προγράμματος: εντολές πριν από το ORIG του data, CON μετά
+        code = data = 0
+        for _, op, _, _ in self.code:
+            if op == "CON":
+                data += 1
+            elif op not in ("ORIG", "END", "EQU", ""):
+                code += 1
+        return code, data
+
+    def _measure_dce(self, original):
+        # Πόσες λέξεις έγλιτωσε το dce: σύγκριση με το ίδιο πρόγραμμα χωρίς dce (μόνο αν κόπηκε κάτι)
+        after = self.words()
+        before = after
+        if self.dce_stats["statements"] or self.dce_stats["methods"]:
+            base = self._baseline(dce=False, inline=False)   # το AST έχει ήδη περάσει από το inlining
+            base.gen_program(original)
+            before = base.words()
+        self.dce_stats.update(code_before=before[0], code_after=after[0], data_before=before[1], data_after=after[1])
+
+    def _measure_order(self, original, text: str):
+        # Spills ανά μέθοδο (TempPool) και κύκλοι με και χωρίς την αναδιάταξη των τελεστέων
+        base = self._baseline(order=False)
+        base.gen_program(original)
+        for name, per in self.order_stats["methods"].items():
+            per["spills_before"] = base.temp_stats.get(name, {}).get("spills", 0)
+            per["spills_after"] = self.temp_stats.get(name, {}).get("spills", 0)
+        self._measure_cycles(self.order_stats, original, text, order=False)
+
+    def _measure_cycles(self, stats: Dict, original, text: str, max_steps: int = 1_000_000, words: bool = False,
+                        **changes):
+        # Κύκλοι του MIX simulator με και χωρίς ένα pass (changes, π.χ. inline=False) -> stats
+        # (words: και λέξεις code/data των δύο προγραμμάτων, όπως στο _measure_dce).
+        # Το πρόγραμμα χωρίς το pass παίρνει όριο 10x τα βήματα του δικού μας: χωρίς tail calls
+        # μια αναδρομή δεν επιστρέφει ποτέ και δεν αξίζει να την τρέξουμε ως το max_steps.
+        if self._final_run is None:          # το τελικό πρόγραμμα τρέχει μία φορά για όλα τα passes
+            try:
+                self._final_run = run_mixal(text, max_steps=max_steps)
+            except MixError as exc:
+                self._final_run = exc
+        vm = self._final_run
+        if isinstance(vm, MixError):
+            stats["simulation"] = str(vm)
+            return
+        gen = self._baseline(**changes)
+        base = gen.gen_program(original)
+        if words:
+            (code0, data0), (code1, data1) = gen.words(), self.words()
+            stats.update(code_before=code0, code_after=code1, data_before=data0, data_after=data1)
+        try:
+            before = run_mixal(base, max_steps=min(max_steps, 10 * vm.steps + 10_000)).cycles
+        except MixError as exc:
+            stats["simulation"] = f"without this pass: {exc}"
+            return
+        stats.update(cycles_before=before, cycles_after=vm.cycles)
+
+    def _baseline(self, **changes) -> "MixalGenerator":
+        # Ίδιες επιλογές (χωρίς μετρήσεις), με αλλαγμένες όσες δίνονται. Το cache είναι κοινό: οι μέθοδοι
+        # που δεν αλλάζουν χωρίς το pass (ίδιο κλειδί) έρχονται από το cache και στο baseline
+        opts = dict(peephole=self.peephole, regalloc=self.regalloc, dce=self.dce, inline=self.inline, tco=self.tco,
+                    layout=self.layout, licm=self.licm, cse=self.cse, ir=self.ir, immediate=self.immediate,
+                    regmoves=self.regmoves, order=self.order)
+        opts.update(changes)
+        return MixalGenerator(symbol_table=self.symbol_table, entry=self.entry, cache=self.cache, **opts)
 
     # ---------------- method / body ----------------
     def _gen_method(self, m):
         # ('method', type, name, params, body)
         _, ret_type, name, params, body = m  # m είναι AST node μορφής: ('method', return_type, name, params, body)
         self.current_method = name           # Κρατάμε ποια μέθοδο παράγουμε τώρα (χρήσιμο για fully-qualified labels π.χ. main_x)
+        self.regs = self.reg_plan.get(name, {}).get("regs", {}) # μεταβλητές της μεθόδου σε index registers
+        self.temps = TempPool()              # οι προσωρινές λέξεις είναι ανά μέθοδο
+        self.a_holds = None
+        start = len(self.code)
+        if self.layout:
+            self.layout_stats["methods"][name] = {"loops": 0, "jumps": 0, "labels": 0}
 
         funclab = self._get_func_label(name)# Πάρε/φτιάξε ΜΟΝΑΔΙΚΟ label για τη συνάρτηση και "πιάσ’ το" με ένα NOP
         self._label(funclab)                # ώστε ο loader/άλλες JMP να μπορούν να έρθουν εδώ.
@@ -213,27 +897,34 @@ class MixalGenerator:
         # ώστε αργότερα το "JMP RET_<name>" να επιστρέψει στον καλούντα (self-modifying jump).
         ret_lbl = self._get_ret_label(name)
         self._emit(None, "STJ", f"{ret_lbl}(0:2)", "save return addr into RET")
+        if name in self.tail_stats["targets"]:
+            self._label(self._get_body_label(name))    # tail calls έρχονται εδώ: ξανατρέχουν τα decl inits
 
         # Δεσμευσε αποθηκευτικό χώρος(data section) για όλες τις τοπικές & παραμέτρους της μεθόδου και αποκτηση μοναδικου label.
         # Αυτό δημιουργεί μοναδικά labels (π.χ. MAIN_X) και μία λέξη μνήμης για καθεμία.
         #πριν απο stmt γιατι θα χρησιμοποιηθουν
-        for entry in self.symbol_table.get(name, []):
+        for entry in self.symbol_table.scope(name).entries:
             if entry['kind'] in ('var', 'param'):
                 self._reserve_var_for(entry['name'])
 
-        # Αρχικοποιήσεις από decls στο body = ('body', decls, stmts) (int a=5, b; κ.λπ.)
-        decls = body[1]
-        self._gen_decl_inits(decls)
+        if self.ir:
+            self._gen_ir_method(self.ir_stats["methods"][name])   # decl inits και statements από το IR
+        else:
+            # Αρχικοποιήσεις από decls στο body = ('body', decls, stmts) (int a=5, b; κ.λπ.)
+            decls = body[1]
+            self._gen_decl_inits(decls)
 
-        # Statements
-        stmts = body[2]
-        for s in stmts:
-            self._gen_stmt(s)
+            # Statements
+            stmts = body[2]
+            for s in stmts:
+                self._gen_stmt(s)
 
         # --- Επιστροφή: σημείο με την "JMP 0" που έχει ήδη τροποποιηθεί από το STJ ---
         # Όταν γίνει "JMP RET_<name>" (σε return μη-main), θα εκτελεστεί αυτή η εντολή,
         # της οποίας η διεύθυνση έχει γραφτεί στο prologue, άρα θα γυρίσουμε στον καλούντα.-
         self._emit(ret_lbl, "JMP", "0", "return to caller (address was STJ-ed)")
+        self._resolve_aliases(start)
+        self.temp_stats[name] = self.temps.stats()
 
     def _gen_decl_inits(self, decls):
         # decl = ('decl', type, [(name, expr_or_None), ...])
@@ -245,13 +936,207 @@ class MixalGenerator:
                 # 1) Δέσμευση μνήμης & label για τη μεταβλητή (αν δεν υπάρχει ήδη -> CON 0 στο data)
                 self._reserve_var_for(vname)
                  # 2) Αν υπάρχει αρχικοποιητής, υπολόγισέ τον και γράψε την τιμή στη μεταβλητή
-                if expr is not None:
+                if expr is not None and self._reg(vname):
+                    self._assign_reg(self._reg(vname), vname, expr)
+                elif expr is not None:
                      # Υπολόγισε την έκφραση: το αποτέλεσμα θα βρίσκεται στον A
                     self._expr_into_A(expr) 
                     # Αποθήκευσε την τιμή του A στη διεύθυνση της μεταβλητής
                     # (ξανακαλούμε reserve για να πάρουμε σίγουρα το σωστό label)
                     self._emit(None, "STA", self._reserve_var_for(vname), f"init {vname}") 
 
+    # ---------------- επιλογή εντολών από το IR (ir.py) ----------------
+    def _gen_ir_method(self, ir):
+        # Blocks με τη σειρά του IR· άλμα σε block που ακολουθεί αμέσως παραλείπεται (fall-through),
+        # άρα labels χρειάζονται μόνο οι στόχοι των αλμάτων που μένουν.
+        order = [b.id for b in ir.blocks]
+        nxt = dict(zip(order, order[1:] + [None]))
+        self.ir_uses = {}
+        for b in ir.blocks:
+            for ins in b.instrs:
+                for x in ins.uses():
+                    if is_vreg(x):
+                        self.ir_uses[x] = self.ir_uses.get(x, 0) + 1
+        self.ir_labels = {}
+        for b in ir.blocks:
+            t = b.term
+            targets = [t.dst] if t.op == "jmp" else list(t.args[2:4]) if t.op == "cbr" else []
+            for target in targets:
+                if target != nxt[b.id] and target not in self.ir_labels:
+                    self.ir_labels[target] = self._new_label("B")
+        counts = self.layout_stats["methods"].get(self.current_method)
+        if counts is not None:
+            counts["loops"] += ir.loops
+        for b in ir.blocks:
+            if b.id in self.ir_labels:
+                self._label(self.ir_labels[b.id])
+            self.ir_acc, self.ir_home = None, {}      # τα vregs δεν ζουν πέρα από το block
+            for ins in b.instrs:
+                self._gen_ir_instr(ins, nxt[b.id])
+
+    def _ir_addr(self, x) -> str:
+        # Label μνήμης με την τιμή του τελεστέου x (vreg που είναι μόνο στο A γράφεται σε προσωρινή)
+        if isinstance(x, int):
+            return self._const(x)
+        if not is_vreg(x):
+            return self._reserve_var_for(x)
+        if x == self.ir_acc:
+            self._ir_spill()
+        return self.ir_home[x]
+
+    def _ir_spill(self):
+        # Ο A θα αλλάξει: ένα vreg του που διαβάζεται ακόμη πάει σε προσωρινή λέξη
+        v = self.ir_acc
+        if v is not None and self.ir_uses.get(v) and v not in self.ir_home:
+            self.ir_home[v] = self._temp("TMP")
+            self._emit(None, "STA", self.ir_home[v], f"spill {v}")
+
+    def _ir_load(self, x):
+        # A <- x (τίποτα αν το vreg x είναι ήδη στο A)
+        if is_vreg(x) and x == self.ir_acc:
+            return
+        self._ir_spill()
+        if not (isinstance(x, int) and self._immediate("ENTA", x, f"A={x}")):
+            self._emit(None, "LDA", self._ir_addr(x), f"A={x}")
+        self.ir_acc = x if is_vreg(x) else None
+
+    def _ir_done(self, ins):
+        # Οι αναγνώσεις της ins εκδόθηκαν: vregs στην τελευταία τους χρήση ελευθερώνουν την προσωρινή τους
+        for x in ins.uses():
+            if is_vreg(x):
+                self.ir_uses[x] -= 1
+                if not self.ir_uses[x] and x in self.ir_home:
+                    self._release(self.ir_home.pop(x))
+
+    def _ir_result(self, dst, comment: str = ""):
+        # Το αποτέλεσμα είναι στο A: vreg -> μένει εκεί, μεταβλητή -> STA
+        if is_vreg(dst):
+            self.ir_acc = dst
+        else:
+            self._emit(None, "STA", self._reserve_var_for(dst), comment or f"{dst} = expr")
+            self.ir_acc = None
+
+    def _gen_ir_instr(self, ins, next_block: Optional[int]):
+        op = ins.op
+        if op == "copy":
+            self._ir_load(ins.args[0])
+            self._ir_done(ins)
+            self._ir_result(ins.dst, f"{ins.dst} = {ins.args[0]}")
+        elif op in ("add", "sub") and isinstance(ins.args[1], int) and self.immediate and abs(ins.args[1]) <= ADDR_MAX:
+            self._ir_load(ins.args[0])
+            self._immediate("INCA" if op == "add" else "DECA", ins.args[1], repr(ins))
+            self._ir_done(ins)
+            self._ir_result(ins.dst)
+        elif op in ("add", "sub"):
+            a, b = ins.args
+            addr = self._ir_addr(b)
+            self._ir_load(a)
+            self._emit(None, "ADD" if op == "add" else "SUB", addr, repr(ins))
+            self._ir_done(ins)
+            self._ir_result(ins.dst)
+        elif op in ("mul", "muldiv"):
+            a, b = ins.args[:2]
+            div = self._ir_addr(ins.args[2]) if op == "muldiv" else None
+            addr = self._ir_addr(b)
+            self._ir_load(a)
+            self._emit(None, "MUL", addr, "A:X = L * R")
+            if div is not None:
+                self._emit(None, "DIV", div, "(A:X)/R -> A=quot, X=rem")
+                self._ir_done(ins)
+                self._ir_result(ins.dst)
+            elif not is_vreg(ins.dst):
+                self._ir_done(ins)
+                self._emit(None, "STX", self._reserve_var_for(ins.dst), f"{ins.dst} = low part in X")
+                self.ir_acc = None
+            else:
+                self._ir_done(ins)
+                self._low_into_A()
+                self.ir_acc = ins.dst
+        elif op == "div":
+            a, b = ins.args
+            addr = self._ir_addr(b)
+            if isinstance(a, int):
+                self._ir_spill()                      # ο A αλλάζει (ENTA 0)
+            if not self._literal_dividend(a):
+                self._ir_load(a)
+                self._dividend_into_AX()
+            self._emit(None, "DIV", addr, "(A:X)/R -> A=quot, X=rem")
+            self._ir_done(ins)
+            self._ir_result(ins.dst)
+        elif op == "set":
+            rel, a, b = ins.args
+            addr = self._ir_addr(b)
+            self._ir_load(a)
+            self._emit(None, "CMPA", addr, f"relop {rel}")
+            self._ir_done(ins)
+            L_true, L_end = self._new_label("T"), self._new_label("E")
+            self._emit(None, {'==': "JE", '!=': "JNE", '<': "JL", '<=': "JLE", '>': "JG", '>=': "JGE"}[rel], L_true)
+            if not self._immediate("ENTA", 0, "false -> 0"):
+                self._emit(None, "LDA", self._const(0), "false -> 0")
+            self._emit(None, "JMP", L_end)
+            self._label(L_true)
+            if not self._immediate("ENTA", 1, "true -> 1"):
+                self._emit(None, "LDA", self._const(1), "true -> 1")
+            self._label(L_end)
+            self._ir_result(ins.dst)
+        elif op == "arg":
+            callee, (i, x) = ins.dst, ins.args
+            p = self.symbol_table.params(callee)[i]
+            self._ir_load(x)
+            self._ir_done(ins)
+            self._emit(None, "STA", self._label_for(callee, p), f"arg -> {callee}.{p}")
+        elif op == "call":
+            callee = ins.args[0]
+            self._ir_spill()
+            self._emit(None, "JMP", self._get_func_label(callee), f"call {callee}")
+            self._ir_result(ins.dst)
+        elif op == "cbr":
+            self._gen_ir_branch(ins, next_block)
+        elif op == "jmp":
+            if ins.dst != next_block:
+                self._emit(None, "JMP", self.ir_labels[ins.dst])
+        elif op == "ret":
+            if ins.dst is not None:
+                self._ir_load(ins.dst)
+                self._ir_done(ins)
+            if (self.current_method or "").lower() == (self.entry or "").lower():
+                self._emit(None, "JMP", "EXIT")
+            else:
+                self._emit(None, "JMP", self._get_ret_label(self.current_method))
+        elif op == "tail":
+            callee = ins.dst
+            if callee != self.current_method:
+                self._emit(None, "LDA", f"{self._get_ret_label(self.current_method)}(0:2)", "our return addr")
+                self._emit(None, "STA", f"{self._get_ret_label(callee)}(0:2)", f"{callee} returns to our caller")
+            self._emit(None, "JMP", self._get_body_label(callee), f"tail call {callee}")
+        # "end": συνέχεια στο "RET JMP 0" που ακολουθεί το σώμα
+
+    def _gen_ir_branch(self, ins, next_block: Optional[int]):
+        # cbr op a b T F: σύγκριση με 0 κατευθείαν στον A (JAZ/JAN/..., βλ. _zero_jump), αλλιώς CMPA.
+        # Όποιος στόχος ακολουθεί αμέσως δεν θέλει άλμα (ο τελεστής αντιστρέφεται αν είναι το T).
+        rel, a, b, T, F = ins.dst, *ins.args
+        if b == 0 and self.immediate:
+            self._ir_load(a)
+            self._ir_done(ins)
+            if T == next_block:
+                self._zero_jump(NEGATE[rel], self.ir_labels[F])
+            else:
+                self._zero_jump(rel, self.ir_labels[T])
+                if F != next_block:
+                    self._emit(None, "JMP", self.ir_labels[F])
+            return
+        addr = self._ir_addr(b)
+        self._ir_load(a)
+        self._emit(None, "CMPA", addr, f"compare {rel}")
+        self._ir_done(ins)
+        jumps = {'==': "JE", '!=': "JNE", '<': "JL", '<=': "JLE", '>': "JG", '>=': "JGE"}
+        if T == next_block:
+            self._emit(None, jumps[NEGATE[rel]], self.ir_labels[F])
+        else:
+            self._emit(None, jumps[rel], self.ir_labels[T])
+            if F != next_block:
+                self._emit(None, "JMP", self.ir_labels[F])
+
     # ---------------- statements ----------------
     def _gen_stmt(self, s):
         if not s:
@@ -262,6 +1147,9 @@ class MixalGenerator:
         if tag == 'assign_stmt':
             _, assign = s                         # ('assign_stmt', ('assign', varname, expr))
             _, varname, expr = assign
+            if self._reg(varname):                # μεταβλητή σε index register: ENTi / INCi / DECi
+                self._assign_reg(self._reg(varname), varname, expr)
+                return
             self._expr_into_A(expr)               # Υπολόγισε τη δεξιά πλευρά -> αποτέλεσμα στο A
             self._emit(None, "STA",
                     self._reserve_var_for(varname),
@@ -270,6 +1158,10 @@ class MixalGenerator:
         # ---------------- return [expr];
         elif tag == 'return_stmt':
             _, expr = s
+            if (self.tco and isinstance(expr, tuple) and expr and expr[0] == 'call'
+                    and (self.current_method, expr[1]) in self.tail_stats["sites"]):
+                self._gen_tail_call(expr[1], expr[2])
+                return
             if expr is not None:
                 self._expr_into_A(expr)           # Η τιμή επιστροφής στο A (συμβατικά)
             # Αν είναι η entry (main): πήδα στο EXIT (κάνει HLT).
@@ -281,6 +1173,9 @@ class MixalGenerator:
                         self._get_ret_label(self.current_method))  # Επιστροφή στον καλούντα
 
         # ---------------- if (cond) then_stmt else else_stmt;
+        elif tag == 'if_stmt' and self.layout:
+            self._gen_if_layout(s)
+
         elif tag == 'if_stmt':
             _, cond, then_stmt, else_stmt = s
             L_else = self._new_label("ELSE")      # Πού θα πάμε αν cond == false
@@ -295,6 +1190,9 @@ class MixalGenerator:
             self._label(L_end)                    # ENDIF:
 
         # ---------------- while (cond) body;
+        elif tag == 'while_stmt' and self.layout:
+            self._gen_while_layout(s)
+
         elif tag == 'while_stmt':
             _, cond, body_stmt = s
             L_top = self._new_label("WH")         # Αρχή βρόχου
@@ -323,13 +1221,99 @@ class MixalGenerator:
 
         # ---------------- ;  (κενή εντολή)
         elif tag == 'empty_stmt':
-            self._emit(None, "NOP", "", "empty")  # Καμία ενέργεια
+            if not self.layout:                   # με layout: καμία εντολή (το label πάει στην επόμενη)
+                self._emit(None, "NOP", "", "empty")  # Καμία ενέργεια
 
         # ---------------- μελλοντικές επεκτάσεις
         else:
             self._emit(None, "NOP", "", f"TODO stmt {tag}")  # Placeholder για μη υλοποιημένα
 
 
+    def _gen_if_layout(self, s):
+        # if χωρίς περιττά άλματα: κενό else -> μόνο Jfalse ENDIF, κενό then -> Jtrue ENDIF,
+        # και όχι JMP ENDIF μετά από then που δεν πέφτει ποτέ στο επόμενο (return / break)
+        _, cond, then_stmt, else_stmt = s
+        if _is_empty(else_stmt) and _is_break(then_stmt) and self.loop_end_stack:
+            self._count_layout("jumps")           # if (c) break; -> Jtrue WEND
+            self._cond_jump(cond, self.loop_end_stack[-1], True)
+            return
+        if _is_empty(else_stmt) and guards_loop(cond, then_stmt, self._recursive_callees(self.current_method)):
+            # if (c) { t = ...; while (c) ... } (preheader του licm): το if είναι ήδη το guard του βρόχου
+            L_end = self._new_label("ENDIF")
+            self._count_layout("jumps")
+            self._cond_jump(cond, L_end, False)
+            for x in then_stmt[1][:-1]:
+                self._gen_stmt(x)
+            self._gen_while_layout(then_stmt[1][-1], entered=True)
+            self._label(L_end)
+            return
+        if _is_empty(else_stmt) or _is_empty(then_stmt):
+            L_end = self._new_label("ENDIF")
+            self._count_layout("jumps")
+            if _is_empty(else_stmt):
+                self._cond_jump(cond, L_end, False)
+                self._gen_stmt_or_block(then_stmt)
+            else:
+                self._cond_jump(cond, L_end, True)
+                self._gen_stmt_or_block(else_stmt)
+            self._label(L_end)
+            return
+        L_else = self._new_label("ELSE")
+        L_end = self._new_label("ENDIF")
+        self._cond_jump(cond, L_else, False)
+        self._gen_stmt_or_block(then_stmt)
+        if always_exits(then_stmt):
+            self._count_layout("jumps")
+        else:
+            self._emit(None, "JMP", L_end)
+        self._label(L_else)
+        self._gen_stmt_or_block(else_stmt)
+        self._label(L_end)
+
+    def _gen_while_layout(self, s, entered: bool = False):
+        # Rotated βρόχος: ο έλεγχος στο τέλος με Jtrue πίσω στην αρχή, άρα ανά επανάληψη
+        # σώμα + συνθήκη + ένα άλμα (αντί για Jfalse που δεν πηδάει + JMP WH).
+        # Μικρή συνθήκη αντιγράφεται από πάνω (guard)· μεγάλη: JMP στον έλεγχο μία φορά στην είσοδο.
+        #       cond ; Jfalse WEND          JMP  WTST
+        #   WH  body                     WH  body
+        #       cond ; Jtrue WH          WTST cond ; Jtrue WH
+        #   WEND                         WEND
+        # entered: η συνθήκη έχει ήδη ελεγχθεί λίγο πριν (βλ. guards_loop) -> ούτε guard ούτε JMP WTST
+        _, cond, body_stmt = s
+        L_end = self._new_label("WEND")
+        forever = bool(const_value(cond))     # while(1): μόνο JMP WH στο τέλος
+        if always_exits(body_stmt):
+            # Σώμα που δεν φτάνει ποτέ στο τέλος του (break / return): δεν υπάρχει δεύτερη επανάληψη, άρα
+            # ούτε rotation. Το guard είναι ο μόνος έλεγχος και χωρίς label WH ο A κρατά ό,τι φόρτωσε η
+            # συνθήκη για το σώμα (_track_A) — ο rotated βρόχος θα το ξαναφόρτωνε.
+            if not (forever or entered):
+                self._cond_jump(cond, L_end, False)
+            self.loop_end_stack.append(L_end)
+            self._gen_stmt_or_block(body_stmt)
+            self.loop_end_stack.pop()
+            self._label(L_end)
+            return
+        L_top = self._new_label("WH")
+        L_test = None
+        if not (forever or entered):
+            if expr_size(cond) <= GUARD_LIMIT:
+                self._cond_jump(cond, L_end, False)
+            else:
+                L_test = self._new_label("WTST")
+                self._emit(None, "JMP", L_test, "loop test at the bottom")
+        self._count_layout("loops")
+        self._label(L_top)
+        self.loop_end_stack.append(L_end)
+        self._gen_stmt_or_block(body_stmt)
+        self.loop_end_stack.pop()
+        if forever:
+            self._emit(None, "JMP", L_top)
+        else:
+            if L_test:
+                self._label(L_test)
+            self._cond_jump(cond, L_top, True)
+        self._label(L_end)
+
     def _gen_stmt_or_block(self, node):
         # Helper: δέχεται είτε ΜΟΝΟ statement είτε BLOCK ('block', [stmts...])
         if not node:
@@ -355,16 +1339,24 @@ class MixalGenerator:
         Σκοπός: Για χρήση σε έλεγχο ροής (if/while).
         Αν η cond είναι ΨΕΥΔΗΣ, κάνε JMP στο target_label.
         """
+        self._cond_jump(cond, target_label, False)
+
+    def _cond_jump(self, cond, target_label: str, when: bool):
+        """Jump στο target_label όταν η cond έχει την τιμή when (False: όπως _cond_jump_false)."""
         # Περίπτωση 1: Ρητή σύγκριση (relop): ('relop', op, left, right)
-        if isinstance(cond, tuple) and cond and cond[0] == 'relop':
+        if (isinstance(cond, tuple) and cond and cond[0] == 'relop' and self.immediate
+                and const_value(cond[3]) == 0 and not self._reg(cond[2])):
+            # left ? 0: κανένα CMPA με λέξη K, το άλμα ελέγχει κατευθείαν το πρόσημο του A (JAZ, JAN, ...)
+            _, op, left, _ = cond
+            self._expr_into_A(left)
+            self._zero_jump(op if when else NEGATE[op], target_label)
+
+        elif isinstance(cond, tuple) and cond and cond[0] == 'relop':
             _, op, left, right = cond
 
             # Βάλε το right σε μνήμη (αν είναι άμεσος αριθμός/έκφραση) και πάρε τη διεύθυνση
-            addrR = self._ensure_in_mem(right)
-
-            # Φόρτωσε το left στο A και σύγκρινε A ? right
-            self._expr_into_A(left)
-            self._emit(None, "CMPA", addrR, f"compare {op}")
+            # και σύγκρινε left ? right (CMPA, ή CMPi αν το left είναι σε index register)
+            op = self._compare(op, left, right, f"compare {op}")
 
             # Επιλογή JUMP όταν η συνθήκη ΔΕΝ ισχύει (false-branch)
             jfalse = {
@@ -374,27 +1366,103 @@ class MixalGenerator:
                 '<=': "JG",    # A >  R   -> false
                 '>':  "JLE",   # A <= R   -> false
                 '>=': "JL",    # A <  R   -> false
-            }[op]
+            }
+            jtrue = {'==': "JE", '!=': "JNE", '<': "JL", '<=': "JLE", '>': "JG", '>=': "JGE"}
+
+            # Αν είναι false (ή true, για when=True), πηδάμε στο target
+            self._emit(None, (jtrue if when else jfalse)[op], target_label)
 
-            # Αν είναι false, πηδάμε στο target
-            self._emit(None, jfalse, target_label)
+        elif self._reg(cond):
+            # rIi == 0 -> false
+            self._emit(None, f"J{self._reg(cond)}{'NZ' if when else 'Z'}", target_label)
 
         else:
             # Περίπτωση 2: Αυθαίρετη έκφραση: θεωρούμε 0=false, μη-0=true
             self._expr_into_A(cond)                # A = cond
+            if self.immediate:
+                self._zero_jump('!=' if when else '==', target_label)
+                return
             z = self._const(0)
             self._emit(None, "CMPA", z, "cond != 0 ?")
-            self._emit(None, "JE", target_label)   # A == 0 -> false -> πήδα
+            self._emit(None, "JNE" if when else "JE", target_label)   # A == 0 -> false
+
+    def _zero_jump(self, op: str, target_label: str):
+        # Jump όταν (A op 0): JAZ / JANZ / JAN / JANP / JAP / JANN, χωρίς CMPA με τη λέξη του 0
+        jop = {'==': "JAZ", '!=': "JANZ", '<': "JAN", '<=': "JANP", '>': "JAP", '>=': "JANN"}[op]
+        self._emit(None, jop, target_label, f"A {op} 0 ?")
+        self._count_immediate(jop, 0)
+
+    # ---------------- A / X χωρίς προσωρινές λέξεις ----------------
+    def _low_into_A(self):
+        # Μετά από MUL: A <- low λέξη του γινομένου (στο X). SLAX 5: το X μπαίνει στο A (το πρόσημο του
+        # A είναι ήδη του γινομένου), αντί για STX TMPX ; LDA TMPX.
+        if self.regmoves:
+            self._emit(None, "SLAX", "5", "A = low part (in-register)")
+            self._count_move("mul")
+            return
+        tmpx = self._temp("TMPX")  #To Χ κραταει το Low part το A το high
+        self._emit(None, "STX", tmpx, "save low part from X")  # Στο τελος παρε την τιμη απο το X και περασε την στο  A
+        self._emit(None, "LDA", tmpx, "A = low part in X")
+        self._release(tmpx)
+
+    def _dividend_into_AX(self):
+        # Πριν από DIV με μέρισμα μίας λέξης στο A: A:X = ±0:A. Το πρόσημο του A πρέπει να είναι του
+        # μερίσματος (όπως στο wide (a*b)/c), αλλιώς το -7/2 δίνει +3. SRAX 5 μεταφέρει το A στο X και
+        # κρατά το πρόσημο στο A· χωρίς regmoves: STA TMPDIV ; LDA TMPDIV(0:0) (μόνο το πρόσημο) ; LDX TMPDIV.
+        if self.regmoves:
+            self._emit(None, "SRAX", "5", "A:X = 0:dividend (in-register)")
+            self._count_move("div")
+            return
+        tmpd = self._temp("TMPDIV")
+        self._emit(None, "STA", tmpd, "save dividend")  #Α: πηλίκο
+        self._emit(None, "LDA", f"{tmpd}(0:0)", "A = ±0 (sign of the dividend) for DIV")
+        self._emit(None, "LDX", tmpd, "X=dividend low")  #Χ= υπολοιπο
+        self._release(tmpd)
+
+    def _literal_dividend(self, e) -> bool:
+        # Μέρισμα σταθερά c >= 0 που χωράει στο πεδίο διεύθυνσης: ENTA 0 ; ENTX c (τίποτα στη μνήμη)
+        v = const_value(e)
+        if not (self.regmoves and self.immediate and v is not None and 0 <= v <= ADDR_MAX):
+            return False
+        self._immediate("ENTA", 0, "A=0 for DIV")
+        self._immediate("ENTX", v, "X=dividend")
+        self._count_move("div")
+        return True
+
+    def _count_move(self, what: str):
+        per = self.move_stats["methods"].setdefault(self.current_method, {"mul": 0, "div": 0, "loads": 0})
+        per[what] += 1
+
+    def _compare(self, op, left, right, comment) -> str:
+        """
+        Θέτει το comparison indicator για (left op right) και επιστρέφει τον τελεστή που ισχύει
+        για το indicator (αντεστραμμένο αν η σύγκριση έγινε ως right ? left).
+        """
+        rl, rr = self._reg(left), self._reg(right)
+        if rl:
+            # left σε index register: CMPi απευθείας με τη μνήμη του right
+            addrR = self._ensure_in_mem(right)
+            self._emit(None, f"CMP{rl}", addrR, comment)
+            self._release(addrR)
+            return op
+        if rr and (isinstance(left, (int, str)) or (isinstance(left, tuple) and left[0] == 'bool')):
+            # right σε register και left απλό: right ? left με κατοπτρικό τελεστή
+            addrL = self._ensure_in_mem(left)
+            self._emit(None, f"CMP{rr}", addrL, comment)
+            return {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}[op]
+        addrR = self._ensure_in_mem(right)
+        self._expr_into_A(left)
+        self._emit(None, "CMPA", addrR, comment)
+        self._release(addrR)
+        return op
 
     def _relop_into_boolA(self, op, left, right):
         """
         Σκοπός: Υπολόγισε (left op right) ως τιμη και βάλε 0/1 στο A.
         Χρήσιμο όταν το αποτέλεσμα της σύγκρισης χρησιμοποιείται σε έκφραση (π.χ. x = (a<b);)
         """
-        # Προετοιμασία συγκρίσεως A ? right
-        addrR = self._ensure_in_mem(right)
-        self._expr_into_A(left)
-        self._emit(None, "CMPA", addrR, f"relop {op}")
+        # Προετοιμασία συγκρίσεως left ? right
+        op = self._compare(op, left, right, f"relop {op}")
 
         # Labels για κλασικό pattern: if true -> A=1 else A=0
         L_true = self._new_label("T")
@@ -414,12 +1482,14 @@ class MixalGenerator:
         self._emit(None, jtrue, L_true)
 
         # false-path: A = 0
-        self._emit(None, "LDA", self._const(0), "false -> 0")
+        if not self._immediate("ENTA", 0, "false -> 0"):
+            self._emit(None, "LDA", self._const(0), "false -> 0")
         self._emit(None, "JMP", L_end)
 
         # true-path: A = 1
         self._label(L_true)
-        self._emit(None, "LDA", self._const(1), "true -> 1")
+        if not self._immediate("ENTA", 1, "true -> 1"):
+            self._emit(None, "LDA", self._const(1), "true -> 1")
 
         # τέλος (συγκεντρώνει τα δύο μονοπάτια)
         self._label(L_end)
@@ -430,16 +1500,21 @@ class MixalGenerator:
         # Επιστρέφει True αν το αποτέλεσμα είναι "wide" (χρησιμοποιεί A:X), αλλιώς False.
 
         if e is None:
-            self._emit(None, "LDA", self._const(0), "nil->0")
+            if not self._immediate("ENTA", 0, "nil->0"):
+                self._emit(None, "LDA", self._const(0), "nil->0")
             return False
 
         if isinstance(e, int):
-            # Ακέραια σταθερά: φόρτωσε από constant pool (label K0001 κ.λπ.)
-            self._emit(None, "LDA", self._const(e), f"A={e}")
+            # Ακέραια σταθερά: ENTA με την τιμή στο πεδίο διεύθυνσης, αλλιώς (μεγάλη) από constant pool (K0001 κ.λπ.)
+            if not self._immediate("ENTA", e, f"A={e}"):
+                self._emit(None, "LDA", self._const(e), f"A={e}")
             return False
 
         if isinstance(e, str):
             # Αναγνωριστικό: φόρτωσε τη μεταβλητή/παράμετρο της τρέχουσας μεθόδου
+            if self._reg(e):
+                self._emit(None, "ENTA", f"0,{self._reg(e)}", f"A={e} (rI{self._reg(e)})")
+                return False
             self._emit(None, "LDA", self._reserve_var_for(e), f"A={e}")
             return False
 
@@ -448,18 +1523,31 @@ class MixalGenerator:
 
             if tag == 'bool':
                 # Boolean literal: φόρτωσε 0/1
-                self._emit(None, "LDA", self._const(int(e[1])), "A=bool")
+                if not self._immediate("ENTA", int(e[1]), "A=bool"):
+                    self._emit(None, "LDA", self._const(int(e[1])), "A=bool")
                 return False
 
             if tag == 'add':
                 # Πρόσθεση/Αφαίρεση: A = L (+|-) R
                 _, op, L, R = e
+                if self._reg(R):
+                    # R σε index register: A = L ± rIi χωρίς πρόσβαση στη μνήμη
+                    self._expr_into_A(L)
+                    self._emit(None, "INCA" if op == '+' else "DECA", f"0,{self._reg(R)}", "A=L+R" if op == '+' else "A=L-R")
+                    return False
+                rv = const_value(R)
+                if rv is not None and self.immediate and abs(rv) <= ADDR_MAX:
+                    # R σταθερά: INCA/DECA με την τιμή στο πεδίο διεύθυνσης
+                    self._expr_into_A(L)
+                    self._immediate("INCA" if op == '+' else "DECA", rv, "A=L+R" if op == '+' else "A=L-R")
+                    return False
                 addrR = self._ensure_in_mem(R)    # εξασφάλισε ότι το R έχει διεύθυνση μνήμης
                 self._expr_into_A(L)              # A = L
                 if op == '+':
                     self._emit(None, "ADD", addrR, "A=L+R")
                 else:
                     self._emit(None, "SUB", addrR, "A=L-R")
+                self._release(addrR)
                 return False                      # αποτέλεσμα στο A (όχι wide)
 
             if tag == 'mulop':
@@ -467,60 +1555,62 @@ class MixalGenerator:
                 addrR = self._ensure_in_mem(R)    # R πρέπει να είναι σε μνήμη
 
                 if op == '*':
-                    # Πολλαπλασιασμός: A:X = L * R
-                    self._expr_into_A(L, want_wide=True)     # ετοίμασε L "wide"
+                    # Πολλαπλασιασμός: A:X = L * R (το L μία λέξη στο A: ένα wide L θα έδινε στο MUL το high μέρος)
+                    self._expr_into_A(L)
                     self._emit(None, "MUL", addrR, "A:X = L * R")
+                    self._release(addrR)
                     if want_wide:
                         # Ο καλών ζήτησε wide -> κράτα A:X ως έχει
                         return True
                     else:
                         # "Συμπύκνωσε": πάρε το low μέρος από X και βάλε το στο A
-                        tmpx = self._reserve_var(self._fq("TMPX")) #To Χ κραταει το Low part το A το high 
-                        self._emit(None, "STX", tmpx, "save low part from X") # Στο τελος παρε την τιμη απο το X και περασε την στο  A
-                        self._emit(None, "LDA", tmpx, "A = low part in X")
+                        self._low_into_A()
                         return False
 
                 else:  # '/'
                     # Διαίρεση: (A:X)/R -> A=quotient, X=remainder
+                    if self._literal_dividend(L):        # A:X = 0:c χωρίς υπολογισμό στο A
+                        self._emit(None, "DIV", addrR, "(A:X)/R -> A=quot, X=rem")
+                        self._release(addrR)
+                        return False
                     wide = self._expr_into_A(L, want_wide=True)  # προσπάθησε να έχεις ήδη A:X
                     if wide:
                         # Έχουμε έγκυρο A:X -> DIV κατευθείαν
                         self._emit(None, "DIV", addrR, "(A:X)/R -> A=quot, X=rem")
+                        self._release(addrR)
                         return False
                     # Αλλιώς, "συνθέτουμε" A:X = 0:A  (βάζουμε το μέρισμα στο X)
-                    tmpd = self._reserve_var(self._fq("TMPDIV")) 
-                    self._emit(None, "STA", tmpd, "save dividend") #Α: πηλίκο
-                    self._emit(None, "LDA", self._const(0), "A=0 for DIV")
-                    self._emit(None, "LDX", tmpd, "X=dividend low") #Χ= υπολοιπο
+                    self._dividend_into_AX()
                     self._emit(None, "DIV", addrR, "(A:X)/R -> A=quot, X=rem") #x = Α (η μεταβλητη μου παινρει το πηλικο)
+                    self._release(addrR)
                     return False
 
+            if tag == 'inline':
+                # Κλήση που έγινε inline (inline.py): e = ('inline', callee, [(fresh, arg), ...], body)
+                # Τα ορίσματα γράφονται με τη σειρά τους σε νέες τοπικές λέξεις, μετά το σώμα -> A (όχι wide, όπως η κλήση)
+                _, callee, binds, body = e
+                for fresh, arg in binds:
+                    self._expr_into_A(arg)
+                    self._emit(None, "STA", self._reserve_var_for(fresh), f"arg -> {fresh} (inline {callee})")
+                self._expr_into_A(body)
+                return False
+
             if tag == 'call':
                 # Κλήση συνάρτησης ως ΕΚΦΡΑΣΗ: στο τέλος το αποτέλεσμα θα είναι στο A.
                 # e = ('call', callee, actuals)
                 _, callee, actuals = e
 
-                # Πάρε από το symbol table τα ονόματα των ΠΑΡΑΜΕΤΡΩΝ του callee, με τη σειρά τους.
-                # (Οι σημασιολογικοί έλεγχοι έχουν ήδη επιβάλει ίδιο πλήθος actuals/params.)
-                param_names = [
-                    entry['name']
-                    for entry in self.symbol_table.get(callee, [])
-                    if entry['kind'] == 'param'
-                ]
-
-                # Πέρασμα ορισμάτων "by name": για κάθε actual υπολόγισε την τιμή (στο A)
-                # και κάνε STA στο label της αντίστοιχης παραμέτρου του callee.
-                for i, arg in enumerate(actuals):
-                    if i >= len(param_names):
-                        break  # ασφαλιστική δικλείδα· κανονικά δεν συμβαίνει λόγω semantic check
-                    p = param_names[i]
-                    dst = self._label_for(callee, p)          # πραγματική θέση μνήμης της παραμέτρου callee.p
-                    self._expr_into_A(arg)                    # υπολόγισε το actual_i -> A (αριστερά-πριν-δεξιά, σειριακά)
-                    self._emit(None, "STA", dst, f"arg -> {callee}.{p}")  # αποθήκευσέ το στην παράμετρο
+                # Πέρασμα ορισμάτων στις λέξεις των παραμέτρων του callee (βλ. _pass_args)
+                self._pass_args(callee, actuals)
 
                 # Κλήση της ρουτίνας: JMP στο label εισόδου της συνάρτησης.
                 # Ο μηχανισμός επιστροφής γίνεται με STJ RET(0:2) στο prologue και JMP RET στο return.
+                saves = self._call_saves(callee)
+                for r, home in saves:
+                    self._emit(None, f"ST{r}", home, f"save rI{r}")
                 self._emit(None, "JMP", self._get_func_label(callee), f"call {callee}")
+                for r, home in saves:
+                    self._emit(None, f"LD{r}", home, f"restore rI{r}")
 
                 # Σύμβαση: η τιμή επιστροφής της συνάρτησης βρίσκεται στον A.
                 return False  # όχι wide αποτέλεσμα· ο καλών μπορεί να κάνει STA αν χρειάζεται
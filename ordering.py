@@ -0,0 +1,178 @@
+"""
+Σειρά υπολογισμού τελεστέων (Sethi–Ullman) πάνω στο AST.
+
+Ο generator (και το IR) υπολογίζει έναν δυαδικό κόμβο op(L, R) ως εξής: πρώτα εξασφαλίζει διεύθυνση
+για το R (ένα φύλλο την έχει ήδη, αλλιώς το R υπολογίζεται στο A και γίνεται spill σε TMPn), μετά
+υπολογίζει το L στο A και εκδίδει την εντολή με τη διεύθυνση του R. Κάθε κόμβος παίρνει ετικέτα
+need = πόσες προσωρινές λέξεις είναι ζωντανές ταυτόχρονα όσο υπολογίζεται:
+  φύλλο (σταθερά, όνομα, bool):  0
+  op(L, R):                      need(L) αν το R είναι φύλλο, αλλιώς max(need(R), need(L) + 1)
+  κλήση / inline:                το μέγιστο των ορισμάτων (κάθε όρισμα γράφεται στη λέξη του)
+Με βάση τις ετικέτες, για τα +, *, ==, != (αντιμεταθετικά) και τα <, <=, >, >= (με τον κατοπτρικό
+τελεστή, a < b -> b > a):
+  - σύνθετο R και φύλλο L: αλλάζουν θέση, ένα spill λιγότερο (`x + a*b` -> `a*b + x`),
+  - σταθερά αριστερά και όχι δεξιά: πάει δεξιά (INCA/DECA, άλματα με το μηδέν του generator),
+  - δύο σύνθετοι τελεστέοι: ο βαρύτερος (μεγαλύτερο need) πάει δεξιά, ώστε να υπολογιστεί πρώτος
+    χωρίς ζωντανή προσωρινή.
+Το - και το / δεν αλλάζουν. Όταν το L είναι φύλλο η σειρά υπολογισμού μένει ίδια (το R υπολογιζόταν
+ήδη πρώτο και το L διαβάζεται στο τέλος). Με δύο σύνθετους τελεστέους η σειρά αλλάζει, οπότε η
+αντιμετάθεση γίνεται μόνο αν δεν φαίνεται: όχι κλήσεις που δεν είναι καθαρές (licm.pure_functions)
+και στις δύο πλευρές, ούτε κλήση που ξαναφτάνει στη μέθοδο όταν η άλλη πλευρά διαβάζει ονόματα
+(οι μεταβλητές είναι στατικές λέξεις).
+"""
+from typing import Any, Dict, List, Set, Tuple
+
+from ast_utils import calls_in, const_value, names_read
+from licm import pure_functions
+from mix_simulator import format_cycles
+
+COMMUTATIVE = ('+', '*', '==', '!=')
+MIRROR = {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+def _leaf(e) -> bool:
+    # Τελεστέος με διεύθυνση χωρίς υπολογισμό: σταθερά, όνομα, bool
+    return e is None or isinstance(e, (int, str)) or (isinstance(e, tuple) and bool(e) and e[0] == 'bool')
+
+
+def need(e) -> int:
+    """Ετικέτα Sethi–Ullman: προσωρινές λέξεις που χρειάζεται ο υπολογισμός του e στο A."""
+    if _leaf(e) or not isinstance(e, tuple):
+        return 0
+    tag = e[0]
+    if tag in ('add', 'mulop', 'relop'):
+        left = need(e[2])
+        return left if _leaf(e[3]) else max(need(e[3]), left + 1)
+    if tag == 'call':
+        return max((need(a) for a in e[2]), default=0)
+    if tag == 'inline':
+        return max([need(a) for _, a in e[2]] + [need(e[3])])
+    return 0
+
+
+class Orderer:
+    def __init__(self, pure: Set[str], call_reach: Dict[str, Set[str]]):
+        self.pure = pure
+        self.call_reach = call_reach
+        self.method = None
+        self.peak = [0, 0]       # μέγιστο need της μεθόδου πριν / μετά
+        self.stats: Dict[str, Any] = {
+            "swapped": 0,        # αντιμεταθετικοί τελεστές με τελεστέους σε άλλη θέση
+            "mirrored": 0,       # συγκρίσεις με κατοπτρικό τελεστή
+            "reordered": 0,      # ... από αυτές, όπου άλλαξε και η σειρά υπολογισμού (βαρύτερος πρώτα)
+            "kept": 0,           # αντιμεταθέσεις που δεν έγιναν λόγω κλήσεων
+            "methods": {},       # μέθοδος -> τα ίδια + "need" (πριν, μετά), μόνο όπου έγινε κάτι
+        }
+
+    # ---------------- program / method ----------------
+    def order_program(self, ast):
+        if not ast or ast[0] != 'program':
+            return ast
+        return ('program', [self._order_method(m) if m and m[0] == 'method' else m for m in ast[1]])
+
+    def _order_method(self, m):
+        _, ret_type, name, params, (_, decls, stmts) = m
+        self.method = name
+        self.peak = [0, 0]
+        decls2 = [('decl', d[1], [(v, self._root(e)) for v, e in d[2]]) if d and d[0] == 'decl' else d
+                  for d in decls]
+        stmts2 = [self._stmt(s) for s in stmts]
+        per = self.stats["methods"].get(name)
+        if per is not None:
+            per["need"] = tuple(self.peak)
+        return ('method', ret_type, name, params, ('body', decls2, stmts2))
+
+    # ---------------- statements ----------------
+    def _stmt(self, s):
+        if not s:
+            return s
+        tag = s[0]
+        if tag == 'assign_stmt':
+            _, (_, v, e) = s
+            return ('assign_stmt', ('assign', v, self._root(e)))
+        if tag == 'return_stmt':
+            return ('return_stmt', self._root(s[1]))
+        if tag == 'if_stmt':
+            return ('if_stmt', self._root(s[1]), self._stmt(s[2]), self._stmt(s[3]))
+        if tag == 'while_stmt':
+            return ('while_stmt', self._root(s[1]), self._stmt(s[2]))
+        if tag == 'block':
+            return ('block', [self._stmt(c) for c in s[1]])
+        return s
+
+    # ---------------- expressions ----------------
+    def _root(self, e):
+        if e is None:
+            return e
+        before = need(e)
+        e2 = self._expr(e)
+        self.peak = [max(self.peak[0], before), max(self.peak[1], need(e2))]
+        return e2
+
+    def _expr(self, e):
+        if _leaf(e) or not isinstance(e, tuple):
+            return e
+        tag = e[0]
+        if tag == 'call':
+            return ('call', e[1], [self._expr(a) for a in e[2]])
+        if tag == 'inline':
+            return ('inline', e[1], [(fresh, self._expr(a)) for fresh, a in e[2]], self._expr(e[3]))
+        if tag not in ('add', 'mulop', 'relop'):
+            return e
+        _, op, L, R = e
+        L, R = self._expr(L), self._expr(R)
+        if op not in COMMUTATIVE and tag != 'relop':
+            return (tag, op, L, R)
+        if _leaf(L) and _leaf(R):
+            swap = const_value(L) is not None and const_value(R) is None
+        elif _leaf(L) or _leaf(R):
+            swap = _leaf(L)
+        else:
+            swap = need(L) > need(R)
+            if swap and not self._may_reorder(L, R):
+                self._stat("kept")
+                swap = False
+            elif swap:
+                self._stat("reordered")
+        if not swap:
+            return (tag, op, L, R)
+        self._stat("swapped" if op in COMMUTATIVE else "mirrored")
+        return (tag, MIRROR.get(op, op), R, L)
+
+    def _may_reorder(self, L, R) -> bool:
+        # Το R υπολογιζόταν πρώτο· μετά την αντιμετάθεση πρώτο υπολογίζεται το L
+        calls = [calls_in(L, set()) - self.pure, calls_in(R, set()) - self.pure]
+        if calls[0] and calls[1]:
+            return False
+        for side, other in ((calls[0], R), (calls[1], L)):
+            if side and names_read(other, set()) and any(c == self.method or self.method in self.call_reach.get(c, ())
+                                                     for c in side):
+                return False
+        return True
+
+    def _stat(self, what: str):
+        self.stats[what] += 1
+        per = self.stats["methods"].setdefault(self.method, {"swapped": 0, "mirrored": 0, "reordered": 0, "kept": 0})
+        per[what] += 1
+
+
+def order_operands(ast, symbol_table, call_reach: Dict[str, Set[str]], entry: str = "main") -> Tuple[Any, Dict]:
+    """Επιστρέφει (νέο AST, stats). Το αρχικό AST δεν αλλάζει."""
+    methods: List = [m for m in ast[1] if m and m[0] == 'method'] if ast and ast[0] == 'program' else []
+    orderer = Orderer(pure_functions(methods, symbol_table, entry), call_reach)
+    return orderer.order_program(ast), orderer.stats
+
+
+def format_stats(stats: Dict) -> str:
+    rows = [
+        f"{'swapped operands':<18}{stats['swapped']} (+ * == !=)",
+        f"{'mirrored compares':<18}{stats['mirrored']} (< <= > >=)",
+        f"{'heavier first':<18}{stats['reordered']} ({stats['kept']} kept in place because of calls)",
+    ]
+    for name, per in stats["methods"].items():
+        row = f"  {name:<16}need {per['need'][0]} -> {per['need'][1]}"
+        if per.get("spills_before") is not None:
+            row += f", spills {per['spills_before']} -> {per['spills_after']}"
+        rows.append(row)
+    rows.extend(format_cycles(stats))
+    return "\n".join(rows)
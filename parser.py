@@ -1,30 +1,43 @@
 import ply.yacc as yacc
 from lexer import tokens
+from ply_tables import PARSETAB, grammar_hash, load_tables, warn_stale
+from ast_nodes import NodeBuilder, TupleBuilder
+
+# Οι ενέργειες φτιάχνουν κόμβους μέσω του _ast: tuples (προεπιλογή) ή κόμβοι με __slots__ (parse(..., nodes=True))
+_TUPLES, _NODES = TupleBuilder(), NodeBuilder()
+_ast = _TUPLES
+
+def _keep_pos(p):
+    # Το non-terminal του τελεστή κρατά τη θέση του token του (για line/col των κόμβων BinOp)
+    p.set_lineno(0, p.lineno(1))
+    p.slice[0].lexpos = p.lexpos(1)
 
 start = 'PROGRAM'  # Ορίζει το αρχικό μη τερματικό σύμβολο της γραμματικής
 
 def p_PROGRAM(p):
     '''PROGRAM : METH_LIST
                | empty'''
-    p[0] = ('program', p[1]) #τυλίγω σε root κόμβο (πάντα επιστρέφω ('program', <λίστα_μεθόδων_ή_κενό>))
+    p[0] = _ast.program(p[1]) #τυλίγω σε root κόμβο (πάντα επιστρέφω ('program', <λίστα_μεθόδων_ή_κενό>))
 
 def p_meth_list(p):
-    '''METH_LIST : METH METH_LIST
+    '''METH_LIST : METH_LIST METH
                  | METH'''
     if len(p) == 3:
-        p[0] = [p[1]] + p[2] #μετατροπη p[1] σε λιστα για να μπορω να προσθεσω και αλλα στοιχεια (αναδρομικός ορισμός λίστας)
+        p[1].append(p[2])    # αριστερή αναδρομή: append στην ίδια λίστα, O(1) ανά μέθοδο και σταθερό βάθος stack
+        p[0] = p[1]
     else:
         p[0] = [p[1]]        # βάση: μία μόνο μέθοδος σε λίστα
 
 def p_meth(p):
     '''METH : TYPE ID "(" PARAMS ")" BODY'''
-    p[0] = ('method', p[1], p[2], p[4] , p[6])  # ('method', type, name, params_list, ('body', decls, stmts))
+    p[0] = _ast.method(p, 2, p[1], p[2], p[4], p[6])  # ('method', type, name, params_list, ('body', decls, stmts))
 
 def p_params(p):
     '''PARAMS : FORMALS TYPE ID
               | empty'''
     if len(p) == 4:
-        p[0] = p[1] + [(p[2], p[3])]  # προσθέτω την “τελευταία” παράμετρο στα FORMALS
+        p[1].append(_ast.param(p, 3, p[2], p[3]))  # προσθέτω την “τελευταία” παράμετρο στα FORMALS
+        p[0] = p[1]
     else:
         p[0] = []                     # καμία παράμετρος
 
@@ -32,7 +45,8 @@ def p_formals(p):
     '''FORMALS : FORMALS TYPE ID ',' 
                | empty'''
     if len(p) == 5:
-        p[0] = p[1] + [(p[2], p[3])]  # συσσώρευση παραμέτρων που τελειώνουν με κόμμα
+        p[1].append(_ast.param(p, 3, p[2], p[3]))  # συσσώρευση παραμέτρων που τελειώνουν με κόμμα
+        p[0] = p[1]
     else:
         p[0] = []                     
 
@@ -42,13 +56,14 @@ def p_type(p):
 
 def p_body(p):
     '''BODY : "{" DECLS STMTS "}" '''
-    p[0] = ('body', p[2],p[3])  # ομαδοποιώ δηλώσεις και εντολές σε ενιαίο κόμβο σώματος
+    p[0] = _ast.body(p[2], p[3])  # ομαδοποιώ δηλώσεις και εντολές σε ενιαίο κόμβο σώματος
 
 def p_decls(p):
     '''DECLS : DECLS DECL
              | empty'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]    # λίστα δηλώσεων 
+        p[1].append(p[2])       # λίστα δηλώσεων (append, όχι αντιγραφή)
+        p[0] = p[1]
     else:
         p[0] =[]              
 
@@ -56,28 +71,31 @@ def p_decl(p):
     '''DECL : TYPE ID VARS ";"
             | TYPE ID "=" EXPR VARS ";"'''
     if len(p) == 5:
-        p[0] = ('decl', p[1], [(p[2], None)] + p[3])  # πρώτη μεταβλητή χωρίς αρχικοποίηση + ό,τι επιστρέφει το VARS
+        p[0] = _ast.decl(p, 2, p[1], [_ast.var(p, 2, p[2], None)] + p[3])  # πρώτη μεταβλητή χωρίς αρχικοποίηση + ό,τι επιστρέφει το VARS
     else:
         z_expr = p[4]                                  # έκφραση αρχικοποίησης για την πρώτη μεταβλητή
-        z_decl = (p[2], z_expr)
-        p[0] = ('decl', p[1], [z_decl] + p[5])         # πρώτη μεταβλητή με init + τα υπόλοιπα από VARS
+        z_decl = _ast.var(p, 2, p[2], z_expr)
+        p[0] = _ast.decl(p, 2, p[1], [z_decl] + p[5])         # πρώτη μεταβλητή με init + τα υπόλοιπα από VARS
 
 def p_vars(p):
-    '''VARS : "," ID VARS
-            | ","  ID "=" EXPR VARS
+    '''VARS : VARS "," ID
+            | VARS "," ID "=" EXPR
             | empty'''
     if len(p) == 4:
-        p[0] = [(p[2], None)] + p[3]                   # καταχώριση επιπλέον ονόματος χωρίς init
+        p[1].append(_ast.var(p, 3, p[3], None))        # επιπλέον όνομα χωρίς init
+        p[0] = p[1]
     elif len(p) == 6:
-        p[0] = [(p[2], p[4])] + p[5]                   # καταχώριση επιπλέον ονόματος με init έκφραση
+        p[1].append(_ast.var(p, 3, p[3], p[5]))        # επιπλέον όνομα με init έκφραση
+        p[0] = p[1]
     else:
-        p[0] = []                                      # τέλος λίστας
+        p[0] = []                                      # αρχή λίστας
 
 def p_stmts(p):
     '''STMTS : STMTS STMT
              | empty'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]    # λίστα εντολών (αναδρομική συσσώρευση)
+        p[1].append(p[2])       # λίστα εντολών (append, όχι αντιγραφή)
+        p[0] = p[1]
     else:
         p[0] = []               
 
@@ -92,36 +110,36 @@ def p_stmt(p):
             | ";"'''
     if len(p) == 3:
         if p.slice[1].type == 'BREAK':
-            p[0] = ('break_stmt',)                      # break statement
+            p[0] = _ast.break_(p, 1)                      # break statement
         else:
-            p[0] = ('assign_stmt', p[1])               # ανάθεση (ASSIGN ';')
+            p[0] = _ast.assign_stmt(p[1])               # ανάθεση (ASSIGN ';')
     elif len(p) == 4:
-        p[0] = ('return_stmt', p[2])                   # return έκφραση
+        p[0] = _ast.ret(p, 1, p[2])                   # return έκφραση
     elif len(p) == 6 and p[1] == 'if':
-        p[0] = ('if_stmt', p[3], p[5], ('empty_stmt',)) # if χωρίς else → else = empty_stmt
+        p[0] = _ast.if_(p, 1, p[3], p[5]) # if χωρίς else → else = empty_stmt
     elif len(p) == 8:
-        p[0] = ('if_stmt', p[3], p[5], p[7])           # if με else
+        p[0] = _ast.if_(p, 1, p[3], p[5], p[7])           # if με else
     elif len(p) == 6 and p[1] == 'while':
-        p[0] = ('while_stmt', p[3], p[5])              # while (cond) stmt
+        p[0] = _ast.while_(p, 1, p[3], p[5])              # while (cond) stmt
     elif len(p) == 2:
         if p[1] == ';':
-            p[0] = ('empty_stmt',)                     # κενή εντολή
+            p[0] = _ast.empty(p, 1)                     # κενή εντολή
         else:
             p[0] = p[1]                                # BLOCK περνάει ως έχει
 
 def p_block(p):
     '''BLOCK : "{" STMTS "}"'''
-    p[0] = ('block', p[2])                             # μπλοκ εντολών
+    p[0] = _ast.block(p, 1, p[2])                             # μπλοκ εντολών
 
 def p_assign(p):
     '''ASSIGN : ID "=" EXPR'''
-    p[0] = ('assign', p[1], p[3])                      # (lhs, expr) κόμβος ανάθεσης (χωρίς ';')
+    p[0] = _ast.assign(p, 1, p[1], p[3])                      # (lhs, expr) κόμβος ανάθεσης (χωρίς ';')
 
 def p_expr(p):
     '''EXPR : ADD_EXPR RELOP ADD_EXPR
             | ADD_EXPR'''
     if len(p) == 4:
-        p[0] = ('relop', p[2], p[1], p[3])             # σχεσιακός τελεστής: ('relop', op, left, right)
+        p[0] = _ast.binop(p, 2, 'relop', p[2], p[1], p[3])             # σχεσιακός τελεστής: ('relop', op, left, right)
     else:
         p[0] = p[1]                                    # απλή προώθηση ADD_EXPR
 
@@ -133,12 +151,13 @@ def p_relop(p):
              | EQ
              | NE'''
     p[0] = p[1]                                        # περνάω το σύμβολο του τελεστή σχέσης
+    _keep_pos(p)
 
 def p_add_expr(p):
     '''ADD_EXPR : ADD_EXPR ADDOP TERM
                 | TERM'''
     if len(p) == 4:
-        p[0] = ('add', p[2], p[1], p[3])               # αθροιστικός/αφαιρετικός κόμβος ('add', '+|-', left, right)
+        p[0] = _ast.binop(p, 2, 'add', p[2], p[1], p[3])               # αθροιστικός/αφαιρετικός κόμβος ('add', '+|-', left, right)
     else:
         p[0] = p[1]                                    # προώθηση TERM
 
@@ -146,12 +165,13 @@ def p_addop(p):
     '''ADDOP : "+"
              | "-"'''
     p[0] = p[1]                                        # επιστρέφω τον τελεστή '+' ή '-'
+    _keep_pos(p)
 
 def p_term(p):
     '''TERM : TERM MULOP FACTOR
             | FACTOR'''
     if len(p) == 4:
-        p[0] = ('mulop', p[2], p[1], p[3])             # πολλαπλασιασμός/διαίρεση ('mulop','*|/', left, right)
+        p[0] = _ast.binop(p, 2, 'mulop', p[2], p[1], p[3])             # πολλαπλασιασμός/διαίρεση ('mulop','*|/', left, right)
     else:
         p[0] = p[1]                                    # προώθηση FACTOR
 
@@ -159,6 +179,7 @@ def p_mulop(p):
     '''MULOP : "*"
              | "/"'''
     p[0] = p[1]                                        # επιστρέφω τον τελεστή '*' ή '/'
+    _keep_pos(p)
 
 def p_factor(p):
     '''FACTOR : ID "(" ACTUALS ")"
@@ -170,19 +191,20 @@ def p_factor(p):
         if p.slice[1].type == 'NUM':
             p[0] = p[1]                                # αριθμητικό literal (int)
         elif p.slice[1].type == 'BOOLEAN':
-            p[0] = ('bool', p[1])                      # boolean literal ως ('bool', 0|1)
+            p[0] = _ast.boolean(p[1])                      # boolean literal ως ('bool', 0|1)
         else:
-            p[0] = p[1]                                # αναγνωριστικό (ID)
+            p[0] = _ast.name(p, 1, p[1])               # αναγνωριστικό (ID)
     elif len(p) == 4:
         p[0] = p[2]                                    # παρενθετική έκφραση: επιστρέφω το εσωτερικό EXPR
     elif len(p) == 5:
-        p[0] = ('call', p[1], p[3])                    # κλήση συνάρτησης: ('call', fname, args_list)
+        p[0] = _ast.call(p, 1, p[1], p[3])                    # κλήση συνάρτησης: ('call', fname, args_list)
 
 def p_actuals(p):
     '''ACTUALS : ARGS EXPR
                | empty'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]                           # ολοκλήρωση λίστας ορισμάτων: ARGS + τελευταίο EXPR
+        p[1].append(p[2])                              # ολοκλήρωση λίστας ορισμάτων: ARGS + τελευταίο EXPR
+        p[0] = p[1]
     else:
         p[0] = []                                      # καμία παράμετρος
 
@@ -190,7 +212,8 @@ def p_args(p):
     '''ARGS : ARGS EXPR ","
             | empty'''
     if len(p) == 4:
-        p[0] = p[1] + [p[2]]                           # συσσώρευση ενδιάμεσων ορισμάτων (με κόμμα στο τέλος)
+        p[1].append(p[2])                              # συσσώρευση ενδιάμεσων ορισμάτων (με κόμμα στο τέλος)
+        p[0] = p[1]
     else:
         p[0] = []                                      # αρχικοποίηση κενής λίστας ορισμάτων
 
@@ -205,4 +228,24 @@ def p_error(p):
         print("Syntax error at EOF")                                 
     raise SyntaxError                                                
 
-parser = yacc.yacc()  # κατασκευή του parser
+# κατασκευή του parser: οι LALR πίνακες φορτώνονται από το parsetab.py (έλεγχος με hash της γραμματικής).
+# Αν είναι παλιοί, χτίζονται στη μνήμη χωρίς parser.out/parsetab.py στον τρέχοντα φάκελο.
+_parsetab = load_tables(PARSETAB, grammar_hash(globals()))
+if _parsetab is not None:
+    parser = yacc.yacc(tabmodule=_parsetab, optimize=True, debug=False, write_tables=False)
+else:
+    warn_stale(PARSETAB)
+    parser = yacc.yacc(debug=False, write_tables=False, errorlog=yacc.NullLogger())
+
+
+def parse(source, lexer=None, nodes=False):
+    """
+    parser.parse με επιλογή μορφής AST: tuples (προεπιλογή) ή κόμβοι ast_nodes με
+    line/col (nodes=True). Το ast_nodes.to_tuple() γυρίζει τους κόμβους στην κλασική μορφή.
+    """
+    global _ast
+    _ast = _NODES if nodes else _TUPLES
+    try:
+        return parser.parse(source, lexer=lexer)
+    finally:
+        _ast = _TUPLES
@@ -0,0 +1,88 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'PROGRAMBOOLEAN BREAK ELSE EQ GE GT ID IF INT LE LT NE NUM PRINT READ RETURN WHILEPROGRAM : METH_LIST\n               | emptyMETH_LIST : METH_LIST METH\n                 | METHMETH : TYPE ID "(" PARAMS ")" BODYPARAMS : FORMALS TYPE ID\n              | emptyFORMALS : FORMALS TYPE ID \',\' \n               | emptyTYPE : INTBODY : "{" DECLS STMTS "}" DECLS : DECLS DECL\n             | emptyDECL : TYPE ID VARS ";"\n            | TYPE ID "=" EXPR VARS ";"VARS : VARS "," ID\n            | VARS "," ID "=" EXPR\n            | emptySTMTS : STMTS STMT\n             | emptySTMT : ASSIGN ";"\n            | RETURN EXPR ";"\n            | IF "(" EXPR ")" STMT\n            | IF "(" EXPR ")" STMT ELSE STMT\n            | WHILE "(" EXPR ")" STMT\n            | BREAK ";"\n            | BLOCK\n            | ";"BLOCK : "{" STMTS "}"ASSIGN : ID "=" EXPREXPR : ADD_EXPR RELOP ADD_EXPR\n            | ADD_EXPRRELOP : LE\n             | LT\n             | GT\n             | GE\n             | EQ\n             | NEADD_EXPR : ADD_EXPR ADDOP TERM\n                | TERMADDOP : "+"\n             | "-"TERM : TERM MULOP FACTOR\n            | FACTORMULOP : "*"\n             | "/"FACTOR : ID "(" ACTUALS ")"\n              | "(" EXPR ")"\n              | ID\n              | NUM\n              | BOOLEANACTUALS : ARGS EXPR\n               | emptyARGS : ARGS EXPR ","\n            | emptyempty :'
+    
+_lr_action_items = {'$end':([0,1,2,3,4,7,15,26,],[-56,0,-1,-2,-4,-3,-5,-11,]),'INT':([0,2,4,7,9,11,12,15,16,18,19,20,22,26,74,93,],[6,6,-4,-3,-56,6,-9,-5,-56,6,-13,-8,-12,-11,-14,-15,]),'ID':([5,6,14,16,18,19,21,22,23,24,25,27,29,30,34,37,38,44,47,48,49,50,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,74,75,81,82,84,85,90,91,92,93,94,95,97,],[8,-10,17,-56,-56,-13,35,-12,-20,36,-56,-19,-28,43,-27,35,-21,43,43,43,-26,43,43,-29,-22,43,43,-33,-34,-35,-36,-37,-38,-41,-42,43,-45,-46,-56,-14,86,43,-55,35,35,-23,-25,43,-15,-54,35,-24,]),'(':([8,30,31,32,43,44,47,48,50,52,56,57,58,59,60,61,62,63,64,65,66,67,68,69,81,82,92,94,],[9,44,47,48,69,44,44,44,44,44,44,44,-33,-34,-35,-36,-37,-38,-41,-42,44,-45,-46,-56,44,-55,44,-54,]),')':([9,10,12,17,40,41,42,43,45,46,69,70,71,72,77,78,79,80,82,83,88,89,],[-56,13,-7,-6,-32,-40,-44,-49,-50,-51,-56,83,84,85,-31,-39,-43,88,-53,-48,-47,-52,]),'{':([13,16,18,19,21,22,23,25,27,29,34,37,38,49,54,55,74,84,85,90,91,93,95,97,],[16,-56,-56,-13,25,-12,-20,-56,-19,-28,-27,25,-21,-26,-29,-22,-14,25,25,-23,-25,-15,25,-24,]),'}':([16,18,19,21,22,23,25,27,29,34,37,38,49,54,55,74,90,91,93,97,],[-56,-56,-13,26,-12,-20,-56,-19,-28,-27,54,-21,-26,-29,-22,-14,-23,-25,-15,-24,]),'RETURN':([16,18,19,21,22,23,25,27,29,34,37,38,49,54,55,74,84,85,90,91,93,95,97,],[-56,-56,-13,30,-12,-20,-56,-19,-28,-27,30,-21,-26,-29,-22,-14,30,30,-23,-25,-15,30,-24,]),'IF':([16,18,19,21,22,23,25,27,29,34,37,38,49,54,55,74,84,85,90,91,93,95,97,],[-56,-56,-13,31,-12,-20,-56,-19,-28,-27,31,-21,-26,-29,-22,-14,31,31,-23,-25,-15,31,-24,]),'WHILE':([16,18,19,21,22,23,25,27,29,34,37,38,49,54,55,74,84,85,90,91,93,95,97,],[-56,-56,-13,32,-12,-20,-56,-19,-28,-27,32,-21,-26,-29,-22,-14,32,32,-23,-25,-15,32,-24,]),'BREAK':([16,18,19,21,22,23,25,27,29,34,37,38,49,54,55,74,84,85,90,91,93,95,97,],[-56,-56,-13,33,-12,-20,-56,-19,-28,-27,33,-21,-26,-29,-22,-14,33,33,-23,-25,-15,33,-24,]),';':([16,18,19,21,22,23,25,27,28,29,33,34,36,37,38,39,40,41,42,43,45,46,49,51,53,54,55,73,74,76,77,78,79,83,84,85,86,87,88,90,91,93,95,96,97,],[-56,-56,-13,29,-12,-20,-56,-19,38,-28,49,-27,-56,29,-21,55,-32,-40,-44,-49,-50,-51,-26,74,-18,-29,-22,-30,-14,-56,-31,-39,-43,-48,29,29,-16,93,-47,-23,-25,-15,29,-17,-24,]),',':([17,36,40,41,42,43,45,46,51,53,76,77,78,79,83,86,87,88,89,96,],[20,-56,-32,-40,-44,-49,-50,-51,75,-18,-56,-31,-39,-43,-48,-16,75,-47,94,-17,]),'ELSE':([29,34,38,49,54,55,90,91,97,],[-28,-27,-21,-26,-29,-22,95,-25,-24,]),'NUM':([30,44,47,48,50,52,56,57,58,59,60,61,62,63,64,65,66,67,68,69,81,82,92,94,],[45,45,45,45,45,45,45,45,-33,-34,-35,-36,-37,-38,-41,-42,45,-45,-46,-56,45,-55,45,-54,]),'BOOLEAN':([30,44,47,48,50,52,56,57,58,59,60,61,62,63,64,65,66,67,68,69,81,82,92,94,],[46,46,46,46,46,46,46,46,-33,-34,-35,-36,-37,-38,-41,-42,46,-45,-46,-56,46,-55,46,-54,]),'=':([35,36,86,],[50,52,92,]),'LE':([40,41,42,43,45,46,78,79,83,88,],[58,-40,-44,-49,-50,-51,-39,-43,-48,-47,]),'LT':([40,41,42,43,45,46,78,79,83,88,],[59,-40,-44,-49,-50,-51,-39,-43,-48,-47,]),'GT':([40,41,42,43,45,46,78,79,83,88,],[60,-40,-44,-49,-50,-51,-39,-43,-48,-47,]),'GE':([40,41,42,43,45,46,78,79,83,88,],[61,-40,-44,-49,-50,-51,-39,-43,-48,-47,]),'EQ':([40,41,42,43,45,46,78,79,83,88,],[62,-40,-44,-49,-50,-51,-39,-43,-48,-47,]),'NE':([40,41,42,43,45,46,78,79,83,88,],[63,-40,-44,-49,-50,-51,-39,-43,-48,-47,]),'+':([40,41,42,43,45,46,77,78,79,83,88,],[64,-40,-44,-49,-50,-51,64,-39,-43,-48,-47,]),'-':([40,41,42,43,45,46,77,78,79,83,88,],[65,-40,-44,-49,-50,-51,65,-39,-43,-48,-47,]),'*':([41,42,43,45,46,78,79,83,88,],[67,-44,-49,-50,-51,67,-43,-48,-47,]),'/':([41,42,43,45,46,78,79,83,88,],[68,-44,-49,-50,-51,68,-43,-48,-47,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'PROGRAM':([0,],[1,]),'METH_LIST':([0,],[2,]),'empty':([0,9,16,18,25,36,69,76,],[3,12,19,23,23,53,82,53,]),'METH':([0,2,],[4,7,]),'TYPE':([0,2,11,18,],[5,5,14,24,]),'PARAMS':([9,],[10,]),'FORMALS':([9,],[11,]),'BODY':([13,],[15,]),'DECLS':([16,],[18,]),'STMTS':([18,25,],[21,37,]),'DECL':([18,],[22,]),'STMT':([21,37,84,85,95,],[27,27,90,91,97,]),'ASSIGN':([21,37,84,85,95,],[28,28,28,28,28,]),'BLOCK':([21,37,84,85,95,],[34,34,34,34,34,]),'EXPR':([30,44,47,48,50,52,81,92,],[39,70,71,72,73,76,89,96,]),'ADD_EXPR':([30,44,47,48,50,52,56,81,92,],[40,40,40,40,40,40,77,40,40,]),'TERM':([30,44,47,48,50,52,56,57,81,92,],[41,41,41,41,41,41,41,78,41,41,]),'FACTOR':([30,44,47,48,50,52,56,57,66,81,92,],[42,42,42,42,42,42,42,42,79,42,42,]),'VARS':([36,76,],[51,87,]),'RELOP':([40,],[56,]),'ADDOP':([40,77,],[57,57,]),'MULOP':([41,78,],[66,66,]),'ACTUALS':([69,],[80,]),'ARGS':([69,],[81,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> PROGRAM","S'",1,None,None,None),
+  ('PROGRAM -> METH_LIST','PROGRAM',1,'p_PROGRAM','parser.py',18),
+  ('PROGRAM -> empty','PROGRAM',1,'p_PROGRAM','parser.py',19),
+  ('METH_LIST -> METH_LIST METH','METH_LIST',2,'p_meth_list','parser.py',23),
+  ('METH_LIST -> METH','METH_LIST',1,'p_meth_list','parser.py',24),
+  ('METH -> TYPE ID ( PARAMS ) BODY','METH',6,'p_meth','parser.py',32),
+  ('PARAMS -> FORMALS TYPE ID','PARAMS',3,'p_params','parser.py',36),
+  ('PARAMS -> empty','PARAMS',1,'p_params','parser.py',37),
+  ('FORMALS -> FORMALS TYPE ID ,','FORMALS',4,'p_formals','parser.py',45),
+  ('FORMALS -> empty','FORMALS',1,'p_formals','parser.py',46),
+  ('TYPE -> INT','TYPE',1,'p_type','parser.py',54),
+  ('BODY -> { DECLS STMTS }','BODY',4,'p_body','parser.py',58),
+  ('DECLS -> DECLS DECL','DECLS',2,'p_decls','parser.py',62),
+  ('DECLS -> empty','DECLS',1,'p_decls','parser.py',63),
+  ('DECL -> TYPE ID VARS ;','DECL',4,'p_decl','parser.py',71),
+  ('DECL -> TYPE ID = EXPR VARS ;','DECL',6,'p_decl','parser.py',72),
+  ('VARS -> VARS , ID','VARS',3,'p_vars','parser.py',81),
+  ('VARS -> VARS , ID = EXPR','VARS',5,'p_vars','parser.py',82),
+  ('VARS -> empty','VARS',1,'p_vars','parser.py',83),
+  ('STMTS -> STMTS STMT','STMTS',2,'p_stmts','parser.py',94),
+  ('STMTS -> empty','STMTS',1,'p_stmts','parser.py',95),
+  ('STMT -> ASSIGN ;','STMT',2,'p_stmt','parser.py',103),
+  ('STMT -> RETURN EXPR ;','STMT',3,'p_stmt','parser.py',104),
+  ('STMT -> IF ( EXPR ) STMT','STMT',5,'p_stmt','parser.py',105),
+  ('STMT -> IF ( EXPR ) STMT ELSE STMT','STMT',7,'p_stmt','parser.py',106),
+  ('STMT -> WHILE ( EXPR ) STMT','STMT',5,'p_stmt','parser.py',107),
+  ('STMT -> BREAK ;','STMT',2,'p_stmt','parser.py',108),
+  ('STMT -> BLOCK','STMT',1,'p_stmt','parser.py',109),
+  ('STMT -> ;','STMT',1,'p_stmt','parser.py',110),
+  ('BLOCK -> { STMTS }','BLOCK',3,'p_block','parser.py',131),
+  ('ASSIGN -> ID = EXPR','ASSIGN',3,'p_assign','parser.py',135),
+  ('EXPR -> ADD_EXPR RELOP ADD_EXPR','EXPR',3,'p_expr','parser.py',139),
+  ('EXPR -> ADD_EXPR','EXPR',1,'p_expr','parser.py',140),
+  ('RELOP -> LE','RELOP',1,'p_relop','parser.py',147),
+  ('RELOP -> LT','RELOP',1,'p_relop','parser.py',148),
+  ('RELOP -> GT','RELOP',1,'p_relop','parser.py',149),
+  ('RELOP -> GE','RELOP',1,'p_relop','parser.py',150),
+  ('RELOP -> EQ','RELOP',1,'p_relop','parser.py',151),
+  ('RELOP -> NE','RELOP',1,'p_relop','parser.py',152),
+  ('ADD_EXPR -> ADD_EXPR ADDOP TERM','ADD_EXPR',3,'p_add_expr','parser.py',157),
+  ('ADD_EXPR -> TERM','ADD_EXPR',1,'p_add_expr','parser.py',158),
+  ('ADDOP -> +','ADDOP',1,'p_addop','parser.py',165),
+  ('ADDOP -> -','ADDOP',1,'p_addop','parser.py',166),
+  ('TERM -> TERM MULOP FACTOR','TERM',3,'p_term','parser.py',171),
+  ('TERM -> FACTOR','TERM',1,'p_term','parser.py',172),
+  ('MULOP -> *','MULOP',1,'p_mulop','parser.py',179),
+  ('MULOP -> /','MULOP',1,'p_mulop','parser.py',180),
+  ('FACTOR -> ID ( ACTUALS )','FACTOR',4,'p_factor','parser.py',185),
+  ('FACTOR -> ( EXPR )','FACTOR',3,'p_factor','parser.py',186),
+  ('FACTOR -> ID','FACTOR',1,'p_factor','parser.py',187),
+  ('FACTOR -> NUM','FACTOR',1,'p_factor','parser.py',188),
+  ('FACTOR -> BOOLEAN','FACTOR',1,'p_factor','parser.py',189),
+  ('ACTUALS -> ARGS EXPR','ACTUALS',2,'p_actuals','parser.py',203),
+  ('ACTUALS -> empty','ACTUALS',1,'p_actuals','parser.py',204),
+  ('ARGS -> ARGS EXPR ,','ARGS',3,'p_args','parser.py',212),
+  ('ARGS -> empty','ARGS',1,'p_args','parser.py',213),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',221),
+]
+_tables_version = 1
+_source_hash = '53efbdb64020b20443554e7ecfa4ba7f2986c5961098fea83cfcb08212cabfe4'
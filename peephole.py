@@ -0,0 +1,315 @@
+"""
+Peephole optimizer πάνω στο buffer self.code του MixalGenerator,
+δηλ. λίστα από (label, op, operand, comment), ακριβώς πριν το _render().
+
+Κάθε κανόνας είναι συνάρτηση rule(win, ctx) που κοιτάει το "παράθυρο" win (win[0] η τρέχουσα
+γραμμή) και επιστρέφει None ή (πόσες γραμμές καταναλώνει, γραμμές αντικατάστασης).
+Ο driver εφαρμόζει τους κανόνες του RULES ξανά και ξανά μέχρι να μην αλλάζει τίποτα
+(fixpoint) και μετράει ανά κανόνα: εφαρμογές, εντολές που αφαιρέθηκαν και κύκλους (u).
+
+Παραδοχές για τον κώδικα του MixalGenerator:
+  - οι μόνες εντολές που γράφουν σε κώδικα είναι ST* σε label εντολής (π.χ. STJ RET(0:2)),
+    αυτές οι εντολές ("volatile") δεν αγγίζονται ποτέ,
+  - κλήση = JMP σε label που ξεκινά με STJ (το rJ χρησιμοποιείται), άρα μετά από κλήση
+    ο κώδικας συνεχίζει κανονικά,
+  - το rX δεν είναι ποτέ live σε label ή άλμα (όλες οι τιμές περνούν από το rA).
+"""
+import re
+from typing import Dict, List, Optional
+
+from mix_simulator import JUMP_OPS, OPCODES, op_time
+
+_LABEL_RE = re.compile(r"[A-Z][A-Z0-9]*")
+
+# Εντολές που διαβάζουν / γράφουν το rX (για τον κανόνα mul_low)
+_READS_X = {"STX", "CMPX", "DIV", "SLAX", "SRAX", "SLC", "SRC", "INCX", "DECX", "NUM", "CHAR",
+            "JXN", "JXZ", "JXP", "JXNN", "JXNZ", "JXNP", "JXE", "JXO"}
+_WRITES_X = {"LDX", "LDXN", "ENTX", "ENNX", "MUL"}
+_STORES = {op for op, (c, _) in OPCODES.items() if 24 <= c <= 33}
+_UNCONDITIONAL = {"JMP", "JSJ", "HLT"}
+
+
+def _is_code(line) -> bool:
+    return line[1] in OPCODES
+
+
+def _label_ref(operand: str) -> Optional[str]:
+    m = _LABEL_RE.match(operand or "")
+    return m.group(0) if m else None
+
+
+class _Context:
+    """Πληροφορίες ενός περάσματος: labels, αναφορές, volatile εντολές, εκκρεμή aliases."""
+
+    def __init__(self, lines):
+        self.by_label: Dict[str, list] = {}
+        self.refs: Dict[str, int] = {}
+        self.alias: Dict[str, str] = {}
+        for line in lines:
+            if line[0]:
+                self.by_label[line[0]] = line
+        for line in lines:
+            ref = _label_ref(line[2])
+            if ref in self.by_label:
+                self.refs[ref] = self.refs.get(ref, 0) + 1
+        self.volatile = set()
+        for line in lines:
+            ref = _label_ref(line[2])
+            if line[1] in _STORES and ref in self.by_label and _is_code(self.by_label[ref]):
+                self.volatile.add(ref)
+        # Είσοδοι συναρτήσεων: labels της STJ ή των NOP-labels ακριβώς πριν από αυτήν
+        self.entries = set()
+        for k, line in enumerate(lines):
+            if line[1] != "STJ":
+                continue
+            if line[0]:
+                self.entries.add(line[0])
+            j = k - 1
+            while j >= 0 and lines[j][1] == "NOP" and lines[j][0]:
+                self.entries.add(lines[j][0])
+                j -= 1
+        # Scratch λέξεις που χρησιμοποιούνται ΜΟΝΟ σε διαδοχικά ζεύγη STX T ; LDA T
+        self.pairs: Dict[str, int] = {}
+        for a, b in zip(lines, lines[1:]):
+            if a[1] == "STX" and b[1] == "LDA" and a[2] == b[2] and not b[0]:
+                self.pairs[a[2]] = self.pairs.get(a[2], 0) + 1
+
+    def target(self, operand: str):
+        # Γραμμή-στόχος ενός άλματος (ή None αν ο στόχος δεν είναι label, π.χ. "0")
+        ref = _label_ref(operand)
+        if ref is None or operand != ref:
+            return None
+        return self.by_label.get(ref)
+
+    def is_entry(self, operand: str) -> bool:
+        return self.resolve(operand) in self.entries
+
+    def is_call(self, line) -> bool:
+        return line[1] == "JMP" and self.is_entry(line[2])
+
+    def resolve(self, name: str) -> str:
+        seen = set()
+        while name in self.alias and name not in seen:
+            seen.add(name)
+            name = self.alias[name]
+        return name
+
+
+def _drop_keeping_label(win, ctx):
+    # Διαγραφή της τρέχουσας γραμμής. Αν έχει label, αυτό μεταφέρεται στην επόμενη εντολή
+    # (ή γίνεται alias του label της). Επιστρέφει None αν δεν γίνεται με ασφάλεια.
+    line = win[0]
+    if not line[0]:
+        return (1, [])
+    if len(win) < 2 or not _is_code(win[1]) or line[0] in ctx.volatile:
+        return None
+    nxt = win[1]
+    if not nxt[0]:
+        moved = [line[0], nxt[1], nxt[2], nxt[3], nxt[4]]
+        ctx.by_label[line[0]] = moved
+        return (2, [moved])
+    ctx.alias[line[0]] = nxt[0]
+    ctx.by_label[line[0]] = nxt
+    ctx.refs[nxt[0]] = ctx.refs.get(nxt[0], 0) + ctx.refs.get(line[0], 0)
+    return (1, [])
+
+
+# ---------------- κανόνες ----------------
+# Κάθε κανόνας: rule(win, ctx), όπου win[0] η τρέχουσα γραμμή, win[1] η επόμενη κ.ο.κ.
+
+def rule_label_nop(win, ctx):
+    """NOP (με ή χωρίς label, π.χ. από _label() ή κενή εντολή): το label πάει στην επόμενη εντολή."""
+    if win[0][1] != "NOP":
+        return None
+    return _drop_keeping_label(win, ctx)
+
+
+def rule_store_load(win, ctx):
+    """STr X ; LDr X  ->  STr X   (ο καταχωρητής έχει ήδη την τιμή)."""
+    if len(win) < 2:
+        return None
+    st, ld = win[0], win[1]
+    if not st[1].startswith("ST") or st[1] in ("STJ", "STZ") or ld[0]:
+        return None
+    if ld[1] != "LD" + st[1][2:] or ld[2] != st[2] or "(" in st[2]:
+        return None
+    return (2, [st])
+
+
+def rule_jump_next(win, ctx):
+    """Jxx L όπου L είναι η αμέσως επόμενη εντολή -> διαγραφή (εκτός αν είναι κλήση)."""
+    line = win[0]
+    if line[1] not in JUMP_OPS or line[1] == "JSJ" or len(win) < 2 or not win[1][0]:
+        return None
+    if ctx.resolve(line[2]) != ctx.resolve(win[1][0]) or ctx.is_call(line):
+        return None
+    return _drop_keeping_label(win, ctx)
+
+
+def rule_jump_chain(win, ctx):
+    """Jxx L1 όπου L1: JMP L2 (: JMP L3 ...) -> Jxx Ln (όχι μέσα από volatile εντολές ή κλήσεις)."""
+    line = win[0]
+    if line[1] not in JUMP_OPS:
+        return None
+    dest, seen = line[2], {id(line)}
+    while True:
+        tgt = ctx.target(dest)
+        if tgt is None or tgt[1] != "JMP" or tgt[0] in ctx.volatile or ctx.is_entry(tgt[2]):
+            break
+        if id(tgt) in seen or ctx.target(tgt[2]) is None:
+            return None                     # κύκλος από JMP (ατέρμων βρόχος) ή στόχος εκτός label
+        seen.add(id(tgt))
+        dest = tgt[2]
+    if dest == line[2]:
+        return None
+    return (1, [[line[0], line[1], dest, line[3], line[4]]])
+
+
+def rule_unreachable(win, ctx):
+    """Εντολές χωρίς label αμέσως μετά από JMP/HLT (που δεν είναι κλήση) δεν εκτελούνται ποτέ."""
+    line = win[0]
+    if line[1] not in _UNCONDITIONAL or ctx.is_call(line):
+        return None
+    j = 1
+    while j < len(win) and not win[j][0] and _is_code(win[j]):
+        j += 1
+    if j == 1:
+        return None
+    return (j, [line])
+
+
+def rule_mul_low(win, ctx):
+    """MUL V ; STX T ; LDA T  ->  MUL V ; SLAX 5   (T scratch λέξη, π.χ. TMPX, μόνο σε τέτοια ζεύγη)."""
+    if len(win) < 3:
+        return None
+    mul, stx, lda = win[0], win[1], win[2]
+    if mul[1] != "MUL" or stx[1] != "STX" or lda[1] != "LDA" or stx[0] or lda[0]:
+        return None
+    t = stx[2]
+    if lda[2] != t or t not in ctx.by_label or _is_code(ctx.by_label[t]):
+        return None
+    # κάθε αναφορά στο T πρέπει να ανήκει σε ζεύγος STX T ; LDA T (η τιμή δεν διαβάζεται αλλού)
+    if ctx.refs.get(t, 0) != 2 * ctx.pairs.get(t, 0):
+        return None
+    # Το SLAX μηδενίζει το rX: επιτρέπεται μόνο αν το rX δεν διαβάζεται πριν ξαναγραφτεί
+    for k in range(3, len(win)):
+        nxt = win[k]
+        if nxt[0] or nxt[1] in JUMP_OPS or not _is_code(nxt) or nxt[1] in _WRITES_X:
+            break
+        if nxt[1] in _READS_X:
+            return None
+    ctx.refs[t] -= 2
+    ctx.pairs[t] -= 1
+    return (3, [mul, [None, "SLAX", "5", "A = low part (in-register)", stx[4]]])
+
+
+def rule_dead_data(win, ctx):
+    """Λέξη δεδομένων (CON) με label που δεν αναφέρεται πουθενά -> αφαιρείται από το data section."""
+    line = win[0]
+    if line[1] != "CON" or not line[0] or ctx.refs.get(line[0], 0) or line[0] in ctx.alias.values():
+        return None
+    return (1, [])
+
+
+# Πίνακας κανόνων (όνομα, συνάρτηση) — με αυτή τη σειρά δοκιμάζονται σε κάθε θέση
+RULES = [
+    ("label_nop", rule_label_nop),
+    ("store_load", rule_store_load),
+    ("jump_next", rule_jump_next),
+    ("jump_chain", rule_jump_chain),
+    ("unreachable", rule_unreachable),
+    ("mul_low", rule_mul_low),
+    ("dead_data", rule_dead_data),
+]
+
+
+def _apply_aliases(lines, ctx):
+    for line in lines:
+        ref = _label_ref(line[2])
+        if ref in ctx.alias:
+            line[2] = ctx.resolve(ref) + line[2][len(ref):]
+
+
+def _cost(lines, weighted: bool) -> int:
+    return sum(op_time(l[1], l[2]) * (l[4] if weighted else 1) for l in lines)
+
+
+class _Window:
+    # Οι γραμμές που απομένουν σε ένα πέρασμα, σε αντίστροφη στοίβα: win[k] = k-οστή από την τρέχουσα.
+    # Οι αντικαταστάσεις γίνονται στην κορυφή της στοίβας, άρα κάθε πέρασμα είναι γραμμικό.
+    __slots__ = ("stack",)
+
+    def __init__(self, lines):
+        self.stack = lines[::-1]
+
+    def __len__(self):
+        return len(self.stack)
+
+    def __getitem__(self, k):
+        return self.stack[-1 - k]
+
+
+def optimize(code, rules=None, weights: Optional[List[int]] = None, max_passes: int = 100):
+    """
+    Τρέχει τους κανόνες μέχρι fixpoint.
+    code: λίστα (label, op, operand, comment).
+    weights: προαιρετικά, πόσες φορές εκτελέστηκε κάθε γραμμή (π.χ. από MixMachine.counts),
+             ώστε να μετρηθούν και οι κύκλοι που γλιτώνονται σε πραγματική εκτέλεση.
+    Επιστρέφει (νέος κώδικας, stats) με stats[rule] = {hits, removed, cycles, dyn_cycles}.
+    """
+    rules = RULES if rules is None else rules
+    lines = [[lab, op, operand, cmt, (weights[k] if weights else 0)]
+             for k, (lab, op, operand, cmt) in enumerate(code)]
+    stats = {name: {"hits": 0, "removed": 0, "cycles": 0, "dyn_cycles": 0} for name, _ in rules}
+
+    for _ in range(max_passes):
+        ctx = _Context(lines)
+        win = _Window(lines)
+        stack = win.stack
+        out = []
+        changed = False
+        while stack:
+            for name, rule in rules:
+                res = rule(win, ctx)
+                if res is None:
+                    continue
+                n, repl = res
+                old = [stack.pop() for _ in range(n)]
+                stack.extend(reversed(repl))
+                st = stats[name]
+                st["hits"] += 1
+                st["removed"] += n - len(repl)
+                st["cycles"] += _cost(old, False) - _cost(repl, False)
+                st["dyn_cycles"] += _cost(old, True) - _cost(repl, True)
+                changed = True
+                break
+            else:
+                out.append(stack.pop())
+        lines = out
+        _apply_aliases(lines, ctx)
+        if not changed:
+            break
+
+    code = [(lab if lab else None, op, operand, cmt) for lab, op, operand, cmt, _ in lines]
+    return code, stats
+
+
+def format_stats(stats, weighted: bool = False) -> str:
+    # Πίνακας ανά κανόνα για το optimization report
+    head = f"{'rule':<14}{'hits':>7}{'removed':>9}{'cycles':>9}"
+    if weighted:
+        head += f"{'run-cycles':>12}"
+    rows = [head]
+    total = {"hits": 0, "removed": 0, "cycles": 0, "dyn_cycles": 0}
+    for name, st in stats.items():
+        row = f"{name:<14}{st['hits']:>7}{st['removed']:>9}{st['cycles']:>9}"
+        if weighted:
+            row += f"{st['dyn_cycles']:>12}"
+        rows.append(row)
+        for k in total:
+            total[k] += st[k]
+    row = f"{'total':<14}{total['hits']:>7}{total['removed']:>9}{total['cycles']:>9}"
+    if weighted:
+        row += f"{total['dyn_cycles']:>12}"
+    rows.append(row)
+    return "\n".join(rows)
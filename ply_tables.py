@@ -0,0 +1,122 @@
+"""
+Προϋπολογισμένοι πίνακες PLY δίπλα στον compiler:
+    parsetab.py  -> LALR πίνακες της γραμματικής (parser.py)
+    lextab.py    -> master regex του lexer (lexer.py)
+
+Τα αρχεία φορτώνονται με απόλυτη διαδρομή (όχι μέσω sys.path/cwd) και γίνονται δεκτά
+μόνο αν η έκδοση και το hash της πηγής (docstrings γραμματικής / κανόνες lexer)
+ταιριάζουν. Αλλιώς ο parser/lexer χτίζεται στη μνήμη χωρίς να γράφει τίποτα.
+
+Αναδημιουργία μετά από αλλαγή στη γραμματική ή στα tokens:
+    python ply_tables.py
+"""
+import hashlib
+import importlib.util
+import os
+import sys
+
+TABLES_VERSION = 1                                     # αλλάζει όταν αλλάζει η μορφή των artifacts
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+PARSETAB = "parsetab"
+LEXTAB = "lextab"
+
+
+def _digest(parts) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(repr(p).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def grammar_hash(pdict) -> str:
+    """Hash του start symbol, των tokens/precedence και των docstrings των p_ κανόνων (με σειρά ορισμού)."""
+    rules = []
+    for name, obj in pdict.items():
+        if name.startswith("p_") and name != "p_error" and callable(obj):
+            rules.append((obj.__code__.co_firstlineno, name, obj.__doc__))
+    rules.sort()
+    # τα tokens ταξινομούνται: η σειρά τους δεν επηρεάζει τους πίνακες
+    return _digest([TABLES_VERSION, pdict.get("start"), pdict.get("precedence"),
+                    sorted(pdict.get("tokens", []))] + [(n, d) for _, n, d in rules])
+
+
+def lexer_hash(ldict) -> str:
+    """Hash των tokens, literals, ignore και όλων των t_ κανόνων (string regex ή regex συναρτήσεων)."""
+    funcs, strings = [], []
+    for name, obj in ldict.items():
+        if not name.startswith("t_"):
+            continue
+        if callable(obj):
+            # οι κανόνες-συναρτήσεις μπαίνουν στο master regex με σειρά ορισμού
+            funcs.append((obj.__code__.co_firstlineno, name, getattr(obj, "regex", obj.__doc__)))
+        else:
+            strings.append((name, obj))
+    funcs.sort()
+    strings.sort()
+    return _digest([TABLES_VERSION, sorted(ldict.get("tokens", [])), list(ldict.get("literals", []))]
+                   + [(n, r) for _, n, r in funcs] + strings)
+
+
+def load_tables(name: str, expected_hash: str):
+    """
+    Φορτώνει το artifact <TABLES_DIR>/<name>.py ως module (χωρίς import από το sys.path).
+    Επιστρέφει None αν λείπει ή αν είναι παλιό (διαφορετική έκδοση/hash).
+    """
+    path = os.path.join(TABLES_DIR, name + ".py")
+    if not os.path.isfile(path):
+        return None
+    spec = importlib.util.spec_from_file_location(f"_ply_tables_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        return None
+    if getattr(module, "_tables_version", None) != TABLES_VERSION:
+        return None
+    if getattr(module, "_source_hash", None) != expected_hash:
+        return None
+    return module
+
+
+def warn_stale(name: str):
+    print(f"[ply_tables] {name}.py is missing or out of date; building in memory "
+          f"(run 'python ply_tables.py' to regenerate)", file=sys.stderr)
+
+
+def _stamp(path: str, source_hash: str):
+    # Προσθήκη έκδοσης + hash στο τέλος του αρχείου που έγραψε το PLY
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(f"_tables_version = {TABLES_VERSION!r}\n")
+        f.write(f"_source_hash = {source_hash!r}\n")
+
+
+def build_tables(outdir: str = TABLES_DIR):
+    """Ξαναχτίζει parsetab.py και lextab.py από το lexer.py/parser.py."""
+    import ply.lex as lex
+    import ply.yacc as yacc
+    sys.path.insert(0, TABLES_DIR)
+    import lexer as lexer_module
+    import parser as parser_module
+
+    for name in (PARSETAB, LEXTAB):
+        path = os.path.join(outdir, name + ".py")
+        if os.path.exists(path):
+            os.remove(path)
+        sys.modules.pop(name, None)
+
+    lex.lex(module=lexer_module, optimize=True, lextab=LEXTAB, outputdir=outdir)
+    _stamp(os.path.join(outdir, LEXTAB + ".py"), lexer_hash(vars(lexer_module)))
+
+    yacc.yacc(module=parser_module, tabmodule=PARSETAB, outputdir=outdir,
+              debug=False, write_tables=True, errorlog=yacc.NullLogger())
+    _stamp(os.path.join(outdir, PARSETAB + ".py"), grammar_hash(vars(parser_module)))
+
+    for name in (PARSETAB, LEXTAB):
+        sys.modules.pop(name, None)
+    return [os.path.join(outdir, n + ".py") for n in (LEXTAB, PARSETAB)]
+
+
+if __name__ == "__main__":
+    for p in build_tables():
+        print(f"✅ wrote {p}")
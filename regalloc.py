@@ -0,0 +1,241 @@
+"""
+Ανάθεση τοπικών μεταβλητών στους index registers rI1..rI6 (ανά μέθοδο).
+
+Ένας index register κρατά μόνο πρόσημο + 2 bytes (|v| <= 4095), οπότε μια μεταβλητή
+μπαίνει σε register μόνο αν αποδεικνύεται ότι η τιμή της χωράει:
+  - είναι τοπική (όχι παράμετρος: τη γράφει ο καλών με STA),
+  - κάθε ανάθεση είναι σταθερά ή v = v ± c,
+  - κάθε v = v ± c βρίσκεται μέσα σε while με συνθήκη v < K / v <= K (για +c) ή
+    v > K / v >= K (για -c) και είναι η μόνη ανάθεση στο v μέσα σε εκείνο το while,
+  - όλα τα όρια (σταθερές, K ± c) είναι μέσα στο ±4095,
+  - γράφεται πριν διαβαστεί σε κάθε μονοπάτι (δεν διαβάζεται η "στατική" τιμή της λέξης),
+  - η μέθοδος δεν είναι αναδρομική (οι μεταβλητές της είναι στατικές λέξεις).
+
+Προτεραιότητα: πρώτα οι μετρητές βρόχων, μετά οι μεταβλητές με τις περισσότερες χρήσεις
+(με βάρος 10^βάθος βρόχου). Οι μέθοδοι επεξεργάζονται από τις callees προς τους callers,
+ώστε ο caller να προτιμά registers που δεν χαλάνε οι callees του. Όπου αυτό δεν γίνεται,
+ο generator σώζει/επαναφέρει τον register γύρω από την κλήση (plan["saves"]).
+"""
+from typing import Dict, List, Set
+
+from ast_utils import call_reach, calls_in, const_value, definitely_assigned, names_read
+from symbol_table import Scope
+
+INDEX_MAX = 4095
+INDEX_REGS = [1, 2, 3, 4, 5, 6]
+LOOP_COUNTER_BONUS = 10 ** 6
+
+
+def update_delta(varname: str, expr):
+    """Αν expr είναι varname ± c (ή c + varname) επιστρέφει το ±c, αλλιώς None."""
+    if not (isinstance(expr, tuple) and expr and expr[0] == 'add'):
+        return None
+    _, op, L, R = expr
+    c = const_value(R)
+    if L == varname and c is not None:
+        d = c if op == '+' else -c
+    elif op == '+' and R == varname and const_value(L) is not None:
+        d = const_value(L)
+    else:
+        return None
+    return d or None
+
+
+class _MethodScan:
+    """Μαζεύει για μία μέθοδο: αναθέσεις, χρήσεις με βάρη, μετρητές βρόχων, κλήσεις."""
+
+    def __init__(self, candidates: Set[str]):
+        self.cands = candidates
+        self.bad: Set[str] = set()
+        self.weight: Dict[str, int] = {v: 0 for v in candidates}
+        self.counters: Set[str] = set()
+        self.lo: Dict[str, int] = {}
+        self.hi: Dict[str, int] = {}
+        self.call_weight: Dict[str, int] = {}     # callee -> Σ 10^βάθος των σημείων κλήσης
+
+    # -- όρια τιμών
+    def _bound(self, v, value):
+        if abs(value) > INDEX_MAX:
+            self.bad.add(v)
+            return
+        self.lo[v] = min(self.lo.get(v, value), value)
+        self.hi[v] = max(self.hi.get(v, value), value)
+
+    def _use(self, e, depth):
+        w = 10 ** min(depth, 4)
+        for v in names_read(e, set()):
+            if v in self.weight:
+                self.weight[v] += w
+        for f in calls_in(e, set()):
+            self.call_weight[f] = self.call_weight.get(f, 0) + w
+
+    def assign(self, v, expr, loops, depth):
+        self._use(expr, depth)
+        if v not in self.cands:
+            return
+        self.weight[v] += 10 ** min(depth, 4)
+        c = const_value(expr)
+        if c is not None:
+            self._bound(v, c)
+            return
+        d = update_delta(v, expr)
+        if d is None or not loops:
+            self.bad.add(v)
+            return
+        loop = loops[-1]
+        cond = loop[1]
+        if _assign_count(loop[2], v) != 1 or not (isinstance(cond, tuple) and cond[0] == 'relop'):
+            self.bad.add(v)
+            return
+        _, op, L, R = cond
+        if L == v and const_value(R) is not None:
+            k = const_value(R)
+        elif R == v and const_value(L) is not None:
+            k = const_value(L)
+            op = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}[op]
+        else:
+            self.bad.add(v)
+            return
+        # η συνθήκη του βρόχου φράσσει την τιμή πριν την ενημέρωση
+        if d > 0 and op in ('<', '<='):
+            self._bound(v, (k - 1 if op == '<' else k) + d)
+        elif d < 0 and op in ('>', '>='):
+            self._bound(v, (k + 1 if op == '>' else k) + d)
+        else:
+            self.bad.add(v)
+            return
+        self.counters.add(v)
+
+    def stmt(self, s, loops, depth):
+        if not s:
+            return
+        tag = s[0]
+        if tag == 'assign_stmt':
+            _, (_, v, expr) = s
+            self.assign(v, expr, loops, depth)
+        elif tag == 'return_stmt':
+            if s[1] is not None:
+                self._use(s[1], depth)
+        elif tag == 'if_stmt':
+            self._use(s[1], depth)
+            self.stmt(s[2], loops, depth)
+            self.stmt(s[3], loops, depth)
+        elif tag == 'while_stmt':
+            self._use(s[1], depth + 1)
+            self.stmt(s[2], loops + [s], depth + 1)
+        elif tag == 'block':
+            for x in s[1]:
+                self.stmt(x, loops, depth)
+
+
+def _assign_count(node, v) -> int:
+    if isinstance(node, tuple) and node:
+        n = 1 if (node[0] == 'assign' and node[1] == v) else 0
+        return n + sum(_assign_count(c, v) for c in node[1:])
+    if isinstance(node, list):
+        return sum(_assign_count(c, v) for c in node)
+    return 0
+
+
+def plan_registers(ast, symbol_table) -> Dict[str, Dict]:
+    """
+    Επιστρέφει {μέθοδος: {"regs": {var: i}, "saves": {callee: [i, ...]}}}
+    (i = αριθμός index register 1..6).
+    """
+    methods = {m[2]: m for m in (ast[1] if ast and ast[0] == 'program' else []) if m and m[0] == 'method'}
+    direct = {name: calls_in(m[4], set()) & set(methods) for name, m in methods.items()}
+
+    # post-order DFS: οι callees πριν από τους callers
+    order: List[str] = []
+    state: Dict[str, int] = {}
+    for root in methods:
+        if root in state:
+            continue
+        stack = [(root, iter(sorted(direct[root])))]
+        state[root] = 1
+        while stack:
+            name, it = stack[-1]
+            nxt = next((c for c in it if c not in state), None)
+            if nxt is None:
+                stack.pop()
+                order.append(name)
+                state[name] = 2
+            else:
+                state[nxt] = 1
+                stack.append((nxt, iter(sorted(direct[nxt]))))
+
+    reach = call_reach(methods.values())
+
+    plan: Dict[str, Dict] = {}
+
+    def clobbers(f) -> Set[int]:
+        regs = set(plan.get(f, {}).get("regs", {}).values())
+        for g in reach[f]:
+            regs |= set(plan.get(g, {}).get("regs", {}).values())
+        return regs
+
+    for name in order:
+        m = methods[name]
+        regs: Dict[str, int] = {}
+        if name not in reach[name]:
+            regs = _allocate(m, symbol_table.scope(name), {c: clobbers(c) for c in direct[name]})
+        plan[name] = {"regs": regs, "saves": {}}
+        used = set(regs.values())
+        for c in sorted(direct[name]):
+            saves = sorted(used & clobbers(c))
+            if saves:
+                plan[name]["saves"][c] = saves
+    return plan
+
+
+def _allocate(m, scope: Scope, callee_clobbers: Dict[str, Set[int]]) -> Dict[str, int]:
+    _, _, name, params, body = m
+    _, decls, stmts = body
+    twice = set(scope.duplicates)
+    cands = {v for v in scope.locals if v not in twice and v not in scope.params}
+    if not cands:
+        return {}
+    scan = _MethodScan(cands)
+
+    assigned: Set[str] = set()
+    for d in decls:
+        if not d or d[0] != 'decl':
+            continue
+        for v, expr in d[2]:
+            if expr is None:
+                continue
+            definitely_assigned([('assign_stmt', ('assign', v, expr))], assigned, cands, scan.bad)
+            scan.assign(v, expr, [], 0)
+            assigned.add(v)
+    definitely_assigned(stmts, assigned, cands, scan.bad)
+    for s in stmts:
+        scan.stmt(s, [], 0)
+
+    ok = [v for v in cands if v not in scan.bad and v in scan.lo and scan.weight[v] > 0]
+    ok.sort(key=lambda v: (-(scan.weight[v] + (LOOP_COUNTER_BONUS if v in scan.counters else 0)), v))
+
+    # κόστος σωσίματος ανά register: Σ βαρών των κλήσεων που τον χαλάνε (ST + LD ανά κλήση)
+    save_cost = {r: 2 * sum(w for c, w in scan.call_weight.items() if r in callee_clobbers.get(c, ()))
+                 for r in INDEX_REGS}
+    free = sorted(INDEX_REGS, key=lambda r: (save_cost[r], r))
+    regs: Dict[str, int] = {}
+    for v in ok:
+        if not free:
+            break
+        r = free[0]
+        if save_cost[r] >= scan.weight[v] + (LOOP_COUNTER_BONUS if v in scan.counters else 0):
+            continue
+        regs[v] = free.pop(0)
+    return regs
+
+
+def format_plan(plan) -> str:
+    rows = []
+    for name, p in plan.items():
+        if not p["regs"]:
+            continue
+        regs = ", ".join(f"{v}->rI{r}" for v, r in sorted(p["regs"].items(), key=lambda x: x[1]))
+        rows.append(f"{name}: {regs}")
+        for callee, saves in p["saves"].items():
+            rows.append(f"    saves around {callee}(): " + ", ".join(f"rI{r}" for r in saves))
+    return "\n".join(rows) if rows else "no locals allocated"
@@ -1,54 +1,174 @@
-def build_symbol_table(ast):
-    # Κατασκευάζει και επιστρέφει τον πίνακα συμβόλων (symbol table) από το AST.
-    symbol_table = {}
-    symbol_table["global"] = []  # Global scope: λίστα με όλες τις συναρτήσεις του προγράμματος
+from typing import Dict, List, Optional, Tuple
 
-    if not ast or ast[0] != 'program':
-        # Αν το AST δεν είναι έγκυρο/αναμενόμενο, επέστρεψε μόνο το global.
+from ast_nodes import DECL, METHOD, PARAM, PROGRAM, kind
+
+
+class Signature:
+    """Εγγραφή συνάρτησης στο global scope: όνομα, τύπος επιστροφής, ονόματα παραμέτρων με τη σειρά."""
+    __slots__ = ("name", "type", "params", "arity")
+
+    def __init__(self, name: str, type: str, params: Tuple[str, ...]):
+        self.name = name
+        self.type = type
+        self.params = params
+        self.arity = len(params)
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'kind': 'function', 'type': self.type, 'params': list(self.params)}
+
+    def __repr__(self):
+        return f"Signature({self.type} {self.name}({', '.join(self.params)}))"
+
+
+class Scope:
+    """
+    Scope μιας μεθόδου: entries με τη σειρά δήλωσης (params και μετά locals) +
+    index όνομα -> entry (η ΠΡΩΤΗ δήλωση) για O(1) lookup.
+    params:     ονόματα παραμέτρων με τη σειρά (έτοιμα για το πέρασμα ορισμάτων)
+    locals:     ονόματα τοπικών μεταβλητών με τη σειρά
+    duplicates: ονόματα που ξαναδηλώθηκαν, μία φορά για κάθε επιπλέον δήλωση
+    """
+    __slots__ = ("name", "entries", "index", "params", "locals", "duplicates")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.entries: List[Dict] = []
+        self.index: Dict[str, Dict] = {}
+        self.params: Tuple[str, ...] = ()
+        self.locals: Tuple[str, ...] = ()
+        self.duplicates: List[str] = []
+
+    def add(self, name: str, kind: str):
+        entry = {'name': name, 'type': 'int', 'kind': kind}
+        self.entries.append(entry)
+        if name in self.index:
+            self.duplicates.append(name)
+        else:
+            self.index[name] = entry
+
+    def seal(self):
+        # Μετά το γέμισμα: πίνακες ονομάτων με τη σειρά δήλωσης
+        self.params = tuple(e['name'] for e in self.entries if e['kind'] == 'param')
+        self.locals = tuple(e['name'] for e in self.entries if e['kind'] == 'var')
+        return self
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+EMPTY_SCOPE = Scope("").seal()
+
+
+class SymbolTable:
+    """
+    Πίνακας συμβόλων με ευρετήρια: χτίζεται σε ένα πέρασμα πάνω στο AST και μοιράζεται
+    (μόνο για ανάγνωση) από τους σημασιολογικούς ελέγχους, το regalloc, το cache και τον MixalGenerator.
+
+    functions:  όλες οι Signature με τη σειρά του προγράμματος (και οι διπλές, για τον έλεγχο)
+    signatures: όνομα -> Signature (η τελευταία δήλωση, όπως και το scope της)
+    scopes:     όνομα μεθόδου -> Scope
+    to_dict() δίνει την παλιά μορφή {'global': [...], method: [...]} για το symbol_table.txt.
+    """
+
+    def __init__(self):
+        self.functions: List[Signature] = []
+        self.signatures: Dict[str, Signature] = {}
+        self.scopes: Dict[str, Scope] = {}
+        self.duplicate_functions: List[str] = []
+
+    def add_function(self, name: str, return_type: str, params: Tuple[str, ...]) -> Scope:
+        sig = Signature(name, return_type, params)
+        if name in self.signatures:
+            self.duplicate_functions.append(name)
+        self.functions.append(sig)
+        self.signatures[name] = sig
+        scope = self.scopes[name] = Scope(name)   # διπλή μέθοδος: κρατάμε το scope της τελευταίας
+        return scope
+
+    # ---------------- lookups ----------------
+    def signature(self, name: str) -> Optional[Signature]:
+        return self.signatures.get(name)
+
+    def scope(self, name: str) -> Scope:
+        return self.scopes.get(name, EMPTY_SCOPE)
+
+    def lookup(self, method: str, name: str) -> Optional[Dict]:
+        return self.scope(method).index.get(name)
+
+    def params(self, name: str) -> Tuple[str, ...]:
+        return self.scope(name).params
+
+    def __contains__(self, name):
+        return name in self.signatures
+
+    # ---------------- μορφή dict (dump / παλιοί callers) ----------------
+    def to_dict(self) -> Dict[str, List[Dict]]:
+        out = {"global": [sig.to_dict() for sig in self.functions]}
+        for name, scope in self.scopes.items():
+            out[name] = [dict(e) for e in scope.entries]
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[Dict]]) -> "SymbolTable":
+        st = cls()
+        for e in data.get("global", []):
+            st.add_function(e['name'], e.get('type', 'int'), tuple(e.get('params', ())))
+        for name, entries in data.items():
+            if name == "global":
+                continue
+            scope = st.scopes.setdefault(name, Scope(name))
+            for e in entries:
+                scope.add(e['name'], e['kind'])
+        for scope in st.scopes.values():
+            scope.seal()
+        return st
+
+
+def as_symbol_table(symbol_table) -> SymbolTable:
+    # Δέχεται SymbolTable, dict της παλιάς μορφής ή None
+    if isinstance(symbol_table, SymbolTable):
+        return symbol_table
+    return SymbolTable.from_dict(symbol_table or {})
+
+
+def build_symbol_table(ast) -> SymbolTable:
+    # Κατασκευάζει και επιστρέφει τον πίνακα συμβόλων (symbol table) από το AST, σε ένα πέρασμα.
+    symbol_table = SymbolTable()
+
+    if not ast or kind(ast) != PROGRAM:
+        # Αν το AST δεν είναι έγκυρο/αναμενόμενο, επέστρεψε κενό πίνακα (μόνο global).
         return symbol_table
 
     methods = ast[1] #Παίρνει τη λίστα με τις μεθόδους του προγράμματος από το AST.
 
     for method in methods:
-        if method[0] == 'method':
+        if kind(method) == METHOD:
             # Μορφή κόμβου: ('method', return_type, name, params, body)
             _, return_type, name, params, body = method
 
-            # Δημιουργία πίνακα (scope) για κάθε μέθοδο: θα περιέχει params & locals ως entries.
-            symbol_table[name] = []
-            
-            # Καταχώρηση της συνάρτησης στο global (για semantic checks & codegen)
-            global_entry = {
-                'name': name,
-                'kind': 'function',
-                'type': return_type,
-                'params': [param[1] for param in params]  # Κρατάμε μόνο τα ονόματα των παραμέτρων int x κρατα το x
-            }
-            symbol_table["global"].append(global_entry) #για να γνωριζουμει το global ολες τις συναρτησεις
+            # Καταχώρηση της συνάρτησης στο global (για semantic checks & codegen) και
+            # δημιουργία scope για τη μέθοδο: θα περιέχει params & locals ως entries.
+            # Κρατάμε μόνο τα ονόματα των παραμέτρων: int x κρατα το x
+            scope = symbol_table.add_function(name, return_type, tuple(param[1] for param in params))
 
             # Καταχώρηση παραμέτρων στο scope της μεθόδου
             for param in params:
-                if isinstance(param, tuple) and param[0] == 'int': #Επιβεβαιωση ότι κάθε στοιχείο είναι tuple της μορφής ('int', μεταβλητη).
-                    param_name = param[1]
-                    entry = {
-                        'name': param_name,
-                        'type': 'int',
-                        'kind': 'param'  # Σύμβολο τύπου "παράμετρος"
-                    }
-                    symbol_table[name].append(entry)
+                if (isinstance(param, tuple) or kind(param) == PARAM) and param[0] == 'int': #Επιβεβαιωση ότι κάθε στοιχείο είναι ('int', μεταβλητη) (tuple ή Param).
+                    scope.add(param[1], 'param')  # Σύμβολο τύπου "παράμετρος"
 
             # Καταχώρηση τοπικών μεταβλητών από τις δηλώσεις του σώματος
             _, decls, _ = body  # body = ('body', decls, stmts)
             for decl in decls:
-                if decl[0] == 'decl':
-                    var_list = decl[2]  # Λίστα: [(var_name, init_expr_or_None), ...]
-                    for var in var_list:
-                        var_name = var[0]
-                        entry = {
-                            'name': var_name,
-                            'type': 'int',
-                            'kind': 'var'  # Σύμβολο τύπου "τοπική μεταβλητή"
-                        }
-                        symbol_table[name].append(entry)
+                if kind(decl) == DECL:
+                    for var in decl[2]:  # Λίστα: [(var_name, init_expr_or_None), ...]
+                        scope.add(var[0], 'var')  # Σύμβολο τύπου "τοπική μεταβλητή"
+
+            scope.seal()
 
     return symbol_table
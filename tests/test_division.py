@@ -0,0 +1,54 @@
+"""
+Regression tests της διαίρεσης: το πηλίκο κόβεται προς το μηδέν (-7/2 == -3) με κάθε συνδυασμό
+των --no-regmoves / --no-fold, όχι μόνο στον προεπιλεγμένο δρόμο.
+
+    python -m pytest tests/
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer                      # noqa: E402
+from parser import parser                    # noqa: E402
+from symbol_table import build_symbol_table  # noqa: E402
+from const_fold import fold_constants        # noqa: E402
+from mixal_generator import MixalGenerator   # noqa: E402
+from mix_simulator import run_mixal          # noqa: E402
+
+# -7/2, 7/-2, -7/-2 μέσω κλήσης (μέρισμα άγνωστο) και -7/2 με γνωστές τιμές (διπλώνεται)
+NEGATIVE = '''
+int d(int a, int b)
+{
+ return a / b;
+}
+
+int main()
+{
+ int x, y;
+ x = 0 - 7; y = 2;
+ return d(x, y) * 1000 + d(7, 0 - 2) * 100 + d(x, 0 - 2) * 10 + x / y;
+}
+'''
+
+
+def compile_text(source, fold=True, **options):
+    lexer.lineno = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    symbol_table = build_symbol_table(ast)
+    if fold:
+        ast, _ = fold_constants(ast)
+    return MixalGenerator(symbol_table=symbol_table, **options).gen_program(ast)
+
+
+@pytest.mark.parametrize("options", [{}, {"regmoves": False}, {"regmoves": False, "immediate": False},
+                                     {"fold": False}, {"fold": False, "regmoves": False},
+                                     {"ir": True}, {"ir": True, "regmoves": False}])
+def test_negative_dividend_truncates_toward_zero(options):
+    text = compile_text(NEGATIVE, **options)
+    assert run_mixal(text, max_steps=1_000_000).rA == -3 * 1000 - 3 * 100 + 3 * 10 - 3
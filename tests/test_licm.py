@@ -0,0 +1,65 @@
+"""
+Regression tests του licm.py: ο βρόχος με μη καθαρή κλήση στη συνθήκη δεν παίρνει guard.
+
+    python -m pytest tests/
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer                      # noqa: E402
+from parser import parser                    # noqa: E402
+from symbol_table import build_symbol_table  # noqa: E402
+from const_fold import fold_constants        # noqa: E402
+from mixal_generator import MixalGenerator   # noqa: E402
+from mix_simulator import run_mixal          # noqa: E402
+
+# Το cnt μετράει τις κλήσεις του (στατική λέξη): 4 επαναλήψεις, και η 6η κλήση στο return -> 406
+STATEFUL_COND = '''
+int cnt(int z)
+{
+ int c;
+ c = c + 1;
+ return c;
+}
+
+int f(int a, int b)
+{
+ int s, k;
+ s = 0; k = 0;
+ while (cnt(0) < 5) { s = s + a * b; k = k + 1; }
+ return k * 100 + cnt(0);
+}
+
+int main()
+{
+ return f(3, 4);
+}
+'''
+
+
+def compile_gen(source, **options):
+    lexer.lineno = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    symbol_table = build_symbol_table(ast)
+    ast, _ = fold_constants(ast)
+    gen = MixalGenerator(symbol_table=symbol_table, **options)
+    return gen, gen.gen_program(ast)
+
+
+@pytest.mark.parametrize("options", [{}, {"ir": True}, {"licm": False}])
+def test_stateful_condition_runs_once_per_check(options):
+    _, text = compile_gen(STATEFUL_COND, **options)
+    assert run_mixal(text, max_steps=1_000_000).rA == 406
+
+
+def test_stateful_condition_is_not_hoisted():
+    gen, _ = compile_gen(STATEFUL_COND)
+    assert gen.licm_stats["impure"] == 1
+    assert gen.licm_stats["per_loop"] == []
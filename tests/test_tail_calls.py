@@ -0,0 +1,122 @@
+"""
+Tail calls σε μη αναδρομικό callee ("plain", βλ. find_tail_calls): γίνονται μόνο όταν ο καλών θα
+έσωζε index registers γύρω από την κλήση, και δεν αλλάζουν το αποτέλεσμα.
+
+    python -m pytest tests/
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer                      # noqa: E402
+from parser import parser                    # noqa: E402
+from symbol_table import build_symbol_table  # noqa: E402
+from const_fold import fold_constants        # noqa: E402
+from mixal_generator import MixalGenerator   # noqa: E402
+from mix_simulator import run_mixal          # noqa: E402
+
+# Το g πιάνει και τους 6 index registers, άρα ο h σώζει τον δικό του γύρω από την κλήση
+SAVES = '''
+int g(int a)
+{
+ int i, j, k, l, m, n, s;
+ s = 0; i = 0;
+ while (i < 2) { j = 0;
+  while (j < 2) { k = 0;
+   while (k < 2) { l = 0;
+    while (l < 2) { m = 0;
+     while (m < 2) { n = 0;
+      while (n < 2) { s = s + a; n = n + 1; }
+      m = m + 1; }
+     l = l + 1; }
+    k = k + 1; }
+   j = j + 1; }
+  i = i + 1; }
+ return s;
+}
+
+int h(int x)
+{
+ int q, t;
+ t = 0; q = 0;
+ while (q < 3) { t = t + x; q = q + 1; }
+ if (t > 5) return g(t);
+ return g(q) + 1;
+}
+
+int main()
+{
+ int r, w;
+ r = 0; w = 0;
+ while (w < 4) { r = r + h(w); w = w + 1; }
+ return r;
+}
+'''
+
+# Κανένας register δεν σώζεται: το `return g(...)` μένει κανονική κλήση
+NO_SAVES = '''
+int g(int a, int b)
+{
+ int i, s;
+ s = 0; i = 0;
+ while (i < b) { s = s + a; i = i + 1; }
+ return s;
+}
+
+int h(int x)
+{
+ int k, t;
+ t = 0; k = 0;
+ while (k < 3) { t = t + x; k = k + 1; }
+ return g(t, x + 1);
+}
+
+int f(int n)
+{
+ int j, u;
+ u = 0; j = 0;
+ while (j < n) { u = u + h(j); j = j + 1; }
+ return h(u);
+}
+
+int main()
+{
+ return f(5);
+}
+'''
+
+
+def compile_gen(source, **options):
+    lexer.lineno = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = parser.parse(source, lexer=lexer)
+    symbol_table = build_symbol_table(ast)
+    ast, _ = fold_constants(ast)
+    gen = MixalGenerator(symbol_table=symbol_table, **options)
+    return gen, gen.gen_program(ast)
+
+
+def run(text):
+    vm = run_mixal(text, max_steps=1_000_000)
+    return vm.rA, vm.cycles
+
+
+@pytest.mark.parametrize("options", [{}, {"layout": False, "peephole": False}])
+def test_plain_tail_call_drops_register_saves(options):
+    gen, text = compile_gen(SAVES, **options)
+    _, base = compile_gen(SAVES, tco=False, **options)
+    assert gen.tail_stats["plain"] == 1 and gen.tail_stats["sites"] == {("h", "g")}
+    (rA, cycles), (rA0, cycles0) = run(text), run(base)
+    assert rA == rA0 == 1346
+    assert cycles < cycles0
+
+
+def test_no_plain_tail_call_without_saves():
+    gen, text = compile_gen(NO_SAVES)
+    assert gen.tail_stats["plain"] == 0
+    assert run(text)[0] == 43560